@@ -1,7 +1,7 @@
 import gevent.monkey
 gevent.monkey.patch_all()
 
-from flask import Flask, render_template, send_from_directory, send_file, abort
+from flask import Flask, Request, render_template, send_from_directory, send_file, abort
 from flask_login import LoginManager
 from flask.json.provider import DefaultJSONProvider
 from config import config
@@ -21,6 +21,21 @@ class DecimalJSONProvider(DefaultJSONProvider):
             return int(obj) if obj % 1 == 0 else float(obj)
         return super().default(obj)
 
+class UploadRequest(Request):
+    """Request class that caps in-memory form fields on the challenge upload forms"""
+    # Endpoints whose multipart forms carry challenge files; their non-file fields
+    # (descriptions, hints, flags) never need more than FORM_MEMORY_LIMIT bytes
+    UPLOAD_ENDPOINTS = frozenset({'admin.create_challenge', 'admin.edit_challenge'})
+    FORM_MEMORY_LIMIT = 1024 * 1024
+
+    @property
+    def max_form_memory_size(self):
+        # Werkzeug 2.3 checks this against the whole body of urlencoded forms, so it is
+        # left unlimited (the default) everywhere else to avoid 413s on large admin POSTs
+        if self.endpoint in self.UPLOAD_ENDPOINTS:
+            return self.FORM_MEMORY_LIMIT
+        return None
+
 def create_app(config_name=None):
     """Create and configure the Flask application"""
     
@@ -31,6 +46,7 @@ def create_app(config_name=None):
     static_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
     
     app = Flask(__name__, static_folder=static_folder, static_url_path='/static')
+    app.request_class = UploadRequest
     app.config.from_object(config[config_name])
     
     # Set custom JSON provider
@@ -38,6 +54,14 @@ def create_app(config_name=None):
     
     # Initialize extensions
     db.init_app(app)
+    
+    # Flag lazy loads that should have been eager-loaded (opt-in, development only)
+    if app.debug and app.config.get('NPLUSONE_ENABLED'):
+        try:
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+            NPlusOne(app)
+        except ImportError:
+            app.logger.warning("NPLUSONE_ENABLED is set but the nplusone package is not installed")
     cache_service.init_app(app)
     WebSocketService.init_app(app)
     file_storage.init_app(app)
@@ -81,11 +81,18 @@ class Config:
     # File Upload
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads'))
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_UPLOAD_SIZE', 50 * 1024 * 1024))  # 50MB default
+    # Internal Nginx location mapped to UPLOAD_FOLDER/backups; when set, backup downloads are
+    # served by Nginx via X-Accel-Redirect instead of streaming through the app
+    BACKUP_ACCEL_REDIRECT_PREFIX = os.getenv('BACKUP_ACCEL_REDIRECT_PREFIX', '')
     ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'zip', 
                          'tar', 'gz', 'bz2', '7z', 'rar', 'exe', 'bin', 
                          'pcap', 'pcapng', 'cap', 'py', 'c', 'cpp', 'java',
                          'js', 'html', 'css', 'json', 'xml', 'yaml', 'yml'}
     
+    # Login throttling: failed logins allowed per client IP within the window (seconds)
+    LOGIN_FAILURE_LIMIT = int(os.getenv('LOGIN_FAILURE_LIMIT', 20))
+    LOGIN_FAILURE_WINDOW = int(os.getenv('LOGIN_FAILURE_WINDOW', 60))
+    
     # Session
     SESSION_TYPE = 'filesystem'
     PERMANENT_SESSION_LIFETIME = 3600 * 24  # 24 hours
@@ -109,6 +116,10 @@ class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
     SESSION_COOKIE_SECURE = False  # Allow HTTP in development
+    
+    # N+1 lazy-load detection (requires `pip install nplusone`, development only)
+    NPLUSONE_ENABLED = os.getenv('NPLUSONE_ENABLED', 'false').lower() == 'true'
+    NPLUSONE_RAISE = os.getenv('NPLUSONE_RAISE', 'true').lower() == 'true'
 
 class ProductionConfig(Config):
     """Production configuration"""
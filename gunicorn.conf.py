@@ -8,6 +8,9 @@ backlog = 2048
 
 # Worker processes 
 workers = int(os.getenv('WORKERS', max(8, multiprocessing.cpu_count() * 2)))
+# gevent patches sockets, so views blocked on MySQL/Redis/Docker RPCs yield to
+# other requests; keep views synchronous (Flask async views would run a fresh
+# event loop per request on top of this and gain nothing)
 worker_class = 'gevent'  
 worker_connections = 2000  
 timeout = 300 
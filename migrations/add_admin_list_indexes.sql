@@ -0,0 +1,11 @@
+-- Flag abuse and hint log admin lists filter on one column and order by time DESC;
+-- InnoDB scans these composite indexes backwards for the DESC order
+CREATE INDEX IF NOT EXISTS idx_flag_abuse_severity_ts ON flag_abuse_attempts(severity, timestamp);
+CREATE INDEX IF NOT EXISTS idx_flag_abuse_team_ts ON flag_abuse_attempts(team_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_flag_abuse_user_ts ON flag_abuse_attempts(user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_flag_abuse_challenge_ts ON flag_abuse_attempts(challenge_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_hint_unlocks_unlocked_at ON hint_unlocks(unlocked_at);
+
+-- (severity, timestamp) covers the severity-only index's GROUP BY; drop it where the
+-- earlier add_flag_abuse_severity_index.sql migration was already applied
+DROP INDEX IF EXISTS idx_flag_abuse_severity ON flag_abuse_attempts;
@@ -0,0 +1,38 @@
+-- Let the database cascade challenge deletes to its dependent rows
+-- (hints already use ON DELETE CASCADE; hint_unlocks cascade from hints)
+
+-- challenge_files.challenge_id
+SET @fk := (SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'challenge_files'
+              AND COLUMN_NAME = 'challenge_id' AND REFERENCED_TABLE_NAME = 'challenges' LIMIT 1);
+SET @sql := CONCAT('ALTER TABLE challenge_files DROP FOREIGN KEY ', @fk);
+PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+ALTER TABLE challenge_files
+ADD CONSTRAINT fk_challenge_files_challenge
+    FOREIGN KEY (challenge_id)
+    REFERENCES challenges(id)
+    ON DELETE CASCADE;
+
+-- submissions.challenge_id
+SET @fk := (SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'submissions'
+              AND COLUMN_NAME = 'challenge_id' AND REFERENCED_TABLE_NAME = 'challenges' LIMIT 1);
+SET @sql := CONCAT('ALTER TABLE submissions DROP FOREIGN KEY ', @fk);
+PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+ALTER TABLE submissions
+ADD CONSTRAINT fk_submissions_challenge
+    FOREIGN KEY (challenge_id)
+    REFERENCES challenges(id)
+    ON DELETE CASCADE;
+
+-- solves.challenge_id
+SET @fk := (SELECT CONSTRAINT_NAME FROM information_schema.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'solves'
+              AND COLUMN_NAME = 'challenge_id' AND REFERENCED_TABLE_NAME = 'challenges' LIMIT 1);
+SET @sql := CONCAT('ALTER TABLE solves DROP FOREIGN KEY ', @fk);
+PREPARE stmt FROM @sql; EXECUTE stmt; DEALLOCATE PREPARE stmt;
+ALTER TABLE solves
+ADD CONSTRAINT fk_solves_challenge
+    FOREIGN KEY (challenge_id)
+    REFERENCES challenges(id)
+    ON DELETE CASCADE;
@@ -0,0 +1,4 @@
+-- Solve history lookups filter on user_id/team_id and order by solved_at DESC;
+-- InnoDB scans these indexes backwards for the DESC order
+CREATE INDEX IF NOT EXISTS idx_solves_user_solved_at ON solves(user_id, solved_at);
+CREATE INDEX IF NOT EXISTS idx_solves_team_solved_at ON solves(team_id, solved_at);
@@ -0,0 +1,15 @@
+-- challenges.files / challenges.images duplicated URLs already held in challenge_files
+-- (Challenge.files / Challenge.images are now built from those rows at read time).
+-- Every JSON entry was written in the same commit as its challenge_files row, so there
+-- is nothing to copy over; an entry without a matching row points at a file that was
+-- already deleted from disk. To review those before dropping the columns:
+--
+-- SELECT c.id, j.url
+-- FROM challenges c,
+--      JSON_TABLE(COALESCE(c.images, '[]'), '$[*]' COLUMNS (url VARCHAR(600) PATH '$.url')) j
+-- WHERE NOT EXISTS (SELECT 1 FROM challenge_files f
+--                   WHERE f.challenge_id = c.id AND CONCAT('/files/', f.relative_path) = j.url);
+
+ALTER TABLE challenges
+DROP COLUMN files,
+DROP COLUMN images;
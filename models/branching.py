@@ -4,9 +4,39 @@ Handles multiple flags, prerequisites, and flag-based challenge unlocking
 """
 
 from datetime import datetime
+from functools import lru_cache
 from models import db
 import re
 
+try:
+    import re2  # google-re2: linear-time engine, used to reject ReDoS-prone flag patterns
+except ImportError:
+    re2 = None
+
+
+@lru_cache(maxsize=2048)
+def compile_flag_pattern(flag_value, case_sensitive=True):
+    """Compile (once per process) the regex for a regex flag; raises re.error if invalid"""
+    return re.compile(flag_value, 0 if case_sensitive else re.IGNORECASE)
+
+
+def validate_flag_pattern(flag_value):
+    """Check a regex flag before saving it; returns an error message or None
+    
+    When google-re2 is installed, patterns it refuses (backreferences, lookaround, ...)
+    are rejected too, since only those can backtrack catastrophically on a guess.
+    """
+    try:
+        compile_flag_pattern(flag_value)
+    except re.error as e:
+        return str(e)
+    if re2 is not None:
+        try:
+            re2.compile(flag_value)
+        except re2.error as e:
+            return f'pattern is not supported by the linear-time matcher ({e})'
+    return None
+
 
 class ChallengeFlag(db.Model):
     """Model for multiple flags per challenge with branching support"""
@@ -50,10 +80,7 @@ class ChallengeFlag(db.Model):
         # Handle regex flags
         if self.is_regex:
             try:
-                if self.is_case_sensitive:
-                    pattern = re.compile(self.flag_value)
-                else:
-                    pattern = re.compile(self.flag_value, re.IGNORECASE)
+                pattern = compile_flag_pattern(self.flag_value, bool(self.is_case_sensitive))
                 return pattern.fullmatch(submitted_flag) is not None
             except re.error:
                 # Invalid regex pattern, fall back to exact match
@@ -17,8 +17,6 @@ class Challenge(db.Model):
     flag_case_sensitive = db.Column(db.Boolean, default=True)
     
     # Files and resources
-    files = db.Column(db.Text)  # JSON array of file URLs
-    images = db.Column(db.Text)  # JSON array of image URLs for display
     hints = db.Column(db.Text)  # JSON array of hints
     connection_info = db.Column(db.String(500))  # Connection info (nc host:port, URLs, etc.)
     
@@ -57,16 +55,48 @@ class Challenge(db.Model):
     
     # Relationships
     submissions = db.relationship('Submission', backref='challenge', lazy='dynamic', 
-                                cascade='all, delete-orphan')
+                                cascade='all, delete-orphan', passive_deletes=True)
     solves = db.relationship('Solve', backref='challenge', lazy='dynamic', 
-                           cascade='all, delete-orphan')
+                           cascade='all, delete-orphan', passive_deletes=True)
+    # Downloadable (non-image) files; read-only view over challenge_files so it can be eager-loaded
+    challenge_files = db.relationship(
+        'ChallengeFile',
+        primaryjoin='and_(Challenge.id == foreign(ChallengeFile.challenge_id), ChallengeFile.is_image == False)',
+        order_by='ChallengeFile.id',
+        viewonly=True
+    )
     
-    def get_current_points(self):
-        """Calculate current points based on number of solves"""
+    # Display images; same read-only view, restricted to image rows
+    challenge_images = db.relationship(
+        'ChallengeFile',
+        primaryjoin='and_(Challenge.id == foreign(ChallengeFile.challenge_id), ChallengeFile.is_image == True)',
+        order_by='ChallengeFile.id',
+        viewonly=True
+    )
+    
+    @property
+    def files(self):
+        """Download URLs of this challenge's files, derived from the challenge_files table"""
+        return [f.get_download_url() for f in self.challenge_files]
+    
+    @property
+    def images(self):
+        """URL and original filename of this challenge's display images"""
+        return [
+            {'url': img.get_download_url(), 'original_filename': img.original_filename}
+            for img in self.challenge_images
+        ]
+    
+    def get_current_points(self, solve_count=None):
+        """Calculate current points based on number of solves
+        
+        Pass solve_count when it was already fetched in bulk to skip the COUNT query.
+        """
         if not self.is_dynamic:
             return self.initial_points
         
-        solve_count = self.solves.count()
+        if solve_count is None:
+            solve_count = self.solves.count()
         if solve_count == 0:
             return self.initial_points
         
@@ -109,22 +139,49 @@ class Challenge(db.Model):
         """Get total number of submissions"""
         return self.submissions.count()
     
-    def check_flag(self, submitted_flag, team_id=None, user_id=None):
+    def get_flags(self):
+        """This challenge's ChallengeFlag rows, served from Redis between flag edits
+        
+        On a cache hit the flags are rebuilt as transient objects (not in the session),
+        so treat them as read-only values: columns only, no relationships.
+        """
+        from models.branching import ChallengeFlag
+        from services.cache import cache_service
+        
+        rows = cache_service.get_challenge_flags(self.id)
+        if rows is not None:
+            return [ChallengeFlag(**row) for row in rows]
+        
+        flags = ChallengeFlag.query.filter_by(challenge_id=self.id).order_by(ChallengeFlag.id).all()
+        cache_service.set_challenge_flags(self.id, [{
+            'id': flag.id,
+            'challenge_id': flag.challenge_id,
+            'flag_value': flag.flag_value,
+            'flag_label': flag.flag_label,
+            'is_case_sensitive': flag.is_case_sensitive,
+            'is_regex': flag.is_regex,
+            'unlocks_challenge_id': flag.unlocks_challenge_id,
+            'points_override': flag.points_override,
+        } for flag in flags])
+        return flags
+    
+    def check_flag(self, submitted_flag, team_id=None, user_id=None, flags=None):
         """Check if submitted flag is correct (checks all flags for this challenge)
         
         Args:
             submitted_flag: The flag string submitted by the user
             team_id: Optional team_id for dynamic flag validation
             user_id: Optional user_id for dynamic flag validation (when not in a team)
+            flags: This challenge's flags if the caller already has them from get_flags()
         
         Returns:
             Flag object if match found, True for legacy flags, or None if no match
         """
-        from models.branching import ChallengeFlag
         from services.cache import cache_service
         
         # Get all flags for this challenge
-        flags = ChallengeFlag.query.filter_by(challenge_id=self.id).all()
+        if flags is None:
+            flags = self.get_flags()
         
         # Check each flag (pass team_id and user_id for template-based flags)
         for flag in flags:
@@ -186,12 +243,12 @@ class Challenge(db.Model):
         return None
     
     def is_solved_by_user(self, user_id):
-        """Check if challenge is solved by user"""
-        return self.solves.filter_by(user_id=user_id).first() is not None
+        """Check if challenge is solved by user (EXISTS on the unique index, no row loaded)"""
+        return db.session.query(self.solves.filter_by(user_id=user_id).exists()).scalar()
     
     def is_solved_by_team(self, team_id):
-        """Check if challenge is solved by team"""
-        return self.solves.filter_by(team_id=team_id).first() is not None
+        """Check if challenge is solved by team (EXISTS on the unique index, no row loaded)"""
+        return db.session.query(self.solves.filter_by(team_id=team_id).exists()).scalar()
     
     def is_unlocked_for_user(self, user_id, team_id=None):
         """Check if challenge is unlocked for user/team based on prerequisites and flags"""
@@ -265,15 +322,15 @@ class Challenge(db.Model):
         
         return missing
     
-    def to_dict(self, include_flag=False, include_solves=True):
-        """Convert challenge to dictionary"""
+    def to_dict(self, include_flag=False, include_solves=True, solve_count=None):
+        """Convert challenge to dictionary (solve_count: pre-fetched solve count, if known)"""
         data = {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'category': self.category,
             'act': self.act,
-            'points': self.get_current_points(),
+            'points': self.get_current_points(solve_count),
             'initial_points': self.initial_points,
             'minimum_points': self.minimum_points,
             'is_visible': self.is_visible,
@@ -295,7 +352,7 @@ class Challenge(db.Model):
         }
         
         if include_solves:
-            data['solves'] = self.get_solves_count()
+            data['solves'] = self.get_solves_count() if solve_count is None else solve_count
             data['submissions'] = self.get_submissions_count()
         
         if include_flag:
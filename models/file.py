@@ -6,7 +6,7 @@ class ChallengeFile(db.Model):
     __tablename__ = 'challenge_files'
     
     id = db.Column(db.Integer, primary_key=True)
-    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id'), nullable=False, index=True)
+    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id', ondelete='CASCADE'), nullable=False, index=True)
     
     # File information
     original_filename = db.Column(db.String(255), nullable=False)
@@ -25,7 +25,7 @@ class ChallengeFile(db.Model):
     uploaded_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     
     # Relationship
-    challenge = db.relationship('Challenge', backref=db.backref('files_list', lazy='dynamic', cascade='all, delete-orphan'))
+    challenge = db.relationship('Challenge', backref=db.backref('files_list', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True))
     
     def get_download_url(self):
         """Get the download URL for this file"""
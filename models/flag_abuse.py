@@ -36,6 +36,15 @@ class FlagAbuseAttempt(db.Model):
     severity = db.Column(db.String(20), default='warning')  # warning, suspicious, critical
     notes = db.Column(db.Text, nullable=True)
     
+    __table_args__ = (
+        # Dashboard counts GROUP BY severity; read them from this narrow index instead of the table
+        db.Index('idx_flag_abuse_severity_ts', 'severity', 'timestamp'),
+        # Admin list filters, newest first
+        db.Index('idx_flag_abuse_team_ts', 'team_id', 'timestamp'),
+        db.Index('idx_flag_abuse_user_ts', 'user_id', 'timestamp'),
+        db.Index('idx_flag_abuse_challenge_ts', 'challenge_id', 'timestamp'),
+    )
+    
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='flag_abuse_attempts')
     team = db.relationship('Team', foreign_keys=[team_id], backref='flag_abuse_attempts')
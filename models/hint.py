@@ -19,7 +19,7 @@ class Hint(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
-    challenge = db.relationship('Challenge', backref=db.backref('hint_objects', lazy='dynamic', cascade='all, delete-orphan'))
+    challenge = db.relationship('Challenge', backref=db.backref('hint_objects', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True))
     unlocks = db.relationship('HintUnlock', backref='hint', lazy='dynamic', cascade='all, delete-orphan')
     
     # Self-referential relationship for prerequisites
@@ -100,6 +100,11 @@ class HintUnlock(db.Model):
     # Timestamps
     unlocked_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Hint logs list newest first
+    __table_args__ = (
+        db.Index('idx_hint_unlocks_unlocked_at', 'unlocked_at'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref=db.backref('hint_unlocks', lazy='dynamic'))
     team = db.relationship('Team', backref=db.backref('hint_unlocks', lazy='dynamic'))
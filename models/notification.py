@@ -12,6 +12,11 @@ class Notification(db.Model):
 	sent_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 	play_sound = db.Column(db.Boolean, default=True, nullable=False)
 
+	# Recent-first listings (declared in migrations/add_notifications.sql)
+	__table_args__ = (
+		db.Index('idx_notifications_created_at', 'created_at'),
+	)
+
 	def to_dict(self):
 		return {
 			'id': self.id,
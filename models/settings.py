@@ -1,6 +1,7 @@
 from datetime import datetime
+import time
 from models import db
-from flask import current_app
+from flask import current_app, g, has_request_context
 import json
 
 class Settings(db.Model):
@@ -31,9 +32,41 @@ class Settings(db.Model):
         """Generate cache key"""
         return f"{Settings.CACHE_PREFIX}{key}"
     
+    @staticmethod
+    def _request_cache():
+        """Per-request memo of raw setting entries, so a handler never re-reads the same key
+        
+        Only used inside a request: background loops keep one app context alive for their
+        whole lifetime and must keep seeing fresh values.
+        """
+        if not has_request_context():
+            return None
+        if '_settings_cache' not in g:
+            g._settings_cache = {}
+        return g._settings_cache
+    
     @staticmethod
     def get(key, default=None, type=None):
         """Get setting value by key with distributed Redis caching"""
+        memo = Settings._request_cache()
+        if memo is not None and key in memo:
+            raw = memo[key]
+        else:
+            raw = Settings._load_raw(key)
+            if raw is None:
+                return default
+            if memo is not None:
+                memo[key] = raw
+        
+        value_type = type or raw.get('type', 'string')
+        return Settings._convert_value(raw.get('value'), value_type, default)
+    
+    @staticmethod
+    def _load_raw(key):
+        """Fetch the stored {'value', 'type'} entry for a key from Redis, falling back to the DB
+        
+        Returns None when another worker holds the refresh lock and the value is still unknown.
+        """
         try:
             cache = Settings._get_cache()
             cache_key = Settings._cache_key(key)
@@ -41,15 +74,9 @@ class Settings(db.Model):
             # Try Redis cache first
             cached_value = cache.get(cache_key)
             if cached_value is not None:
-                # Cache hit - parse and return
                 if isinstance(cached_value, dict):
-                    value = cached_value.get('value')
-                    value_type = type or cached_value.get('type', 'string')
-                else:
-                    value = cached_value
-                    value_type = type or 'string'
-                
-                return Settings._convert_value(value, value_type, default)
+                    return cached_value
+                return {'value': cached_value, 'type': 'string'}
             
             lock_key = f"lock:{cache_key}"
             if cache.redis_client.set(lock_key, '1', ex=10, nx=True):
@@ -61,30 +88,88 @@ class Settings(db.Model):
                             'type': setting.value_type
                         }
                         cache.set(cache_key, cache_data, ttl=Settings.CACHE_TIMEOUT)
-                        
-                        value_type = type or setting.value_type
-                        return Settings._convert_value(setting.value, value_type, default)
+                        return cache_data
                     else:
                         cache.set(cache_key, {'value': None, 'type': 'none'}, ttl=60)
-                        return default
+                        return {'value': None, 'type': 'none'}
                 finally:
                     cache.redis_client.delete(lock_key)
             else:
-                import time
                 time.sleep(0.05)  
                 cached_value = cache.get(cache_key)
                 if cached_value and isinstance(cached_value, dict):
-                    value = cached_value.get('value')
-                    value_type = type or cached_value.get('type', 'string')
-                    return Settings._convert_value(value, value_type, default)
+                    return cached_value
         except Exception as e:
             print(f"Settings cache error: {e}")
             setting = Settings.query.filter_by(key=key).first()
             if setting:
-                value_type = type or setting.value_type
-                return Settings._convert_value(setting.value, value_type, default)
+                return {'value': setting.value, 'type': setting.value_type}
+            return {'value': None, 'type': 'none'}
+        
+        return None
+    
+    @staticmethod
+    def get_many(keys, defaults=None, types=None):
+        """Get several settings at once: one Redis MGET, then one SELECT ... IN for misses
+        
+        Args:
+            keys: Setting keys to fetch
+            defaults: Optional dict of key -> default value
+            types: Optional dict of key -> type override (same as `type` in get())
+        
+        Returns:
+            dict of key -> converted value
+        """
+        defaults = defaults or {}
+        types = types or {}
+        memo = Settings._request_cache()
+        raw = {k: memo[k] for k in keys if k in memo} if memo is not None else {}
+        uncached = [k for k in keys if k not in raw]
+        cache = None
+        
+        try:
+            cache = Settings._get_cache()
+            cached_values = cache.redis_client.mget([Settings._cache_key(k) for k in uncached]) if uncached else []
+            for key, data in zip(uncached, cached_values):
+                if data is None:
+                    continue
+                try:
+                    data = json.loads(data)
+                except (TypeError, ValueError):
+                    pass
+                raw[key] = data if isinstance(data, dict) else {'value': data, 'type': 'string'}
+        except Exception as e:
+            print(f"Settings cache error: {e}")
+            cache = None
+        
+        missing = [k for k in keys if k not in raw]
+        if missing:
+            rows = Settings.query.filter(Settings.key.in_(missing)).all()
+            found = {s.key: {'value': s.value, 'type': s.value_type} for s in rows}
+            for key in missing:
+                raw[key] = found.get(key, {'value': None, 'type': 'none'})
+            
+            if cache is not None:
+                try:
+                    pipe = cache.redis_client.pipeline()
+                    for key in missing:
+                        ttl = Settings.CACHE_TIMEOUT if key in found else 60
+                        pipe.setex(Settings._cache_key(key), ttl, json.dumps(raw[key]))
+                    pipe.execute()
+                except Exception as e:
+                    print(f"Settings cache error: {e}")
+        
+        if memo is not None:
+            memo.update(raw)
         
-        return default
+        return {
+            key: Settings._convert_value(
+                raw[key].get('value'),
+                types.get(key) or raw[key].get('type', 'string'),
+                defaults.get(key)
+            )
+            for key in keys
+        }
     
     @staticmethod
     def _convert_value(value, value_type, default):
@@ -114,17 +199,7 @@ class Settings(db.Model):
             setting = Settings(key=key, value_type=value_type, description=description)
             db.session.add(setting)
         
-        # Convert value to string for storage
-        if value_type == 'bool':
-            setting.value = 'true' if value else 'false'
-        elif value_type == 'datetime':
-            setting.value = value.isoformat() if value else None
-        else:
-            setting.value = str(value) if value is not None else None
-        
-        setting.value_type = value_type
-        if description:
-            setting.description = description
+        setting._assign(value, value_type, description)
         
         db.session.commit()
         
@@ -133,23 +208,74 @@ class Settings(db.Model):
         
         return setting
     
+    @staticmethod
+    def set_many(values):
+        """Set several settings in one transaction
+        
+        Args:
+            values: dict of key -> (value, value_type, description), same meaning as set()
+        
+        Existing rows are loaded with one SELECT ... IN, changes are flushed and committed
+        once, and the Redis entries are dropped in a single DELETE.
+        """
+        if not values:
+            return
+        
+        existing = {s.key: s for s in Settings.query.filter(Settings.key.in_(list(values))).all()}
+        for key, (value, value_type, description) in values.items():
+            setting = existing.get(key)
+            if not setting:
+                setting = Settings(key=key, value_type=value_type, description=description)
+                db.session.add(setting)
+            setting._assign(value, value_type, description)
+        
+        db.session.commit()
+        
+        Settings.clear_cache(list(values))
+    
+    def _assign(self, value, value_type, description=None):
+        """Serialize a value into this row (stored as text, tagged with its type)"""
+        if value_type == 'bool':
+            self.value = 'true' if value else 'false'
+        elif value_type == 'datetime':
+            self.value = value.isoformat() if value else None
+        else:
+            self.value = str(value) if value is not None else None
+        
+        self.value_type = value_type
+        if description:
+            self.description = description
+    
     @staticmethod
     def clear_cache(key=None):
-        """Clear settings cache in Redis (affects ALL workers)"""
+        """Clear settings cache in Redis (affects ALL workers)
+        
+        key may be a single key, a list of keys, or None to clear every setting.
+        """
+        keys = [key] if isinstance(key, str) else key
+        if not keys or any(k in Settings.CTF_STATUS_KEYS for k in keys):
+            Settings._ctf_status_cache = None
+        
+        memo = Settings._request_cache()
+        if memo is not None:
+            if keys:
+                for k in keys:
+                    memo.pop(k, None)
+            else:
+                memo.clear()
+        
         try:
             cache = Settings._get_cache()
             
-            if key:
-                # Clear specific key
-                cache.delete(Settings._cache_key(key))
+            if keys:
+                # Clear specific keys
+                cache_keys = [Settings._cache_key(k) for k in keys]
             else:
                 # Clear all settings caches
-                keys = cache.redis_client.keys(f"{Settings.CACHE_PREFIX}*")
-                if keys:
-                    cache.redis_client.delete(*keys)
+                cache_keys = cache.redis_client.keys(f"{Settings.CACHE_PREFIX}*")
             
-            # Also clear the "all settings" cache
-            cache.delete(Settings.CACHE_ALL_KEY)
+            # Also clear the "all settings" cache, in the same DELETE
+            cache.redis_client.delete(Settings.CACHE_ALL_KEY, *cache_keys)
         except Exception as e:
             print(f"Error clearing settings cache: {e}")
     
@@ -164,9 +290,9 @@ class Settings(db.Model):
             if cached:
                 return cached
             
-            # Cache miss - load all settings
+            # Cache miss - load all settings (rows already carry value and type)
             settings = Settings.query.all()
-            result = {s.key: Settings.get(s.key) for s in settings}
+            result = {s.key: Settings._convert_value(s.value, s.value_type, None) for s in settings}
             
             # Cache the complete dictionary
             cache.set(Settings.CACHE_ALL_KEY, result, ttl=Settings.CACHE_TIMEOUT)
@@ -176,12 +302,12 @@ class Settings(db.Model):
             # Fallback to direct database query
             print(f"Error getting all settings from cache: {e}")
             settings = Settings.query.all()
-            return {s.key: Settings.get(s.key) for s in settings}
+            return {s.key: Settings._convert_value(s.value, s.value_type, None) for s in settings}
     
     @staticmethod
     def is_ctf_started():
         """Check if CTF has started"""
-        start_time = Settings.get('ctf_start_time', type='datetime')
+        start_time = Settings.get_ctf_status_settings()['ctf_start_time']
         if not start_time:
             return True  # No start time set, CTF is always running
         return datetime.utcnow() >= start_time
@@ -189,7 +315,7 @@ class Settings(db.Model):
     @staticmethod
     def is_ctf_ended():
         """Check if CTF has ended"""
-        end_time = Settings.get('ctf_end_time', type='datetime')
+        end_time = Settings.get_ctf_status_settings()['ctf_end_time']
         if not end_time:
             return False  # No end time set, CTF never ends
         return datetime.utcnow() >= end_time
@@ -202,20 +328,55 @@ class Settings(db.Model):
     @staticmethod
     def is_ctf_paused():
         """Check if CTF is paused"""
-        return Settings.get('ctf_paused', False, type='bool')
+        return Settings.get_ctf_status_settings()['ctf_paused']
+    
+    CTF_STATUS_KEYS = ('ctf_start_time', 'ctf_end_time', 'ctf_paused')
+    CTF_STATUS_TYPES = {'ctf_start_time': 'datetime', 'ctf_end_time': 'datetime', 'ctf_paused': 'bool'}
+    # Per-process copy of the status settings: (expires_at, values). Only the stored values are
+    # cached; the status itself is recomputed on every call so start/end times stay exact.
+    CTF_STATUS_CACHE_SECONDS = 5
+    _ctf_status_cache = None
     
     @staticmethod
-    def get_ctf_status():
-        """Get current CTF status"""
-        if not Settings.is_ctf_started():
+    def get_ctf_status_settings():
+        """Fetch the start/end/paused settings that drive the CTF status in one batch
+        
+        Served from process memory for CTF_STATUS_CACHE_SECONDS; writes through set()/set_many()
+        in this worker drop the copy immediately, other workers pick changes up within the TTL.
+        """
+        cached = Settings._ctf_status_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
+        values = Settings.get_many(
+            Settings.CTF_STATUS_KEYS,
+            defaults={'ctf_paused': False},
+            types=Settings.CTF_STATUS_TYPES
+        )
+        Settings._ctf_status_cache = (time.monotonic() + Settings.CTF_STATUS_CACHE_SECONDS, values)
+        return dict(values)
+    
+    @staticmethod
+    def compute_ctf_status(start_time, end_time, is_paused):
+        """Derive the CTF status from already-fetched settings values"""
+        now = datetime.utcnow()
+        if start_time and now < start_time:
             return 'not_started'
-        elif Settings.is_ctf_ended():
+        elif end_time and now >= end_time:
             return 'ended'
-        elif Settings.is_ctf_paused():
+        elif is_paused:
             return 'paused'
         else:
             return 'running'
     
+    @staticmethod
+    def get_ctf_status():
+        """Get current CTF status"""
+        values = Settings.get_ctf_status_settings()
+        return Settings.compute_ctf_status(
+            values['ctf_start_time'], values['ctf_end_time'], values['ctf_paused']
+        )
+    
     def to_dict(self):
         """Convert setting to dictionary"""
         return {
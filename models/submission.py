@@ -9,7 +9,7 @@ class Submission(db.Model):
     
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id'), nullable=False, index=True)
+    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id', ondelete='CASCADE'), nullable=False, index=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=True, index=True)
     team = db.relationship('Team', backref=db.backref('sub_entries', lazy=True), lazy=True)
     
@@ -53,7 +53,7 @@ class Solve(db.Model):
     
     # Relationships
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
-    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id'), nullable=True, index=True)  # None for manual adjustments
+    challenge_id = db.Column(db.Integer, db.ForeignKey('challenges.id', ondelete='CASCADE'), nullable=True, index=True)  # None for manual adjustments
     flag_id = db.Column(db.Integer, db.ForeignKey('challenge_flags.id'), nullable=True)  # Which flag was used
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=True, index=True)
     
@@ -69,6 +69,9 @@ class Solve(db.Model):
     __table_args__ = (
         db.UniqueConstraint('user_id', 'challenge_id', name='unique_user_challenge'),
         db.UniqueConstraint('team_id', 'challenge_id', name='unique_team_challenge'),
+        # Solve history per user/team, newest first
+        db.Index('idx_solves_user_solved_at', 'user_id', 'solved_at'),
+        db.Index('idx_solves_team_solved_at', 'team_id', 'solved_at'),
     )
     
     def get_current_points(self):
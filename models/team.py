@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from models import db, team_members
 
 class Team(db.Model):
@@ -34,7 +35,10 @@ class Team(db.Model):
         For static challenges: Uses stored points_earned
         """
         # Sum solve points (recalculated for dynamic challenges)
-        solve_points = sum([solve.get_current_points() for solve in self.solves])
+        from services.scoring import ScoringService
+        solve_points = ScoringService.total_solve_points(
+            self.solves.options(joinedload(Solve.challenge)).all()
+        )
         
         # Subtract hint costs
         from models.hint import HintUnlock
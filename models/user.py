@@ -1,8 +1,17 @@
+import secrets
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from models import db
 
+@lru_cache(maxsize=1)
+def _dummy_password_hash():
+    """Hash of a random password, checked when a login names a user that doesn't exist"""
+    return generate_password_hash(secrets.token_hex(16))
+
+
 class User(UserMixin, db.Model):
     """User model for authentication and profile"""
     __tablename__ = 'users'
@@ -39,10 +48,19 @@ class User(UserMixin, db.Model):
         """Check if password matches hash"""
         return check_password_hash(self.password_hash, password)
     
+    @staticmethod
+    def check_password_for_missing_user(password):
+        """Spend the same hashing time as check_password for an unknown username; always False
+        
+        Keeps response timing from revealing which usernames exist.
+        """
+        check_password_hash(_dummy_password_hash(), password)
+        return False
+    
     def get_team(self):
-        """Get user's team"""
+        """Get user's team (repeat calls in a request come from the session's identity map)"""
         from models.team import Team
-        return Team.query.get(self.team_id) if self.team_id else None
+        return db.session.get(Team, self.team_id) if self.team_id else None
     
     def get_score(self):
         """Calculate user's total score dynamically (solves - hint costs)
@@ -55,7 +73,11 @@ class User(UserMixin, db.Model):
             return team.get_score() if team else 0
         else:
             # Sum solve points (recalculated for dynamic challenges)
-            solve_points = sum([solve.get_current_points() for solve in self.solves])
+            from services.scoring import ScoringService
+            from models.submission import Solve
+            solve_points = ScoringService.total_solve_points(
+                self.solves.options(joinedload(Solve.challenge)).all()
+            )
             
             # Subtract hint costs
             from models.hint import HintUnlock
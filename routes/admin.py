@@ -1,7 +1,13 @@
-from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app
+from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for, current_app, abort, g
 from flask_login import login_required, current_user
 from functools import wraps
-from datetime import datetime
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, joinedload
+from werkzeug.utils import secure_filename
 from models import db
 from models.user import User
 from models.team import Team
@@ -9,42 +15,167 @@ from models.challenge import Challenge
 from models.submission import Submission, Solve
 from models.file import ChallengeFile
 from models.hint import Hint, HintUnlock
-from models.settings import Settings
+from models.settings import Settings, DockerSettings
+from models.branching import ChallengeFlag, ChallengePrerequisite, ChallengeUnlock, validate_flag_pattern
+from models.container import ContainerInstance, ContainerEvent
+from models.flag_abuse import FlagAbuseAttempt
+from models.audit_log import AuditLog
+from services.backup_scheduler import (
+    BACKUP_EXTENSION, BACKUP_EXTENSIONS, archive_uploads, backup_name_of, dump_database,
+    find_backup_file, iter_sql_statements, open_backup, partial_path, snapshot_redis
+)
 from services.cache import cache_service
-from services.file_storage import file_storage
+from services.file_storage import file_storage, COPY_CHUNK_SIZE
+from services.scoring import ScoringService
+import hashlib
 import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import pytz
 from models.notification import Notification
 from services.websocket import WebSocketService
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+# Rows per page on the users/teams/challenges management lists
+ADMIN_LIST_PER_PAGE = 50
+
+# Image types accepted for the CTF logo (checked before anything is written)
+LOGO_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'}
+
+# Custom background CSS validation: strip comments, then reject anything that could run script
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_DANGEROUS_CSS_RE = re.compile(
+    r'<script|javascript:|onerror|onload|eval\(|expression\(|import\s+["\']'
+    r'|behavior:|binding:|-moz-binding',
+    re.IGNORECASE
+)
+
 def admin_required(f):
     """Decorator to require admin access"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or not current_user.is_admin:
+        # Resolve the check once per request, however many admin views/helpers run
+        if getattr(g, '_is_admin', None) is None:
+            g._is_admin = current_user.is_authenticated and current_user.is_admin
+        if not g._is_admin:
             flash('Admin access required', 'error')
             return redirect(url_for('index'))
         return f(*args, **kwargs)
     return decorated_function
 
 
+# Checkbox/select values the challenge forms send for "on"
+TRUE_FORM_VALUES = frozenset({'true', 'on', '1'})
+
+def _form_bool(form, key):
+    """Read a checkbox-style form field as a bool"""
+    return (form.get(key) or '').lower() in TRUE_FORM_VALUES
+
+def _parse_int(value, default=None):
+    """Parse an integer form value, falling back to default when missing or malformed"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _form_int(form, key, default):
+    """Read an integer form field, falling back to default when missing or malformed"""
+    return _parse_int(form.get(key), default)
+
+# Plain Challenge columns filled from the create/edit form, grouped by how they are parsed
+CHALLENGE_TEXT_FIELDS = ('name', 'description', 'category', 'flag', 'connection_info', 'author', 'difficulty')
+CHALLENGE_BOOL_FIELDS = ('flag_case_sensitive', 'is_visible', 'is_dynamic', 'requires_team', 'detect_regex_sharing')
+CHALLENGE_INT_FIELDS = {'initial_points': 500, 'minimum_points': 50, 'decay_solves': 30, 'max_attempts': 0}
+
+def _challenge_form_values(form, act_system_enabled):
+    """Challenge column values shared by create_challenge and edit_challenge (Docker fields excluded)"""
+    values = {field: form.get(field) for field in CHALLENGE_TEXT_FIELDS}
+    values.update((field, _form_bool(form, field)) for field in CHALLENGE_BOOL_FIELDS)
+    values.update((field, _form_int(form, field, default)) for field, default in CHALLENGE_INT_FIELDS.items())
+    # Only set ACT fields if ACT system is enabled
+    values['act'] = form.get('act', 'ACT I') if act_system_enabled else None
+    values['unlocks_act'] = (form.get('unlocks_act') or None) if act_system_enabled else None
+    return values
+
+def _parse_additional_flags(form, challenge_id):
+    """Build ChallengeFlag insert rows from the additional_flags[] form fields"""
+    flag_fields = zip_longest(
+        form.getlist('additional_flags[]'),
+        form.getlist('flag_labels[]'),
+        form.getlist('flag_points[]'),
+        form.getlist('flag_case[]'),
+        form.getlist('flag_is_regex[]')
+    )
+    flag_rows = []
+    for value, label, points, case, is_regex in flag_fields:
+        value = value.strip() if value else None
+        if not value:
+            continue
+        label = label.strip() if label else None
+        flag_rows.append({
+            'challenge_id': challenge_id,
+            'flag_value': value,
+            'flag_label': label or None,
+            'points_override': _parse_int(points),
+            'is_case_sensitive': case == 'true' if case is not None else True,
+            'is_regex': is_regex == 'true'
+        })
+    return flag_rows
+
+def _save_challenge_uploads(field, challenge_id, is_image=False):
+    """Save the uploads in a request.files field concurrently and stage their ChallengeFile rows"""
+    files = file_storage.filter_uploads(request.files.getlist(field))
+    kind = 'image' if is_image else 'file'
+    saved = []
+    records = []
+    for upload, file_info, error in file_storage.save_challenge_files(files, challenge_id):
+        if error:
+            flash(f'Error uploading {kind} {upload.filename}: {str(error)}', 'warning')
+        elif file_info:
+            records.append(ChallengeFile(
+                challenge_id=challenge_id,
+                original_filename=file_info['original_filename'],
+                stored_filename=file_info['stored_filename'],
+                filepath=file_info['filepath'],
+                relative_path=file_info['relative_path'],
+                file_hash=file_info['hash'],
+                file_size=file_info['size'],
+                uploaded_by=current_user.id,
+                is_image=is_image
+            ))
+            saved.append(file_info)
+    db.session.add_all(records)
+    return saved
+
 @admin_bp.route('/')
 @login_required
 @admin_required
 def dashboard():
     """Admin dashboard"""
-    # Get statistics
-    stats = {
-        'users': User.query.count(),
-        'teams': Team.query.count(),
-        'challenges': Challenge.query.count(),
-        'submissions': Submission.query.count(),
-        'solves': Solve.query.filter(Solve.challenge_id.isnot(None)).count()
-    }
+    # Get statistics (cached briefly; all counts in a single round-trip via scalar subqueries)
+    stats = cache_service.get_admin_stats()
+    if stats is None:
+        counts = db.session.execute(db.select(
+            db.select(db.func.count(User.id)).scalar_subquery().label('users'),
+            db.select(db.func.count(Team.id)).scalar_subquery().label('teams'),
+            db.select(db.func.count(Challenge.id)).scalar_subquery().label('challenges'),
+            db.select(db.func.count(Submission.id)).scalar_subquery().label('submissions'),
+            db.select(db.func.count(Solve.id)).where(Solve.challenge_id.isnot(None)).scalar_subquery().label('solves')
+        )).one()
+        stats = dict(counts._mapping)
+        cache_service.set_admin_stats(stats)
     
     # Recent activity
-    recent_solves = Solve.query.order_by(Solve.solved_at.desc()).limit(10).all()
+    recent_solves = Solve.query.options(
+        joinedload(Solve.user),
+        joinedload(Solve.team),
+        joinedload(Solve.challenge)
+    ).order_by(Solve.solved_at.desc()).limit(10).all()
     
     return render_template('admin/dashboard.html', stats=stats, recent_solves=recent_solves)
 
@@ -72,8 +203,26 @@ def manage_challenges():
         else:
             query = query.order_by(Challenge.name.asc())
 
-    challenges = query.all()
-    return render_template('admin/challenges.html', challenges=challenges, current_sort=sort, current_order=order)
+    page = request.args.get('page', 1, type=int)
+    pagination = query.paginate(page=page, per_page=ADMIN_LIST_PER_PAGE, error_out=False)
+    
+    # Solve counts for the whole page in one grouped query instead of a COUNT per row
+    challenge_ids = [c.id for c in pagination.items]
+    solve_counts = dict(
+        db.session.query(Solve.challenge_id, db.func.count(Solve.id))
+        .filter(Solve.challenge_id.in_(challenge_ids))
+        .group_by(Solve.challenge_id)
+        .all()
+    ) if challenge_ids else {}
+    for challenge in pagination.items:
+        challenge.solve_count = solve_counts.get(challenge.id, 0)
+        challenge.current_points = ScoringService.calculate_dynamic_points(challenge, challenge.solve_count)
+    
+    return render_template('admin/challenges.html',
+                          challenges=pagination.items,
+                          pagination=pagination,
+                          current_sort=sort,
+                          current_order=order)
 
 
 @admin_bp.route('/challenges/create', methods=['GET', 'POST'])
@@ -85,38 +234,18 @@ def create_challenge():
     act_system_enabled = Settings.get('act_system_enabled', default=False, type='bool')
     
     if request.method == 'POST':
-        from models.branching import ChallengeFlag
         
         data = request.form
         
-        # Only set ACT fields if ACT system is enabled
-        act_value = data.get('act', 'ACT I') if act_system_enabled else None
-        unlocks_act_value = (data.get('unlocks_act') if data.get('unlocks_act') else None) if act_system_enabled else None
+        docker_enabled = _form_bool(data, 'docker_enabled')
         
         challenge = Challenge(
-            name=data.get('name'),
-            description=data.get('description'),
-            category=data.get('category'),
-            act=act_value,
-            flag=data.get('flag'),
-            flag_case_sensitive=data.get('flag_case_sensitive') == 'true',
-            connection_info=data.get('connection_info'),
-            initial_points=int(data.get('initial_points', 500)),
-            minimum_points=int(data.get('minimum_points', 50)),
-            decay_solves=int(data.get('decay_solves', 30)),
-            max_attempts=int(data.get('max_attempts', 0)),
-            is_visible=data.get('is_visible') == 'true',
-            is_dynamic=data.get('is_dynamic') == 'true',
-            requires_team=data.get('requires_team') == 'true',
-            author=data.get('author'),
-            difficulty=data.get('difficulty'),
-            unlocks_act=unlocks_act_value,
+            **_challenge_form_values(data, act_system_enabled),
             # Docker fields
-            docker_enabled=data.get('docker_enabled') == 'true',
-            docker_image=data.get('docker_image') if data.get('docker_enabled') == 'true' else None,
-            docker_connection_info=data.get('docker_connection_info') if data.get('docker_enabled') == 'true' else None,
-            docker_flag_path=data.get('docker_flag_path') if data.get('docker_enabled') == 'true' else None,
-            detect_regex_sharing=data.get('detect_regex_sharing') == 'true'
+            docker_enabled=docker_enabled,
+            docker_image=data.get('docker_image') if docker_enabled else None,
+            docker_connection_info=data.get('docker_connection_info') if docker_enabled else None,
+            docker_flag_path=data.get('docker_flag_path') if docker_enabled else None
         )
         
         db.session.add(challenge)
@@ -127,36 +256,16 @@ def create_challenge():
             challenge_id=challenge.id,
             flag_value=data.get('flag'),
             flag_label='Primary Flag',
-            is_case_sensitive=data.get('flag_case_sensitive') == 'true',
-            is_regex=data.get('is_regex') == 'true'
+            is_case_sensitive=_form_bool(data, 'flag_case_sensitive'),
+            is_regex=_form_bool(data, 'is_regex')
         )
         db.session.add(primary_flag)
         
         # Handle additional flags
-        additional_flags = request.form.getlist('additional_flags[]')
-        flag_labels = request.form.getlist('flag_labels[]')
-        flag_points = request.form.getlist('flag_points[]')
-        flag_cases = request.form.getlist('flag_case[]')
-        flag_is_regex = request.form.getlist('flag_is_regex[]')
-        
-        for i in range(len(additional_flags)):
-            if additional_flags[i].strip():
-                points_override = None
-                if i < len(flag_points) and flag_points[i].strip():
-                    try:
-                        points_override = int(flag_points[i])
-                    except ValueError:
-                        pass
-                
-                additional_flag = ChallengeFlag(
-                    challenge_id=challenge.id,
-                    flag_value=additional_flags[i].strip(),
-                    flag_label=flag_labels[i].strip() if i < len(flag_labels) and flag_labels[i].strip() else None,
-                    points_override=points_override,
-                    is_case_sensitive=flag_cases[i] == 'true' if i < len(flag_cases) else True,
-                    is_regex=(i < len(flag_is_regex) and flag_is_regex[i] == 'true')
-                )
-                db.session.add(additional_flag)
+        flag_rows = _parse_additional_flags(request.form, challenge.id)
+        if flag_rows:
+            # One executemany INSERT instead of a flush per flag
+            db.session.execute(db.insert(ChallengeFlag), flag_rows)
         
         # Handle hints
         hint_contents = request.form.getlist('hint_content[]')
@@ -164,94 +273,49 @@ def create_challenge():
         hint_orders = request.form.getlist('hint_order[]')
         hint_requires = request.form.getlist('hint_requires[]')
         
-        # First pass: Create hints without prerequisites
-        created_hints = {}
-        for i in range(len(hint_contents)):
-            if hint_contents[i].strip():
-                order = int(hint_orders[i]) if i < len(hint_orders) else (i + 1)
-                hint = Hint(
-                    challenge_id=challenge.id,
-                    content=hint_contents[i],
-                    cost=int(hint_costs[i]) if i < len(hint_costs) else 10,
-                    order=order
-                )
-                db.session.add(hint)
-                created_hints[order] = hint
-        
-        # Flush to get hint IDs
-        db.session.flush()
-        
-        # Second pass: Set prerequisites based on order
-        for i in range(len(hint_contents)):
-            if hint_contents[i].strip():
-                order = int(hint_orders[i]) if i < len(hint_orders) else (i + 1)
-                requires_order = hint_requires[i] if i < len(hint_requires) and hint_requires[i] else None
-                
-                if requires_order and requires_order.strip():
-                    requires_order = int(requires_order)
-                    if requires_order in created_hints:
-                        created_hints[order].requires_hint_id = created_hints[requires_order].id
+        # First pass: Insert all hints in one executemany, without prerequisites
+        hint_rows = []
+        pending_requires = []
+        hint_fields = zip_longest(hint_contents, hint_costs, hint_orders, hint_requires)
+        for position, (content, cost, order, requires_order) in enumerate(hint_fields, start=1):
+            if not content or not content.strip():
+                continue
+            order = int(order) if order else position
+            hint_rows.append({
+                'challenge_id': challenge.id,
+                'content': content,
+                'cost': int(cost) if cost else 10,
+                'order': order
+            })
+            if requires_order and requires_order.strip():
+                pending_requires.append((order, int(requires_order)))
+        
+        if hint_rows:
+            db.session.execute(db.insert(Hint), hint_rows)
+        
+        # Second pass: Set prerequisites based on order. MySQL has no INSERT ... RETURNING,
+        # so read the new IDs back in one query and apply them in one executemany UPDATE
+        if pending_requires:
+            created_hints = dict(db.session.execute(
+                db.select(Hint.order, Hint.id)
+                .where(Hint.challenge_id == challenge.id)
+                .order_by(Hint.id)
+            ).all())
+            requires_rows = [
+                {'id': created_hints[order], 'requires_hint_id': created_hints[requires_order]}
+                for order, requires_order in pending_requires
+                if requires_order in created_hints
+            ]
+            if requires_rows:
+                db.session.bulk_update_mappings(Hint, requires_rows)
         
         # Handle file uploads
-        uploaded_files = []
         if 'files' in request.files:
-            files = request.files.getlist('files')
-            for file in files:
-                if file and file.filename:
-                    try:
-                        file_info = file_storage.save_challenge_file(file, challenge.id)
-                        if file_info:
-                            # Create ChallengeFile record
-                            challenge_file = ChallengeFile(
-                                challenge_id=challenge.id,
-                                original_filename=file_info['original_filename'],
-                                stored_filename=file_info['stored_filename'],
-                                filepath=file_info['filepath'],
-                                relative_path=file_info['relative_path'],
-                                file_hash=file_info['hash'],
-                                file_size=file_info['size'],
-                                uploaded_by=current_user.id
-                            )
-                            db.session.add(challenge_file)
-                            uploaded_files.append(file_info)
-                    except Exception as e:
-                        flash(f'Error uploading file {file.filename}: {str(e)}', 'warning')
-        
-        # Store file URLs in challenge (for backward compatibility)
-        if uploaded_files:
-            file_urls = [f['url'] for f in uploaded_files]
-            challenge.files = json.dumps(file_urls)
+            _save_challenge_uploads('files', challenge.id)
         
         # Handle image uploads
-        uploaded_images = []
         if 'images' in request.files:
-            images = request.files.getlist('images')
-            for image in images:
-                if image and image.filename:
-                    try:
-                        image_info = file_storage.save_challenge_file(image, challenge.id)
-                        if image_info:
-                            # Create ChallengeFile record for image
-                            challenge_image = ChallengeFile(
-                                challenge_id=challenge.id,
-                                original_filename=image_info['original_filename'],
-                                stored_filename=image_info['stored_filename'],
-                                filepath=image_info['filepath'],
-                                relative_path=image_info['relative_path'],
-                                file_hash=image_info['hash'],
-                                file_size=image_info['size'],
-                                uploaded_by=current_user.id,
-                                is_image=True  # Mark as image
-                            )
-                            db.session.add(challenge_image)
-                            uploaded_images.append(image_info)
-                    except Exception as e:
-                        flash(f'Error uploading image {image.filename}: {str(e)}', 'warning')
-        
-        # Store image URLs in challenge
-        if uploaded_images:
-            image_urls = [{'url': img['url'], 'original_filename': img['original_filename']} for img in uploaded_images]
-            challenge.images = json.dumps(image_urls)
+            _save_challenge_uploads('images', challenge.id, is_image=True)
         
         db.session.commit()
         
@@ -268,36 +332,19 @@ def create_challenge():
 @admin_required
 def edit_challenge(challenge_id):
     """Edit a challenge"""
-    challenge = Challenge.query.get_or_404(challenge_id)
+    challenge = db.get_or_404(Challenge, challenge_id)
     
     # Check if ACT system is enabled
     act_system_enabled = Settings.get('act_system_enabled', default=False, type='bool')
     
     if request.method == 'POST':
-        from models.branching import ChallengeFlag
         data = request.form
         
-        challenge.name = data.get('name')
-        challenge.description = data.get('description')
-        challenge.category = data.get('category')
-        # Only set ACT fields if ACT system is enabled
-        challenge.act = data.get('act', 'ACT I') if act_system_enabled else None
-        challenge.flag = data.get('flag')
-        challenge.flag_case_sensitive = data.get('flag_case_sensitive') == 'true'
-        challenge.connection_info = data.get('connection_info')
-        challenge.initial_points = int(data.get('initial_points', 500))
-        challenge.minimum_points = int(data.get('minimum_points', 50))
-        challenge.decay_solves = int(data.get('decay_solves', 30))
-        challenge.max_attempts = int(data.get('max_attempts', 0))
-        challenge.is_visible = data.get('is_visible') == 'true'
-        challenge.is_dynamic = data.get('is_dynamic') == 'true'
-        challenge.requires_team = data.get('requires_team') == 'true'
-        challenge.author = data.get('author')
-        challenge.difficulty = data.get('difficulty')
-        challenge.unlocks_act = (data.get('unlocks_act') if data.get('unlocks_act') else None) if act_system_enabled else None
+        for attr, value in _challenge_form_values(data, act_system_enabled).items():
+            setattr(challenge, attr, value)
         
         # Handle Docker container settings
-        challenge.docker_enabled = data.get('docker_enabled') == 'true'
+        challenge.docker_enabled = _form_bool(data, 'docker_enabled')
         if challenge.docker_enabled:
             docker_image_value = data.get('docker_image')
             if docker_image_value == 'custom' or not docker_image_value:
@@ -313,49 +360,56 @@ def edit_challenge(challenge_id):
             challenge.docker_image = None
             challenge.docker_connection_info = None
 
-        # Regex sharing detection toggle
-        challenge.detect_regex_sharing = data.get('detect_regex_sharing') == 'true'
-        
-        # Update primary flag in challenge_flags table
-        primary_flag = ChallengeFlag.query.filter_by(
-            challenge_id=challenge_id,
-            flag_label='Primary Flag'
-        ).first()
-        
-        if primary_flag:
-            primary_flag.flag_value = data.get('flag')
-            primary_flag.is_case_sensitive = data.get('flag_case_sensitive') == 'true'
-            primary_flag.is_regex = data.get('is_regex') == 'true'
-        else:
+        # Update primary flag in challenge_flags table; only insert when the UPDATE matched nothing
+        primary_flag_values = {
+            'flag_value': data.get('flag'),
+            'is_case_sensitive': _form_bool(data, 'flag_case_sensitive'),
+            'is_regex': _form_bool(data, 'is_regex')
+        }
+        updated = db.session.execute(
+            db.update(ChallengeFlag)
+            .where(ChallengeFlag.challenge_id == challenge_id, ChallengeFlag.flag_label == 'Primary Flag')
+            .values(**primary_flag_values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        
+        if not updated:
             # Create primary flag if it doesn't exist
-            primary_flag = ChallengeFlag(
+            db.session.add(ChallengeFlag(
                 challenge_id=challenge_id,
-                flag_value=data.get('flag'),
                 flag_label='Primary Flag',
-                is_case_sensitive=data.get('flag_case_sensitive') == 'true',
-                is_regex=data.get('is_regex') == 'true'
+                **primary_flag_values
+            ))
+        
+        # Handle existing hints updates: one executemany UPDATE straight from the form, with
+        # the challenge_id criterion keeping it to hints that belong to this challenge
+        hint_rows = []
+        for key in data:
+            hint_id = key[len('existing_hint_content_'):]
+            if not key.startswith('existing_hint_content_') or not hint_id.isdigit():
+                continue
+            row = {
+                'id': int(hint_id),
+                'content': data[key],
+            }
+            cost = data.get(f'existing_hint_cost_{hint_id}')
+            if cost is not None:
+                row['cost'] = int(cost)
+            order = data.get(f'existing_hint_order_{hint_id}')
+            if order is not None:
+                row['order'] = int(order)
+
+            # Handle prerequisite
+            requires_id = data.get(f'existing_hint_requires_{hint_id}')
+            row['requires_hint_id'] = int(requires_id) if requires_id and requires_id.strip() else None
+            hint_rows.append(row)
+
+        if hint_rows:
+            db.session.execute(
+                db.update(Hint).where(Hint.challenge_id == challenge_id),
+                hint_rows,
+                execution_options={'synchronize_session': None}
             )
-            db.session.add(primary_flag)
-        
-        # Handle existing hints updates
-        existing_hints = Hint.query.filter_by(challenge_id=challenge_id).all()
-        for hint in existing_hints:
-            content_key = f'existing_hint_content_{hint.id}'
-            cost_key = f'existing_hint_cost_{hint.id}'
-            order_key = f'existing_hint_order_{hint.id}'
-            requires_key = f'existing_hint_requires_{hint.id}'
-            
-            if content_key in data:
-                hint.content = data[content_key]
-                hint.cost = int(data[cost_key])
-                hint.order = int(data[order_key])
-                
-                # Handle prerequisite
-                requires_id = data.get(requires_key)
-                if requires_id and requires_id.strip():
-                    hint.requires_hint_id = int(requires_id)
-                else:
-                    hint.requires_hint_id = None
         
         # Handle new hints
         hint_contents = request.form.getlist('hint_content[]')
@@ -363,28 +417,22 @@ def edit_challenge(challenge_id):
         hint_orders = request.form.getlist('hint_order[]')
         hint_requires = request.form.getlist('hint_requires[]')
         
-        # First pass: Create hints without prerequisites
-        created_hints = []
-        for i in range(len(hint_contents)):
-            if hint_contents[i].strip():
-                hint = Hint(
-                    challenge_id=challenge.id,
-                    content=hint_contents[i],
-                    cost=int(hint_costs[i]) if i < len(hint_costs) else 10,
-                    order=int(hint_orders[i]) if i < len(hint_orders) else (i + 1)
-                )
-                db.session.add(hint)
-                created_hints.append((hint, i))
-        
-        # Flush to get IDs for new hints
-        db.session.flush()
-        
-        # Second pass: Set prerequisites for new hints
-        for hint, i in created_hints:
-            requires_id = hint_requires[i] if i < len(hint_requires) and hint_requires[i] else None
-            if requires_id and requires_id.strip():
-                hint.requires_hint_id = int(requires_id)
-                
+        # Prerequisites of new hints reference existing hint IDs, so they can be set directly
+        hint_rows = []
+        hint_fields = zip_longest(hint_contents, hint_costs, hint_orders, hint_requires)
+        for position, (content, cost, order, requires_id) in enumerate(hint_fields, start=1):
+            if not content or not content.strip():
+                continue
+            hint_rows.append({
+                'challenge_id': challenge.id,
+                'content': content,
+                'cost': int(cost) if cost else 10,
+                'order': int(order) if order else position,
+                'requires_hint_id': int(requires_id) if requires_id and requires_id.strip() else None
+            })
+        if hint_rows:
+            db.session.execute(db.insert(Hint), hint_rows)
+        
         # Handle existing additional flags updates
         existing_flags = ChallengeFlag.query.filter(
             ChallengeFlag.challenge_id == challenge_id,
@@ -409,127 +457,45 @@ def edit_challenge(challenge_id):
                 else:
                     flag.points_override = None
                     
-                flag.is_case_sensitive = data.get(case_key) == 'true'
-                flag.is_regex = data.get(regex_key) == 'true'
+                flag.is_case_sensitive = _form_bool(data, case_key)
+                flag.is_regex = _form_bool(data, regex_key)
                 
         # Handle new additional flags
-        additional_flags = request.form.getlist('additional_flags[]')
-        flag_labels = request.form.getlist('flag_labels[]')
-        flag_points = request.form.getlist('flag_points[]')
-        flag_cases = request.form.getlist('flag_case[]')
-        flag_is_regex = request.form.getlist('flag_is_regex[]')
-        
-        for i in range(len(additional_flags)):
-            if additional_flags[i].strip():
-                points_override = None
-                if i < len(flag_points) and flag_points[i].strip():
-                    try:
-                        points_override = int(flag_points[i])
-                    except ValueError:
-                        pass
-                
-                additional_flag = ChallengeFlag(
-                    challenge_id=challenge.id,
-                    flag_value=additional_flags[i].strip(),
-                    flag_label=flag_labels[i].strip() if i < len(flag_labels) and flag_labels[i].strip() else None,
-                    points_override=points_override,
-                    is_case_sensitive=flag_cases[i] == 'true' if i < len(flag_cases) else True,
-                    is_regex=(i < len(flag_is_regex) and flag_is_regex[i] == 'true')
-                )
-                db.session.add(additional_flag)
+        flag_rows = _parse_additional_flags(request.form, challenge.id)
+        if flag_rows:
+            # One executemany INSERT instead of a flush per flag
+            db.session.execute(db.insert(ChallengeFlag), flag_rows)
         
         # Handle new file uploads
         if 'files' in request.files:
-            files = request.files.getlist('files')
-            uploaded_files = []
-            
-            for file in files:
-                if file and file.filename:
-                    try:
-                        file_info = file_storage.save_challenge_file(file, challenge.id)
-                        if file_info:
-                            # Create ChallengeFile record
-                            challenge_file = ChallengeFile(
-                                challenge_id=challenge.id,
-                                original_filename=file_info['original_filename'],
-                                stored_filename=file_info['stored_filename'],
-                                filepath=file_info['filepath'],
-                                relative_path=file_info['relative_path'],
-                                file_hash=file_info['hash'],
-                                file_size=file_info['size'],
-                                uploaded_by=current_user.id
-                            )
-                            db.session.add(challenge_file)
-                            uploaded_files.append(file_info)
-                    except Exception as e:
-                        flash(f'Error uploading file {file.filename}: {str(e)}', 'warning')
-            
-            # Update file URLs if new files were uploaded
-            if uploaded_files:
-                existing_urls = json.loads(challenge.files) if challenge.files else []
-                new_urls = [f['url'] for f in uploaded_files]
-                all_urls = existing_urls + new_urls
-                challenge.files = json.dumps(all_urls)
+            _save_challenge_uploads('files', challenge.id)
         
         # Handle new image uploads
         if 'images' in request.files:
-            images = request.files.getlist('images')
-            uploaded_images = []
-            
-            for image in images:
-                if image and image.filename:
-                    try:
-                        image_info = file_storage.save_challenge_file(image, challenge.id)
-                        if image_info:
-                            # Create ChallengeFile record for image
-                            challenge_image = ChallengeFile(
-                                challenge_id=challenge.id,
-                                original_filename=image_info['original_filename'],
-                                stored_filename=image_info['stored_filename'],
-                                filepath=image_info['filepath'],
-                                relative_path=image_info['relative_path'],
-                                file_hash=image_info['hash'],
-                                file_size=image_info['size'],
-                                uploaded_by=current_user.id,
-                                is_image=True
-                            )
-                            db.session.add(challenge_image)
-                            uploaded_images.append(image_info)
-                    except Exception as e:
-                        flash(f'Error uploading image {image.filename}: {str(e)}', 'warning')
-            
-            # Update image URLs if new images were uploaded
-            if uploaded_images:
-                existing_imgs = json.loads(challenge.images) if challenge.images else []
-                new_imgs = [{'url': img['url'], 'original_filename': img['original_filename']} for img in uploaded_images]
-                all_imgs = existing_imgs + new_imgs
-                challenge.images = json.dumps(all_imgs)
+            _save_challenge_uploads('images', challenge.id, is_image=True)
         
         db.session.commit()
         
-        cache_service.invalidate_challenge(challenge_id)
-        cache_service.invalidate_all_challenges()
+        cache_service.invalidate_challenge_and_all(challenge_id)
         
         flash(f'Challenge "{challenge.name}" updated successfully!', 'success')
         return redirect(url_for('admin.manage_challenges'))
     
-    # Get existing files and hints
-    existing_files = ChallengeFile.query.filter_by(challenge_id=challenge_id, is_image=False).all()
-    existing_images = ChallengeFile.query.filter_by(challenge_id=challenge_id, is_image=True).all()
+    # Get existing files and images in one query, split by kind
+    existing_files = []
+    existing_images = []
+    for challenge_file in ChallengeFile.query.filter_by(challenge_id=challenge_id).order_by(ChallengeFile.id):
+        (existing_images if challenge_file.is_image else existing_files).append(challenge_file)
     existing_hints = Hint.query.filter_by(challenge_id=challenge_id).order_by(Hint.order).all()
     
-    # Get primary flag to check is_regex status
-    from models.branching import ChallengeFlag
-    primary_flag = ChallengeFlag.query.filter_by(
-        challenge_id=challenge_id,
-        flag_label='Primary Flag'
-    ).first()
-    
-    # Get existing additional flags
-    additional_flags = ChallengeFlag.query.filter(
-        ChallengeFlag.challenge_id == challenge_id,
-        ChallengeFlag.flag_label != 'Primary Flag'
-    ).all()
+    # Get primary flag (to check is_regex status) and additional flags in one query
+    primary_flag = None
+    additional_flags = []
+    for flag in ChallengeFlag.query.filter_by(challenge_id=challenge_id).order_by(ChallengeFlag.id):
+        if flag.flag_label == 'Primary Flag':
+            primary_flag = primary_flag or flag
+        elif flag.flag_label is not None:  # same rows the old `flag_label != 'Primary Flag'` filter matched
+            additional_flags.append(flag)
     
     return render_template('admin/edit_challenge.html', 
                           challenge=challenge, 
@@ -546,23 +512,24 @@ def edit_challenge(challenge_id):
 @admin_required
 def delete_challenge(challenge_id):
     """Delete a challenge"""
-    challenge = Challenge.query.get_or_404(challenge_id)
+    db.get_or_404(Challenge, challenge_id)
     
-    # Delete associated data in correct order (respecting foreign key constraints)
-    from models.branching import ChallengeFlag, ChallengePrerequisite, ChallengeUnlock
-    from models.hint import HintUnlock
+    # Delete associated data in correct order (respecting foreign key constraints).
+    # Once migrations/add_challenge_cascade_deletes.sql has been applied the database
+    # cascades these itself; until then these bulk deletes are the fallback.
+    # synchronize_session=False: nothing below reads these rows back before the commit.
     
     # Step 1: Delete solves (references challenge_flags.id)
-    Solve.query.filter_by(challenge_id=challenge_id).delete()
+    Solve.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     
     # Step 2: Delete submissions
-    Submission.query.filter_by(challenge_id=challenge_id).delete()
+    Submission.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     
     # Step 3: Delete hint unlocks (references hints.id)
-    Hint.query.filter_by(challenge_id=challenge_id).delete()
+    Hint.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     
     # Step 4: Delete unlock records
-    ChallengeUnlock.query.filter_by(challenge_id=challenge_id).delete()
+    ChallengeUnlock.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     
     # Step 5: Delete prerequisites where this challenge is required or is the dependent
     ChallengePrerequisite.query.filter(
@@ -570,53 +537,61 @@ def delete_challenge(challenge_id):
             ChallengePrerequisite.challenge_id == challenge_id,
             ChallengePrerequisite.prerequisite_challenge_id == challenge_id
         )
-    ).delete()
+    ).delete(synchronize_session=False)
     
     # Step 6: Delete flags that unlock this challenge (set to NULL)
     ChallengeFlag.query.filter_by(unlocks_challenge_id=challenge_id).update(
-        {'unlocks_challenge_id': None}
+        {'unlocks_challenge_id': None}, synchronize_session=False
     )
     
     # Step 7: Delete all flags for this challenge
-    ChallengeFlag.query.filter_by(challenge_id=challenge_id).delete()
+    ChallengeFlag.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
 
     # Step 7a: Delete container instances and related events for this challenge
     try:
-        from models.container import ContainerInstance, ContainerEvent
         from services.container_manager import container_orchestrator
         import docker
 
-        # Stop and remove any real docker containers, then remove DB records
+        # Stop and remove any real docker containers in parallel (each stop can
+        # block on the daemon for up to its timeout), then remove DB records
         instances = ContainerInstance.query.filter_by(challenge_id=challenge_id).all()
-        for inst in instances:
-            try:
-                if container_orchestrator and container_orchestrator.docker_client:
-                    try:
-                        docker_container = container_orchestrator.docker_client.containers.get(inst.container_id)
-                        docker_container.stop(timeout=10)
-                        docker_container.remove()
-                    except docker.errors.NotFound:
-                        pass
-                    except Exception as e:
-                        current_app.logger.warning(f"Failed to stop/remove container {inst.container_id}: {e}")
-            except Exception:
-                # If the orchestrator itself isn't available, continue to delete DB records
-                pass
+        if instances:
+            container_orchestrator._ensure_docker_client()
+        docker_client = container_orchestrator.docker_client
+        if docker_client and instances:
+            logger = current_app.logger
 
-            # Delete any container events referencing this instance
-            ContainerEvent.query.filter_by(container_instance_id=inst.id).delete()
-            # Delete the instance record
-            db.session.delete(inst)
+            def _stop_remove(container_id):
+                try:
+                    docker_container = docker_client.containers.get(container_id)
+                    docker_container.stop(timeout=10)
+                    docker_container.remove()
+                except docker.errors.NotFound:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to stop/remove container {container_id}: {e}")
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(_stop_remove, [inst.container_id for inst in instances]))
+
+        # Delete events referencing these instances, then the instance records
+        instance_ids = [inst.id for inst in instances]
+        if instance_ids:
+            ContainerEvent.query.filter(
+                ContainerEvent.container_instance_id.in_(instance_ids)
+            ).delete(synchronize_session=False)
+            ContainerInstance.query.filter(
+                ContainerInstance.id.in_(instance_ids)
+            ).delete(synchronize_session=False)
 
         # Also remove any container events that reference the challenge directly
-        ContainerEvent.query.filter_by(challenge_id=challenge_id).delete()
+        ContainerEvent.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     except Exception as e:
         current_app.logger.warning(f"Error cleaning up container records for challenge {challenge_id}: {e}")
 
     # Step 7b: Remove any flag abuse records referencing this challenge
     try:
-        from models.flag_abuse import FlagAbuseAttempt
-        FlagAbuseAttempt.query.filter_by(challenge_id=challenge_id).delete()
+        FlagAbuseAttempt.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     except Exception:
         pass
     
@@ -624,15 +599,15 @@ def delete_challenge(challenge_id):
     file_storage.delete_challenge_files(challenge_id)
     
     # Step 9: Delete file records from database
-    ChallengeFile.query.filter_by(challenge_id=challenge_id).delete()
+    ChallengeFile.query.filter_by(challenge_id=challenge_id).delete(synchronize_session=False)
     
-    # Step 10: Finally delete the challenge itself
-    db.session.delete(challenge)
+    # Step 10: Finally delete the challenge itself. A Core DELETE skips the ORM
+    # cascade, which would otherwise load every dependent collection first;
+    # remaining children are removed by ON DELETE CASCADE.
+    db.session.execute(db.delete(Challenge).where(Challenge.id == challenge_id))
     db.session.commit()
     
-    cache_service.invalidate_challenge(challenge_id)
-    cache_service.invalidate_all_challenges()
-    cache_service.invalidate_scoreboard()
+    cache_service.invalidate_many(challenge_ids=[challenge_id], all_challenges=True, scoreboard=True)
     
     return jsonify({'success': True, 'message': 'Challenge deleted'})
 
@@ -642,19 +617,21 @@ def delete_challenge(challenge_id):
 @admin_required
 def toggle_challenge_enabled(challenge_id):
     """Toggle challenge enabled status"""
-    challenge = Challenge.query.get_or_404(challenge_id)
+    challenge = db.get_or_404(Challenge, challenge_id)
     
-    challenge.is_enabled = not challenge.is_enabled
+    # Capture response fields before commit expires the instance (avoids a reload SELECT)
+    is_enabled = not challenge.is_enabled
+    challenge_name = challenge.name
+    challenge.is_enabled = is_enabled
     db.session.commit()
     
-    cache_service.invalidate_challenge(challenge_id)
-    cache_service.invalidate_all_challenges()
+    cache_service.invalidate_challenge_and_all(challenge_id)
     
-    status = "enabled" if challenge.is_enabled else "disabled"
+    status = "enabled" if is_enabled else "disabled"
     return jsonify({
         'success': True,
-        'is_enabled': challenge.is_enabled,
-        'message': f'Challenge {challenge.name} {status}'
+        'is_enabled': is_enabled,
+        'message': f'Challenge {challenge_name} {status}'
     })
 
 
@@ -663,14 +640,19 @@ def toggle_challenge_enabled(challenge_id):
 @admin_required
 def delete_challenge_file(file_id):
     """Delete a challenge file"""
-    challenge_file = ChallengeFile.query.get_or_404(file_id)
-    challenge_id = challenge_file.challenge_id
+    # Only the path and owning challenge are needed; skip hydrating the ORM object
+    row = db.session.execute(
+        db.select(ChallengeFile.filepath, ChallengeFile.challenge_id).where(ChallengeFile.id == file_id)
+    ).one_or_none()
+    if row is None:
+        abort(404)
+    challenge_id = row.challenge_id
     
     # Delete physical file
-    file_storage.delete_file(challenge_file.filepath)
+    file_storage.delete_file(row.filepath)
     
     # Delete database record
-    db.session.delete(challenge_file)
+    db.session.execute(db.delete(ChallengeFile).where(ChallengeFile.id == file_id))
     db.session.commit()
     
     cache_service.invalidate_challenge(challenge_id)
@@ -683,14 +665,19 @@ def delete_challenge_file(file_id):
 @admin_required
 def delete_challenge_image(image_id):
     """Delete a challenge image"""
-    challenge_image = ChallengeFile.query.get_or_404(image_id)
-    challenge_id = challenge_image.challenge_id
+    # Only the path and owning challenge are needed; skip hydrating the ORM object
+    row = db.session.execute(
+        db.select(ChallengeFile.filepath, ChallengeFile.challenge_id).where(ChallengeFile.id == image_id)
+    ).one_or_none()
+    if row is None:
+        abort(404)
+    challenge_id = row.challenge_id
     
     # Delete physical file
-    file_storage.delete_file(challenge_image.filepath)
+    file_storage.delete_file(row.filepath)
     
     # Delete database record
-    db.session.delete(challenge_image)
+    db.session.execute(db.delete(ChallengeFile).where(ChallengeFile.id == image_id))
     db.session.commit()
     
     cache_service.invalidate_challenge(challenge_id)
@@ -703,8 +690,7 @@ def delete_challenge_image(image_id):
 @admin_required
 def delete_challenge_flag(flag_id):
     """Delete an additional flag"""
-    from models.branching import ChallengeFlag
-    flag = ChallengeFlag.query.get_or_404(flag_id)
+    flag = db.get_or_404(ChallengeFlag, flag_id)
     
     if flag.flag_label == 'Primary Flag':
         return jsonify({'success': False, 'message': 'Cannot delete the primary flag'}), 400
@@ -712,14 +698,12 @@ def delete_challenge_flag(flag_id):
     challenge_id = flag.challenge_id
     
     # Check if this flag unlocks anything
-    from models.branching import ChallengeUnlock
     ChallengeUnlock.query.filter_by(unlocked_by_flag_id=flag.id).delete()
     
     db.session.delete(flag)
     db.session.commit()
     
-    cache_service.invalidate_challenge(challenge_id)
-    cache_service.invalidate_all_challenges()
+    cache_service.invalidate_challenge_and_all(challenge_id)
     
     return jsonify({'success': True, 'message': 'Flag deleted'})
 
@@ -730,8 +714,11 @@ def delete_challenge_flag(flag_id):
 @admin_required
 def manage_users():
     """Manage users page"""
-    users = User.query.all()
-    return render_template('admin/users.html', users=users)
+    page = request.args.get('page', 1, type=int)
+    pagination = User.query.options(
+        joinedload(User.team)
+    ).order_by(User.id).paginate(page=page, per_page=ADMIN_LIST_PER_PAGE, error_out=False)
+    return render_template('admin/users.html', users=pagination.items, pagination=pagination)
 
 
 @admin_bp.route('/users/<int:user_id>/toggle-admin', methods=['POST'])
@@ -739,18 +726,21 @@ def manage_users():
 @admin_required
 def toggle_admin(user_id):
     """Toggle admin status for a user"""
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     
     if user.id == current_user.id:
         return jsonify({'success': False, 'message': 'Cannot modify your own admin status'}), 400
     
-    user.is_admin = not user.is_admin
+    # Capture response fields before commit expires the instance (avoids a reload SELECT)
+    is_admin = not user.is_admin
+    username = user.username
+    user.is_admin = is_admin
     db.session.commit()
     
     return jsonify({
         'success': True,
-        'is_admin': user.is_admin,
-        'message': f'User {user.username} admin status updated'
+        'is_admin': is_admin,
+        'message': f'User {username} admin status updated'
     })
 
 
@@ -759,18 +749,21 @@ def toggle_admin(user_id):
 @admin_required
 def toggle_active(user_id):
     """Toggle active status for a user"""
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     
     if user.id == current_user.id:
         return jsonify({'success': False, 'message': 'Cannot deactivate yourself'}), 400
     
-    user.is_active = not user.is_active
+    # Capture response fields before commit expires the instance (avoids a reload SELECT)
+    is_active = not user.is_active
+    username = user.username
+    user.is_active = is_active
     db.session.commit()
     
     return jsonify({
         'success': True,
-        'is_active': user.is_active,
-        'message': f'User {user.username} active status updated'
+        'is_active': is_active,
+        'message': f'User {username} active status updated'
     })
 
 
@@ -780,8 +773,24 @@ def toggle_active(user_id):
 @admin_required
 def manage_teams():
     """Manage teams page"""
-    teams = Team.query.all()
-    return render_template('admin/teams.html', teams=teams)
+    page = request.args.get('page', 1, type=int)
+    pagination = Team.query.order_by(Team.id).paginate(page=page, per_page=ADMIN_LIST_PER_PAGE, error_out=False)
+    
+    # Member counts and captains for the whole page in two queries instead of two per row
+    team_ids = [t.id for t in pagination.items]
+    captain_ids = [t.captain_id for t in pagination.items if t.captain_id]
+    member_counts = dict(
+        db.session.query(User.team_id, db.func.count(User.id))
+        .filter(User.team_id.in_(team_ids))
+        .group_by(User.team_id)
+        .all()
+    ) if team_ids else {}
+    captains = {u.id: u for u in User.query.filter(User.id.in_(captain_ids)).all()} if captain_ids else {}
+    for team in pagination.items:
+        team.member_count = member_counts.get(team.id, 0)
+        team.captain = captains.get(team.captain_id)
+    
+    return render_template('admin/teams.html', teams=pagination.items, pagination=pagination)
 
 
 @admin_bp.route('/teams/<int:team_id>/delete', methods=['POST'])
@@ -789,7 +798,7 @@ def manage_teams():
 @admin_required
 def delete_team(team_id):
     """Delete a team"""
-    team = Team.query.get_or_404(team_id)
+    team = db.get_or_404(Team, team_id)
     
     # Remove team from all members
     members = User.query.filter_by(team_id=team_id).all()
@@ -800,8 +809,8 @@ def delete_team(team_id):
     db.session.delete(team)
     db.session.commit()
     
-    cache_service.invalidate_team(team_id)
-    cache_service.invalidate_scoreboard()
+    cache_service.invalidate_many(team_ids=[team_id], scoreboard=True)
+    cache_service.invalidate_filter_options('teams')
     
     return jsonify({'success': True, 'message': 'Team deleted'})
 
@@ -812,10 +821,8 @@ def delete_team(team_id):
 @admin_required
 def adjust_user_points(user_id):
     """Manually adjust user points by creating a solve adjustment"""
-    from models.submission import Solve
-    from models.challenge import Challenge
     
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     data = request.get_json()
     
     points_delta = int(data.get('points', 0))
@@ -830,17 +837,13 @@ def adjust_user_points(user_id):
         user_id=user_id,
         team_id=user.team_id,
         challenge_id=None,  # None indicates manual adjustment
-        points_earned=points_delta,
-        solved_at=datetime.utcnow()
+        points_earned=points_delta  # solved_at comes from the column default (UTC)
     )
     
     db.session.add(adjustment)
     db.session.commit()
     
-    cache_service.invalidate_scoreboard()
-    if user.team_id:
-        cache_service.invalidate_team(user.team_id)
-    cache_service.invalidate_user(user_id)
+    cache_service.invalidate_many(user_ids=[user_id], team_ids=[user.team_id], scoreboard=True)
     
     return jsonify({
         'success': True,
@@ -854,9 +857,8 @@ def adjust_user_points(user_id):
 @admin_required
 def adjust_team_points(team_id):
     """Manually adjust team points by creating a solve adjustment"""
-    from models.submission import Solve
     
-    team = Team.query.get_or_404(team_id)
+    team = db.get_or_404(Team, team_id)
     data = request.get_json()
     
     points_delta = int(data.get('points', 0))
@@ -870,15 +872,13 @@ def adjust_team_points(team_id):
         user_id=None,
         team_id=team_id,
         challenge_id=None,
-        points_earned=points_delta,
-        solved_at=datetime.utcnow()
+        points_earned=points_delta
     )
     
     db.session.add(adjustment)
     db.session.commit()
     
-    cache_service.invalidate_scoreboard()
-    cache_service.invalidate_team(team_id)
+    cache_service.invalidate_many(team_ids=[team_id], scoreboard=True)
     
     return jsonify({
         'success': True,
@@ -887,49 +887,78 @@ def adjust_team_points(team_id):
     })
 
 
-@admin_bp.route('/users/<int:user_id>/solves', methods=['GET'])
-@login_required
-@admin_required
-def get_user_solves(user_id):
-    """Get solve history for a user including manual adjustments"""
-    from models.submission import Solve
-    from models.challenge import Challenge
+# Page size for the solve history JSON endpoints (?limit=, capped at SOLVE_HISTORY_MAX_LIMIT)
+SOLVE_HISTORY_LIMIT = 50
+SOLVE_HISTORY_MAX_LIMIT = 200
+
+def _solve_history_response(criterion):
+    """
+    Newest-first solve history (including manual adjustments) as JSON, keyset-paginated
     
-    user = User.query.get_or_404(user_id)
+    Pass ?before=<solved_at>&before_id=<id> from the previous page's next_cursor to continue;
+    seeking on (solved_at, id) stays an index range scan however deep the page is.
+    """
+    limit = min(max(request.args.get('limit', SOLVE_HISTORY_LIMIT, type=int), 1), SOLVE_HISTORY_MAX_LIMIT)
     
-    solves = db.session.query(Solve, Challenge).outerjoin(
+    # Project just the serialized columns; no Solve/Challenge objects are hydrated
+    query = db.session.query(
+        Solve.id, Solve.points_earned, Solve.solved_at, Solve.challenge_id, Challenge.name
+    ).outerjoin(
         Challenge, Solve.challenge_id == Challenge.id
-    ).filter(
-        Solve.user_id == user_id
-    ).order_by(Solve.solved_at.desc()).all()
-    
-    solve_list = []
-    for solve, challenge in solves:
-        solve_list.append({
-            'challenge_name': challenge.name if challenge else None,
-            'points': solve.points_earned,
-            'solved_at': solve.solved_at.isoformat(),
-            'is_adjustment': challenge is None,
-            'reason': None  # Could add reason field to Solve model
-        })
+    ).filter(criterion)
+    
+    before = request.args.get('before')
+    if before:
+        try:
+            before_dt = datetime.fromisoformat(before)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'Invalid before cursor'}), 400
+        before_id = request.args.get('before_id', type=int)
+        if before_id is None:
+            query = query.filter(Solve.solved_at < before_dt)
+        else:
+            query = query.filter(db.or_(
+                Solve.solved_at < before_dt,
+                db.and_(Solve.solved_at == before_dt, Solve.id < before_id)
+            ))
+    
+    rows = query.order_by(Solve.solved_at.desc(), Solve.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     return jsonify({
         'success': True,
-        'solves': solve_list
+        'solves': [{
+            'challenge_name': row.name,
+            'points': row.points_earned,
+            'solved_at': row.solved_at.isoformat(),
+            'is_adjustment': row.challenge_id is None,
+            'reason': None  # Could add reason field to Solve model
+        } for row in rows],
+        'next_cursor': {
+            'before': rows[-1].solved_at.isoformat(),
+            'before_id': rows[-1].id
+        } if has_more else None
     })
 
 
+@admin_bp.route('/users/<int:user_id>/solves', methods=['GET'])
+@login_required
+@admin_required
+def get_user_solves(user_id):
+    """Get solve history for a user including manual adjustments"""
+    db.get_or_404(User, user_id)
+    
+    return _solve_history_response(Solve.user_id == user_id)
+
+
 @admin_bp.route('/users/<int:user_id>/activity')
 @login_required
 @admin_required
 def user_activity(user_id):
     """View detailed user activity with pagination"""
-    from models.submission import Solve, Submission
-    from models.challenge import Challenge
-    from models.hint import HintUnlock
-    from datetime import datetime
     
-    user = User.query.get_or_404(user_id)
+    user = db.get_or_404(User, user_id)
     page = request.args.get('page', 1, type=int)
     per_page = 10
     
@@ -942,19 +971,28 @@ def user_activity(user_id):
     
     solves_pagination = solves_query.paginate(page=page, per_page=per_page, error_out=False)
     
-    # Get hints unlocked by this user
-    hints_unlocked = HintUnlock.query.filter_by(user_id=user_id).order_by(HintUnlock.unlocked_at.desc()).all()
-    
-    # Get total stats
-    total_solves = Solve.query.filter_by(user_id=user_id).filter(Solve.challenge_id.isnot(None)).count()
-    total_submissions = Submission.query.filter_by(user_id=user_id).count()
-    total_hints = len(hints_unlocked)
+    # Get hints unlocked by this user, one page at a time
+    hints_page = request.args.get('hints_page', 1, type=int)
+    hints_pagination = HintUnlock.query.filter_by(user_id=user_id).order_by(
+        HintUnlock.unlocked_at.desc()
+    ).paginate(page=hints_page, per_page=per_page, error_out=False)
+    
+    # Get total stats (both counts in a single round-trip via scalar subqueries)
+    totals = db.session.execute(db.select(
+        db.select(db.func.count(Solve.id)).where(
+            Solve.user_id == user_id, Solve.challenge_id.isnot(None)
+        ).scalar_subquery().label('solves'),
+        db.select(db.func.count(Submission.id)).where(Submission.user_id == user_id).scalar_subquery().label('submissions')
+    )).one()
+    total_solves = totals.solves
+    total_submissions = totals.submissions
+    total_hints = hints_pagination.total
     total_score = user.get_score()
     
     return render_template('admin/user_activity.html', 
                           user=user,
                           solves_pagination=solves_pagination,
-                          hints_unlocked=hints_unlocked,
+                          hints_pagination=hints_pagination,
                           total_solves=total_solves,
                           total_submissions=total_submissions,
                           total_hints=total_hints,
@@ -967,34 +1005,14 @@ def user_activity(user_id):
 @admin_required
 def get_team_solves(team_id):
     """Get solve history for a team including manual adjustments"""
-    from models.submission import Solve
-    from models.challenge import Challenge
-    
-    team = Team.query.get_or_404(team_id)
-    
-    solves = db.session.query(Solve, Challenge).outerjoin(
-        Challenge, Solve.challenge_id == Challenge.id
-    ).filter(
-        Solve.team_id == team_id
-    ).order_by(Solve.solved_at.desc()).all()
-    
-    solve_list = []
-    for solve, challenge in solves:
-        solve_list.append({
-            'challenge_name': challenge.name if challenge else None,
-            'points': solve.points_earned,
-            'solved_at': solve.solved_at.isoformat(),
-            'is_adjustment': challenge is None,
-            'reason': None
-        })
+    db.get_or_404(Team, team_id)
     
-    return jsonify({
-        'success': True,
-        'solves': solve_list
-    })
+    return _solve_history_response(Solve.team_id == team_id)
 
 
 # Notifications management
+NOTIFICATION_LIST_LIMIT = 50
+
 @admin_bp.route('/notifications', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -1024,8 +1042,13 @@ def manage_notifications():
         flash('Notification sent to all connected users', 'success')
         return redirect(url_for('admin.manage_notifications'))
 
-    # GET: list recent notifications
-    notifications = Notification.query.order_by(Notification.created_at.desc()).limit(50).all()
+    # GET: list recent notifications (just the columns the list renders, no ORM objects)
+    notifications = db.session.execute(
+        db.select(
+            Notification.id, Notification.title, Notification.body,
+            Notification.created_at, Notification.play_sound
+        ).order_by(Notification.created_at.desc()).limit(NOTIFICATION_LIST_LIMIT)
+    ).all()
     return render_template('admin/notifications.html', notifications=notifications)
 
 
@@ -1036,7 +1059,6 @@ def manage_notifications():
 @admin_required
 def settings():
     """Platform settings"""
-    from models.settings import Settings
     
     if request.method == 'POST':
         # This would update configuration
@@ -1047,11 +1069,14 @@ def settings():
     import flask
     
     # Get CTF control settings
+    values = Settings.get_ctf_status_settings()
     ctf_settings = {
-        'start_time': Settings.get('ctf_start_time'),
-        'end_time': Settings.get('ctf_end_time'),
-        'is_paused': Settings.get('ctf_paused', False),
-        'status': Settings.get_ctf_status()
+        'start_time': values['ctf_start_time'],
+        'end_time': values['ctf_end_time'],
+        'is_paused': values['ctf_paused'],
+        'status': Settings.compute_ctf_status(
+            values['ctf_start_time'], values['ctf_end_time'], values['ctf_paused']
+        )
     }
     
     # Get all settings
@@ -1069,77 +1094,78 @@ def settings():
 @admin_required
 def update_event_config():
     """Update event configuration (name, logo, description)"""
-    from models.settings import Settings
-    import os
-    from werkzeug.utils import secure_filename
     
     try:
+        updates = {}
+        
         # Update CTF name
         ctf_name = request.form.get('ctf_name', '').strip()
         if ctf_name:
-            Settings.set('ctf_name', ctf_name, 'string', 'Name of the CTF event')
+            updates['ctf_name'] = (ctf_name, 'string', 'Name of the CTF event')
         
         # Update CTF description
         ctf_description = request.form.get('ctf_description', '').strip()
         if ctf_description:
-            Settings.set('ctf_description', ctf_description, 'string', 'Description of the CTF event')
+            updates['ctf_description'] = (ctf_description, 'string', 'Description of the CTF event')
         
         # Update registration and team mode settings
-        allow_registration = 'allow_registration' in request.form
-        Settings.set('allow_registration', allow_registration, 'bool', 'Allow new user registrations')
-        
-        teams_enabled = 'teams_enabled' in request.form
-        Settings.set('teams_enabled', teams_enabled, 'bool', 'Enable teams feature (for solo competitions)')
-        
-        team_mode = 'team_mode' in request.form
-        Settings.set('team_mode', team_mode, 'bool', 'Enable team-based CTF mode')
+        updates['allow_registration'] = ('allow_registration' in request.form, 'bool', 'Allow new user registrations')
+        updates['teams_enabled'] = ('teams_enabled' in request.form, 'bool', 'Enable teams feature (for solo competitions)')
+        updates['team_mode'] = ('team_mode' in request.form, 'bool', 'Enable team-based CTF mode')
         
         # Update scoreboard visibility
-        scoreboard_visible = 'scoreboard_visible' in request.form
-        Settings.set('scoreboard_visible', scoreboard_visible, 'bool', 'Show scoreboard to users')
+        updates['scoreboard_visible'] = ('scoreboard_visible' in request.form, 'bool', 'Show scoreboard to users')
         
         # Update first blood bonus
         first_blood_bonus = request.form.get('first_blood_bonus', '0')
         try:
-            first_blood_bonus = int(first_blood_bonus)
-            Settings.set('first_blood_bonus', first_blood_bonus, 'int', 'Bonus points for first blood')
+            updates['first_blood_bonus'] = (int(first_blood_bonus), 'int', 'Bonus points for first blood')
         except ValueError:
             pass  # Ignore invalid values
         
         # Update decay function
         decay_function = request.form.get('decay_function', 'logarithmic')
         if decay_function in ['logarithmic', 'parabolic']:
-            Settings.set('decay_function', decay_function, 'string', 'Dynamic scoring decay function')
+            updates['decay_function'] = (decay_function, 'string', 'Dynamic scoring decay function')
         
         # Handle logo upload
+        logo_rejected = False
         if 'ctf_logo' in request.files:
             logo_file = request.files['ctf_logo']
             if logo_file and logo_file.filename:
-                from flask import current_app
-                
-                # Use /var/uploads/logos (volume-mounted writable directory)
-                uploads_dir = '/var/uploads/logos'
-                
-                # Create uploads directory if it doesn't exist
-                os.makedirs(uploads_dir, exist_ok=True)
-                
                 # Secure the filename
                 filename = secure_filename(logo_file.filename)
-                
-                # Add timestamp to avoid conflicts
-                from datetime import datetime
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 name, ext = os.path.splitext(filename)
-                filename = f'ctf_logo_{timestamp}{ext}'
                 
-                # Save the file
-                filepath = os.path.join(uploads_dir, filename)
-                logo_file.save(filepath)
-                
-                # Store relative path in settings
-                Settings.set('ctf_logo', filename, 'string', 'Path to CTF logo image')
+                # Reject non-image uploads before touching the disk (other settings still save)
+                if ext.lower() not in LOGO_EXTENSIONS:
+                    flash(f'Logo must be one of: {", ".join(sorted(LOGO_EXTENSIONS))}', 'error')
+                    logo_rejected = True
+                else:
+                    # Use /var/uploads/logos (volume-mounted writable directory)
+                    uploads_dir = '/var/uploads/logos'
+                    
+                    # Create uploads directory if it doesn't exist
+                    os.makedirs(uploads_dir, exist_ok=True)
+                    
+                    # Add timestamp to avoid conflicts
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    filename = f'ctf_logo_{timestamp}{ext}'
+                    
+                    # Stream the upload to disk in 1MiB chunks
+                    filepath = os.path.join(uploads_dir, filename)
+                    with open(filepath, 'wb') as out:
+                        shutil.copyfileobj(logo_file.stream, out, COPY_CHUNK_SIZE)
+                    
+                    # Store relative path in settings
+                    updates['ctf_logo'] = (filename, 'string', 'Path to CTF logo image')
         
-        flash('Event configuration updated successfully!', 'success')
+        Settings.set_many(updates)
+        
+        if logo_rejected:
+            flash('Other event settings were saved; the logo was left unchanged.', 'warning')
+        else:
+            flash('Event configuration updated successfully!', 'success')
     except Exception as e:
         flash(f'Error updating configuration: {str(e)}', 'error')
     
@@ -1151,7 +1177,6 @@ def update_event_config():
 @admin_required
 def update_email_config():
     """Update email verification configuration"""
-    from models.settings import Settings
     
     try:
         require_email_verification = 'require_email_verification' in request.form
@@ -1185,12 +1210,10 @@ def update_email_config():
 @admin_required
 def update_background_theme():
     """Update custom background theme"""
-    from models.settings import Settings
-    import re
     
     try:
         enabled = 'custom_background_enabled' in request.form
-        Settings.set('custom_background_enabled', enabled, 'bool', 'Enable custom background theme')
+        updates = {'custom_background_enabled': (enabled, 'bool', 'Enable custom background theme')}
         
         if enabled:
             css = request.form.get('custom_background_css', '').strip()
@@ -1207,24 +1230,19 @@ def update_background_theme():
             # This is a simple check, not a full CSS parser
             if css:
                 # Remove comments
-                css_clean = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+                css_clean = _CSS_COMMENT_RE.sub('', css)
                 
-                # Check for potentially dangerous content
-                # Enhanced blacklist for XSS prevention
-                dangerous_patterns = [
-                    r'<script', r'javascript:', r'onerror', r'onload',
-                    r'eval\(', r'expression\(', r'import\s+["\']',
-                    r'behavior:', r'binding:', r'-moz-binding'
-                ]
+                # Check for potentially dangerous content (enhanced blacklist for XSS prevention)
+                if _DANGEROUS_CSS_RE.search(css_clean):
+                    Settings.set_many(updates)
+                    flash('Invalid CSS: Potentially dangerous content detected', 'error')
+                    return redirect(url_for('admin.settings'))
                 
-                for pattern in dangerous_patterns:
-                    if re.search(pattern, css_clean, re.IGNORECASE):
-                        flash('Invalid CSS: Potentially dangerous content detected', 'error')
-                        return redirect(url_for('admin.settings'))
-                
-                Settings.set('custom_background_css', css, 'string', 'Custom background CSS')
+                updates['custom_background_css'] = (css, 'string', 'Custom background CSS')
             else:
-                Settings.set('custom_background_css', '', 'string', 'Custom background CSS')
+                updates['custom_background_css'] = ('', 'string', 'Custom background CSS')
+        
+        Settings.set_many(updates)
         
         flash('Background theme updated successfully!', 'success')
     except Exception as e:
@@ -1238,26 +1256,27 @@ def update_background_theme():
 @admin_required
 def update_system_settings():
     """Update system settings (timezone and backup frequency)"""
-    from models.settings import Settings
     from services.backup_scheduler import backup_scheduler
     
     try:
-        # Update base URL
+        # Update base URL and timezone
         base_url = request.form.get('base_url', '').strip()
-        Settings.set('base_url', base_url, 'string', 'Platform Base URL for email links')
-        
-        # Update timezone
         timezone = request.form.get('timezone', 'UTC')
-        Settings.set('timezone', timezone, 'string', 'Platform timezone')
+        updates = {
+            'base_url': (base_url, 'string', 'Platform Base URL for email links'),
+            'timezone': (timezone, 'string', 'Platform timezone'),
+        }
         
         # Update backup frequency
         backup_frequency = request.form.get('backup_frequency', 'disabled')
         old_frequency = Settings.get('backup_frequency', 'disabled')
-        Settings.set('backup_frequency', backup_frequency, 'string', 'Automatic backup frequency')
+        updates['backup_frequency'] = (backup_frequency, 'string', 'Automatic backup frequency')
         
         # Clear last auto backup time if disabling backups
         if backup_frequency == 'disabled':
-            Settings.set('last_auto_backup', None, 'datetime', 'Last automatic backup timestamp')
+            updates['last_auto_backup'] = (None, 'datetime', 'Last automatic backup timestamp')
+        
+        Settings.set_many(updates)
         
         # Reschedule backups if frequency changed
         if backup_frequency != old_frequency and backup_scheduler is not None:
@@ -1276,9 +1295,6 @@ def update_system_settings():
 @admin_required
 def ctf_control():
     """CTF control panel for scheduling and pausing"""
-    from models.settings import Settings
-    from datetime import datetime
-    import pytz
     
     if request.method == 'POST':
         action = request.form.get('action')
@@ -1321,8 +1337,10 @@ def ctf_control():
                     flash('Invalid end time format', 'error')
         
         elif action == 'clear_times':
-            Settings.set('ctf_start_time', None, 'datetime')
-            Settings.set('ctf_end_time', None, 'datetime')
+            Settings.set_many({
+                'ctf_start_time': (None, 'datetime', None),
+                'ctf_end_time': (None, 'datetime', None),
+            })
             flash('CTF schedule cleared - CTF is now always running', 'success')
         
         elif action == 'pause':
@@ -1336,11 +1354,14 @@ def ctf_control():
         return redirect(url_for('admin.ctf_control'))
     
     # Get current settings
+    values = Settings.get_ctf_status_settings()
     ctf_settings = {
-        'start_time': Settings.get('ctf_start_time'),
-        'end_time': Settings.get('ctf_end_time'),
-        'is_paused': Settings.get('ctf_paused', False),
-        'status': Settings.get_ctf_status()
+        'start_time': values['ctf_start_time'],
+        'end_time': values['ctf_end_time'],
+        'is_paused': values['ctf_paused'],
+        'status': Settings.compute_ctf_status(
+            values['ctf_start_time'], values['ctf_end_time'], values['ctf_paused']
+        )
     }
     
     return render_template('admin/ctf_control.html', ctf_settings=ctf_settings)
@@ -1352,7 +1373,7 @@ def ctf_control():
 @admin_required
 def delete_hint(hint_id):
     """Delete a hint"""
-    hint = Hint.query.get_or_404(hint_id)
+    hint = db.get_or_404(Hint, hint_id)
     challenge_id = hint.challenge_id
     
     db.session.delete(hint)
@@ -1381,9 +1402,11 @@ def manage_branching():
 @admin_required
 def get_flags():
     """Get all challenge flags"""
-    from models.branching import ChallengeFlag
     
-    flags = ChallengeFlag.query.all()
+    flags = ChallengeFlag.query.options(
+        joinedload(ChallengeFlag.challenge).load_only(Challenge.name),
+        joinedload(ChallengeFlag.unlocks_challenge).load_only(Challenge.name)
+    ).all()
     flags_data = []
     
     for flag in flags:
@@ -1400,8 +1423,6 @@ def get_flags():
 @admin_required
 def add_flag():
     """Add a new flag to a challenge"""
-    from models.branching import ChallengeFlag
-    import re
     
     challenge_id = request.form.get('challenge_id')
     flag_value = request.form.get('flag_value', '').strip()
@@ -1421,10 +1442,9 @@ def add_flag():
     
     # For regex flags, validate the pattern
     if is_regex:
-        try:
-            re.compile(flag_value)
-        except re.error as e:
-            return jsonify({'success': False, 'message': f'Invalid regex pattern: {str(e)}'}), 400
+        pattern_error = validate_flag_pattern(flag_value)
+        if pattern_error:
+            return jsonify({'success': False, 'message': f'Invalid regex pattern: {pattern_error}'}), 400
     
     # Validate unlocks_challenge exists if provided
     if unlocks_challenge_id:
@@ -1457,7 +1477,7 @@ def add_flag():
     db.session.add(new_flag)
     db.session.commit()
     
-    cache_service.invalidate_challenge(challenge_id)
+    cache_service.invalidate_many(challenge_ids=[challenge_id, unlocks_challenge_id])
     
     return jsonify({'success': True, 'message': 'Flag added successfully', 'flag': new_flag.to_dict(include_value=True)})
 
@@ -1467,15 +1487,14 @@ def add_flag():
 @admin_required
 def delete_flag(flag_id):
     """Delete a challenge flag"""
-    from models.branching import ChallengeFlag
     
-    flag = ChallengeFlag.query.get_or_404(flag_id)
-    challenge_id = flag.challenge_id
+    flag = db.get_or_404(ChallengeFlag, flag_id)
+    affected_ids = [flag.challenge_id, flag.unlocks_challenge_id]
     
     db.session.delete(flag)
     db.session.commit()
     
-    cache_service.invalidate_challenge(challenge_id)
+    cache_service.invalidate_many(challenge_ids=affected_ids)
     
     return jsonify({'success': True, 'message': 'Flag deleted successfully'})
 
@@ -1485,9 +1504,11 @@ def delete_flag(flag_id):
 @admin_required
 def get_prerequisites():
     """Get all challenge prerequisites"""
-    from models.branching import ChallengePrerequisite
     
-    prerequisites = ChallengePrerequisite.query.all()
+    prerequisites = ChallengePrerequisite.query.options(
+        joinedload(ChallengePrerequisite.challenge).load_only(Challenge.name),
+        joinedload(ChallengePrerequisite.prerequisite_challenge).load_only(Challenge.name)
+    ).all()
     prereqs_data = []
     
     for prereq in prerequisites:
@@ -1504,7 +1525,6 @@ def get_prerequisites():
 @admin_required
 def add_prerequisite():
     """Add a prerequisite to a challenge"""
-    from models.branching import ChallengePrerequisite
     
     challenge_id = request.form.get('challenge_id')
     prerequisite_challenge_id = request.form.get('prerequisite_challenge_id')
@@ -1523,11 +1543,13 @@ def add_prerequisite():
     if not challenge or not prereq_challenge:
         return jsonify({'success': False, 'message': 'Challenge(s) not found'}), 404
     
-    # Check if prerequisite already exists
-    existing = ChallengePrerequisite.query.filter_by(
-        challenge_id=challenge_id,
-        prerequisite_challenge_id=prerequisite_challenge_id
-    ).first()
+    # Check if prerequisite already exists (EXISTS probe on the unique_prerequisite index)
+    existing = db.session.query(
+        ChallengePrerequisite.query.filter_by(
+            challenge_id=challenge_id,
+            prerequisite_challenge_id=prerequisite_challenge_id
+        ).exists()
+    ).scalar()
     
     if existing:
         return jsonify({'success': False, 'message': 'This prerequisite already exists'}), 400
@@ -1550,7 +1572,13 @@ def add_prerequisite():
         # so normal users won't see it in the public challenges list.
         challenge.is_visible = False
     
-    db.session.commit()
+    # Two concurrent requests can both pass the existence check above; the
+    # unique_prerequisite constraint rejects the second one
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'This prerequisite already exists'}), 400
     
     cache_service.invalidate_challenge(challenge_id)
     
@@ -1566,9 +1594,8 @@ def add_prerequisite():
 @admin_required
 def delete_prerequisite(prereq_id):
     """Delete a challenge prerequisite"""
-    from models.branching import ChallengePrerequisite
     
-    prereq = ChallengePrerequisite.query.get_or_404(prereq_id)
+    prereq = db.get_or_404(ChallengePrerequisite, prereq_id)
     challenge_id = prereq.challenge_id
     
     db.session.delete(prereq)
@@ -1584,7 +1611,7 @@ def delete_prerequisite(prereq_id):
 @admin_required
 def update_unlock_mode(challenge_id):
     """Update challenge unlock mode and hidden status"""
-    challenge = Challenge.query.get_or_404(challenge_id)
+    challenge = db.get_or_404(Challenge, challenge_id)
     
     data = request.get_json()
     unlock_mode = data.get('unlock_mode')
@@ -1612,7 +1639,6 @@ def update_unlock_mode(challenge_id):
 @admin_required
 def get_challenge_flags(challenge_id):
     """Get all flags for a specific challenge"""
-    from models.branching import ChallengeFlag
     
     flags = ChallengeFlag.query.filter_by(challenge_id=challenge_id).all()
     flags_data = [flag.to_dict(include_value=True) for flag in flags]
@@ -1625,9 +1651,8 @@ def get_challenge_flags(challenge_id):
 @admin_required
 def update_flag_unlock(flag_id):
     """Update which challenge a flag unlocks"""
-    from models.branching import ChallengeFlag
     
-    flag = ChallengeFlag.query.get_or_404(flag_id)
+    flag = db.get_or_404(ChallengeFlag, flag_id)
     data = request.get_json()
     unlocks_challenge_id = data.get('unlocks_challenge_id')
     
@@ -1644,12 +1669,12 @@ def update_flag_unlock(flag_id):
             # Hide the target challenge from public view until unlocked
             unlocks_challenge.is_visible = False
     
+    # The previously unlocked challenge changes too, so drop it in the same batch
+    affected_ids = [flag.challenge_id, flag.unlocks_challenge_id, unlocks_challenge_id]
     flag.unlocks_challenge_id = unlocks_challenge_id
     db.session.commit()
     
-    cache_service.invalidate_challenge(flag.challenge_id)
-    if unlocks_challenge_id:
-        cache_service.invalidate_challenge(unlocks_challenge_id)
+    cache_service.invalidate_many(challenge_ids=affected_ids)
     
     message = 'Branching configured successfully'
     if unlocks_challenge_id:
@@ -1663,9 +1688,11 @@ def update_flag_unlock(flag_id):
 @admin_required
 def get_branching_connections():
     """Get all branching connections (flags that unlock challenges)"""
-    from models.branching import ChallengeFlag
     
-    flags = ChallengeFlag.query.filter(ChallengeFlag.unlocks_challenge_id.isnot(None)).all()
+    flags = ChallengeFlag.query.filter(ChallengeFlag.unlocks_challenge_id.isnot(None)).options(
+        joinedload(ChallengeFlag.challenge).load_only(Challenge.name),
+        joinedload(ChallengeFlag.unlocks_challenge).load_only(Challenge.name)
+    ).all()
     connections = []
     
     for flag in flags:
@@ -1690,8 +1717,12 @@ def hint_logs():
     page = request.args.get('page', 1, type=int)
     per_page = 50
     
-    # Get all hint unlocks with pagination
-    hint_unlocks = HintUnlock.query.order_by(HintUnlock.unlocked_at.desc()).paginate(
+    # Get all hint unlocks with pagination (user/team/hint/challenge loaded in the same SELECT)
+    hint_unlocks = HintUnlock.query.options(
+        joinedload(HintUnlock.user),
+        joinedload(HintUnlock.team),
+        joinedload(HintUnlock.hint).joinedload(Hint.challenge)
+    ).order_by(HintUnlock.unlocked_at.desc()).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
@@ -1709,7 +1740,8 @@ def hint_logs_api():
     team_id = request.args.get('team_id', type=int)
     challenge_id = request.args.get('challenge_id', type=int)
     
-    query = HintUnlock.query
+    # Eager-load everything serialized below so each page is a single SELECT
+    query = HintUnlock.query.options(joinedload(HintUnlock.user), joinedload(HintUnlock.team))
     
     # Apply filters
     if user_id:
@@ -1717,14 +1749,35 @@ def hint_logs_api():
     if team_id:
         query = query.filter_by(team_id=team_id)
     if challenge_id:
-        query = query.join(Hint).filter(Hint.challenge_id == challenge_id)
+        # Reuse the filter join to populate unlock.hint
+        query = query.join(Hint).filter(Hint.challenge_id == challenge_id).options(
+            contains_eager(HintUnlock.hint).joinedload(Hint.challenge)
+        )
+    else:
+        query = query.options(joinedload(HintUnlock.hint).joinedload(Hint.challenge))
     
-    hint_unlocks = query.order_by(HintUnlock.unlocked_at.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    query = query.order_by(HintUnlock.unlocked_at.desc(), HintUnlock.id.desc())
+    
+    # Keyset mode: ?before_ts=&before_id= seeks past the last row seen instead of
+    # counting the filtered set and skipping OFFSET rows on every page
+    before_ts = request.args.get('before_ts')
+    before_id = request.args.get('before_id', type=int)
+    if before_ts and before_id:
+        try:
+            before_ts = datetime.fromisoformat(before_ts)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid before_ts'}), 400
+        items = query.filter(db.or_(
+            HintUnlock.unlocked_at < before_ts,
+            db.and_(HintUnlock.unlocked_at == before_ts, HintUnlock.id < before_id)
+        )).limit(per_page).all()
+        hint_unlocks = None
+    else:
+        hint_unlocks = query.paginate(page=page, per_page=per_page, error_out=False)
+        items = hint_unlocks.items
     
     logs = []
-    for unlock in hint_unlocks.items:
+    for unlock in items:
         hint = unlock.hint
         challenge = hint.challenge if hint else None
         user = unlock.user
@@ -1743,26 +1796,73 @@ def hint_logs_api():
             'unlocked_at': unlock.unlocked_at.isoformat()
         })
     
-    return jsonify({
-        'success': True,
-        'logs': logs,
-        'total': hint_unlocks.total,
-        'pages': hint_unlocks.pages,
-        'current_page': hint_unlocks.page
-    })
+    response = {'success': True, 'logs': logs}
+    if len(items) == per_page:
+        last = items[-1]
+        response['next_before_ts'] = last.unlocked_at.isoformat()
+        response['next_before_id'] = last.id
+    if hint_unlocks is not None:
+        response.update(
+            total=hint_unlocks.total,
+            pages=hint_unlocks.pages,
+            current_page=hint_unlocks.page
+        )
+    return jsonify(response)
 
 
 # ==================== Flag Abuse Monitoring ====================
 
+def _flag_abuse_stats():
+    """Dashboard statistics for the flag abuse page, as plain JSON-serializable values"""
+    # Per-severity counts from one GROUP BY, the rest from one aggregate row
+    counts_by_severity = dict(
+        db.session.query(FlagAbuseAttempt.severity, db.func.count(FlagAbuseAttempt.id))
+        .group_by(FlagAbuseAttempt.severity)
+        .all()
+    )
+    total_attempts = sum(counts_by_severity.values())
+    severity_counts = {
+        severity: counts_by_severity.get(severity, 0)
+        for severity in ('warning', 'suspicious', 'critical')
+    }
+    
+    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    attempts_today, unique_users, unique_teams = db.session.query(
+        db.func.count(db.case((FlagAbuseAttempt.timestamp >= today_start, FlagAbuseAttempt.id))),
+        db.func.count(db.distinct(FlagAbuseAttempt.user_id)),
+        db.func.count(db.distinct(FlagAbuseAttempt.team_id))
+    ).one()
+    
+    # Get repeat offenders (teams with multiple attempts), timestamps as ISO strings for the cache
+    repeat_offenders = FlagAbuseAttempt.get_repeat_offenders(limit=10, min_attempts=3)
+    for offender in repeat_offenders:
+        offender['last_attempt'] = offender['last_attempt'].isoformat() if offender['last_attempt'] else None
+    
+    return {
+        'total_attempts': total_attempts,
+        'attempts_today': attempts_today,
+        'unique_users': unique_users,
+        'unique_teams': unique_teams,
+        'repeat_offenders': repeat_offenders,
+        'severity_counts': severity_counts,
+    }
+
+
+def _filter_options(kind, model):
+    """Id/name pairs for a filter dropdown, cached until a row is added, renamed or removed"""
+    options = cache_service.get_filter_options(kind)
+    if options is None:
+        rows = db.session.execute(db.select(model.id, model.name).order_by(model.name))
+        options = [{'id': row.id, 'name': row.name} for row in rows]
+        cache_service.set_filter_options(kind, options)
+    return options
+
+
 @admin_bp.route('/flag-abuse')
 @login_required
 @admin_required
 def flag_abuse():
     """Flag abuse attempts monitoring page"""
-    from models.flag_abuse import FlagAbuseAttempt
-    from models.challenge import Challenge
-    from models.user import User
-    from models.team import Team
     
     # Pagination
     page = request.args.get('page', 1, type=int)
@@ -1787,46 +1887,30 @@ def flag_abuse():
         query = query.filter_by(severity=severity)
     
     # Order by most recent first
-    query = query.order_by(FlagAbuseAttempt.timestamp.desc())
+    query = query.order_by(FlagAbuseAttempt.timestamp.desc(), FlagAbuseAttempt.id.desc())
     
-    # Paginate
-    attempts = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Statistics are cached briefly; admins refresh this page often and the table is append-only
+    stats = cache_service.get_flag_abuse_stats()
+    if stats is None:
+        stats = _flag_abuse_stats()
+        cache_service.set_flag_abuse_stats(stats)
     
-    # Get filter options
-    challenges = Challenge.query.order_by(Challenge.name).all()
-    teams = Team.query.order_by(Team.name).all()
-    
-    # Get statistics
-    total_attempts = FlagAbuseAttempt.query.count()
-    attempts_today = FlagAbuseAttempt.query.filter(
-        FlagAbuseAttempt.timestamp >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    ).count()
-    unique_users = db.session.query(FlagAbuseAttempt.user_id).distinct().count()
-    unique_teams = db.session.query(FlagAbuseAttempt.team_id).filter(
-        FlagAbuseAttempt.team_id.isnot(None)
-    ).distinct().count()
-    
-    # Get repeat offenders (teams with multiple attempts)
-    repeat_offenders = FlagAbuseAttempt.get_repeat_offenders(limit=10, min_attempts=3)
+    # Paginate; the unfiltered total is already in the stats, so skip the COUNT(*) for it
+    filtered = any((challenge_id, team_id, user_id, severity))
+    attempts = query.paginate(page=page, per_page=per_page, error_out=False, count=filtered)
+    if not filtered:
+        attempts.total = stats['total_attempts']
     
-    # Count by severity
-    severity_counts = {
-        'warning': FlagAbuseAttempt.query.filter_by(severity='warning').count(),
-        'suspicious': FlagAbuseAttempt.query.filter_by(severity='suspicious').count(),
-        'critical': FlagAbuseAttempt.query.filter_by(severity='critical').count()
-    }
+    # Get filter options
+    challenges = _filter_options('challenges', Challenge)
+    teams = _filter_options('teams', Team)
     
     return render_template('admin/flag_abuse.html',
         attempts=attempts.items,
         pagination=attempts,
         challenges=challenges,
         teams=teams,
-        total_attempts=total_attempts,
-        attempts_today=attempts_today,
-        unique_users=unique_users,
-        unique_teams=unique_teams,
-        repeat_offenders=repeat_offenders,
-        severity_counts=severity_counts,
+        **stats,
         filters={
             'challenge_id': challenge_id,
             'team_id': team_id,
@@ -1841,11 +1925,11 @@ def flag_abuse():
 @admin_required
 def delete_flag_abuse_attempt(attempt_id):
     """Delete a flag abuse attempt record"""
-    from models.flag_abuse import FlagAbuseAttempt
     
-    attempt = FlagAbuseAttempt.query.get_or_404(attempt_id)
+    attempt = db.get_or_404(FlagAbuseAttempt, attempt_id)
     db.session.delete(attempt)
     db.session.commit()
+    cache_service.invalidate_flag_abuse_stats()
     
     flash('Flag abuse record deleted successfully', 'success')
     return redirect(url_for('admin.flag_abuse'))
@@ -1856,10 +1940,15 @@ def delete_flag_abuse_attempt(attempt_id):
 @admin_required
 def clear_all_flag_abuse():
     """Clear all flag abuse attempt records"""
-    from models.flag_abuse import FlagAbuseAttempt
     
-    count = FlagAbuseAttempt.query.delete()
+    count = db.session.scalar(db.select(db.func.count()).select_from(FlagAbuseAttempt))
+    if db.engine.dialect.name == 'mysql':
+        # Nothing references these rows; TRUNCATE drops them without a per-row undo log
+        db.session.execute(db.text(f'TRUNCATE TABLE {FlagAbuseAttempt.__tablename__}'))
+    else:
+        FlagAbuseAttempt.query.delete(synchronize_session=False)
     db.session.commit()
+    cache_service.invalidate_flag_abuse_stats()
     
     flash(f'Cleared {count} flag abuse records', 'success')
     return redirect(url_for('admin.flag_abuse'))
@@ -1880,238 +1969,252 @@ def backups():
 @admin_required
 def list_backups():
     """List all available backups (stored in uploads directory)"""
-    import json
-    import os
-    from pathlib import Path
-    from datetime import datetime
     
     try:
-        # Store backups in the uploads directory under 'backups' folder
-        backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        
-        backups = []
-        
-        if backup_dir.exists():
-            for backup_file in sorted(backup_dir.glob('backup_*.sql.gz'), reverse=True):
-                backup_name = backup_file.stem.replace('.sql', '')  # Remove .sql from name
-                
-                # Try to read metadata if it exists
-                metadata_file = backup_file.with_suffix('.json')
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
-                            backups.append(metadata)
-                    except json.JSONDecodeError:
-                        # Use file modification time as fallback, convert to ISO format
-                        timestamp = datetime.fromtimestamp(backup_file.stat().st_mtime).isoformat()
-                        backups.append({
-                            'backup_name': backup_name,
-                            'timestamp': timestamp,
-                            'size_mb': round(backup_file.stat().st_size / (1024 * 1024), 2)
-                        })
-                else:
-                    # Use file modification time as fallback, convert to ISO format
-                    timestamp = datetime.fromtimestamp(backup_file.stat().st_mtime).isoformat()
-                    backups.append({
-                        'backup_name': backup_name,
-                        'timestamp': timestamp,
-                        'size_mb': round(backup_file.stat().st_size / (1024 * 1024), 2)
-                    })
-        
-        return jsonify({'success': True, 'backups': backups})
+        backups = cache_service.get_backups_list()
+        if backups is None:
+            backups = _scan_backups()
+            cache_service.set_backups_list(backups)
+        
+        page = request.args.get('page', type=int)
+        if not page:
+            return jsonify({'success': True, 'backups': backups})
+        
+        per_page = max(request.args.get('per_page', 50, type=int), 1)
+        total = len(backups)
+        start = (page - 1) * per_page
+        return jsonify({
+            'success': True,
+            'backups': backups[start:start + per_page],
+            'total': total,
+            'pages': (total + per_page - 1) // per_page,
+            'current_page': page
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 
-@admin_bp.route('/backups/api/create', methods=['POST'])
-@login_required
-@admin_required
-def create_backup():
-    """Create a manual database backup"""
-    import gzip
-    import json
-    from datetime import datetime
-    from pathlib import Path
+def _scan_backups():
+    """Read backup metadata from the backups folder, newest first"""
+    # Store backups in the uploads directory under 'backups' folder
+    backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
+    backup_dir.mkdir(parents=True, exist_ok=True)
     
-    try:
-        # Get database connection info
-        db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI')
-        
-        # Create backup directory
-        backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
-        backup_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Generate backup name
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_name = f'backup_{timestamp}'
-        backup_file = backup_dir / f'{backup_name}.sql.gz'
+    backups = []
+    backup_files = [f for extension in BACKUP_EXTENSIONS for f in backup_dir.glob(f'backup_*{extension}')]
+    for backup_file in sorted(backup_files, key=lambda f: f.name, reverse=True):
+        backup_name = backup_name_of(backup_file)
         
-        # Determine optional components requested (JSON body or form)
-        include_uploads = False
-        include_redis = False
-        try:
-            data = request.get_json(silent=True) or {}
-            include_uploads = bool(data.get('include_uploads'))
-            include_redis = bool(data.get('include_redis'))
-        except Exception:
-            include_uploads = request.form.get('include_uploads') == 'on'
-            include_redis = request.form.get('include_redis') == 'on'
-
-        # Export database to SQL dump
-        import pymysql
-        from urllib.parse import urlparse
-        
-        parsed = urlparse(db_uri)
-        conn = pymysql.connect(
-            host=parsed.hostname,
-            port=parsed.port or 3306,
-            user=parsed.username,
-            password=parsed.password,
-            database=parsed.path.lstrip('/')
-        )
-        
-        cursor = conn.cursor()
-        
-        # Get all tables
-        cursor.execute("SHOW TABLES")
-        tables = [table[0] for table in cursor.fetchall()]
-        
-        # Create SQL dump
-        sql_dump = []
-        sql_dump.append(f"-- Database backup: {backup_name}")
-        sql_dump.append(f"-- Timestamp: {datetime.now().isoformat()}")
-        sql_dump.append("SET FOREIGN_KEY_CHECKS=0;")
-        
-        for table in tables:
-            # Get CREATE TABLE statement
-            cursor.execute(f"SHOW CREATE TABLE `{table}`")
-            create_table = cursor.fetchone()[1]
-            sql_dump.append(f"\n-- Table: {table}")
-            sql_dump.append(f"DROP TABLE IF EXISTS `{table}`;")
-            sql_dump.append(create_table + ";")
-            
-            # Get table data
-            cursor.execute(f"SELECT * FROM `{table}`")
-            rows = cursor.fetchall()
-            
-            if rows:
-                cursor.execute(f"DESCRIBE `{table}`")
-                columns = [col[0] for col in cursor.fetchall()]
-                
-                for row in rows:
-                    values = []
-                    for value in row:
-                        if value is None:
-                            values.append('NULL')
-                        elif isinstance(value, (int, float)):
-                            values.append(str(value))
-                        elif isinstance(value, datetime):
-                            values.append(f"'{value.isoformat()}'")
-                        else:
-                            # Escape single quotes
-                            escaped = str(value).replace("'", "''")
-                            values.append(f"'{escaped}'")
-                    
-                    sql_dump.append(f"INSERT INTO `{table}` VALUES ({', '.join(values)});")
-        
-        sql_dump.append("SET FOREIGN_KEY_CHECKS=1;")
-        
-        conn.close()
-        
-        # Write compressed backup
-        with gzip.open(backup_file, 'wt', encoding='utf-8') as f:
-            f.write('\n'.join(sql_dump))
+        # Try to read metadata if it exists
+        metadata_file = backup_dir / f'{backup_name}.json'
+        if metadata_file.exists():
+            try:
+                with open(metadata_file, 'r') as f:
+                    backups.append(json.load(f))
+                continue
+            except json.JSONDecodeError:
+                pass
         
-        # Prepare components metadata
-        components = {'database': True, 'uploads': False, 'redis': False}
-        sizes = {
-            'database_mb': round(backup_file.stat().st_size / (1024 * 1024), 2),
-            'uploads_mb': 0,
-            'redis_mb': 0
-        }
+        # Use file modification time as fallback, convert to ISO format
+        st = backup_file.stat()
+        backups.append({
+            'backup_name': backup_name,
+            'timestamp': datetime.fromtimestamp(st.st_mtime).isoformat(),
+            'size_mb': round(st.st_size / (1024 * 1024), 2)
+        })
+    
+    return backups
+
 
-        # Include uploads if requested
-        if include_uploads:
+# A running job refreshes updated_at this often; a job whose worker was recycled or
+# crashed stops doing so and is reported as failed once it is BACKUP_JOB_STALE_SECONDS old
+BACKUP_JOB_HEARTBEAT_SECONDS = 15
+BACKUP_JOB_STALE_SECONDS = 90
+
+
+def _start_backup_job(kind, target, *args):
+    """Run target(job_id, *args) in a background thread and track it as a Redis job.
+    
+    Dumps and restores can take minutes; running them here would hold the request
+    (and its worker) for the whole time and trip proxy timeouts.
+    """
+    job_id = uuid.uuid4().hex
+    app = current_app._get_current_object()
+    cache_service.set_backup_job(job_id, kind=kind, state='running', started_at=datetime.utcnow().isoformat(),
+                                 updated_at=time.time())
+    
+    def heartbeat(stop):
+        # Also rewrites kind/state, so the record survives the cache flush at the end of a restore
+        while not stop.wait(BACKUP_JOB_HEARTBEAT_SECONDS):
             try:
-                uploads_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads'))
-                uploads_archive = backup_dir / f"{backup_name}_uploads.tar.gz"
-                if uploads_dir.exists():
-                    import tarfile
-                    with tarfile.open(uploads_archive, 'w:gz') as tar:
-                        tar.add(uploads_dir, arcname='uploads')
-                    components['uploads'] = True
-                    sizes['uploads_mb'] = round(uploads_archive.stat().st_size / (1024 * 1024), 2)
+                cache_service.set_backup_job(job_id, kind=kind, state='running', updated_at=time.time())
             except Exception as e:
-                current_app.logger.warning(f"Failed to include uploads in manual backup: {e}")
-
-        # Include redis snapshot if requested (best-effort)
-        if include_redis:
+                app.logger.warning(f"Backup job {job_id} heartbeat failed: {e}")
+    
+    def run():
+        stop = threading.Event()
+        beat = threading.Thread(target=heartbeat, args=(stop,), daemon=True, name=f'backup-beat-{job_id[:8]}')
+        beat.start()
+        with app.app_context():
             try:
-                import redis as redislib
-                redis_url = current_app.config.get('REDIS_URL')
-                if redis_url:
-                    r = redislib.from_url(redis_url)
-                    try:
-                        r.bgsave()
-                    except Exception:
-                        try:
-                            r.save()
-                        except Exception:
-                            pass
-
-                    try:
-                        cfg = r.config_get('dir')
-                        dirpath = cfg.get('dir') if isinstance(cfg, dict) else None
-                        dbfile = r.config_get('dbfilename')
-                        filename = dbfile.get('dbfilename') if isinstance(dbfile, dict) else None
-                        if dirpath and filename:
-                            dump_path = Path(dirpath) / filename
-                            if dump_path.exists():
-                                import shutil
-                                target = backup_dir / f"{backup_name}_redis.rdb"
-                                shutil.copy2(dump_path, target)
-                                components['redis'] = True
-                                sizes['redis_mb'] = round(target.stat().st_size / (1024 * 1024), 2)
-                    except Exception:
-                        current_app.logger.debug('Could not copy redis dump file; skipping')
+                result = target(job_id, *args)
+                final = {'state': 'done', 'result': result}
             except Exception as e:
-                current_app.logger.warning(f"Failed to include redis in manual backup: {e}")
+                app.logger.error(f"Backup job {job_id} ({kind}) failed: {e}", exc_info=True)
+                final = {'state': 'failed', 'error': str(e)}
+            finally:
+                db.session.remove()
+            # Stop the heartbeat first so it can't overwrite the final state with 'running'
+            stop.set()
+            beat.join()
+            cache_service.set_backup_job(job_id, kind=kind, finished_at=datetime.utcnow().isoformat(),
+                                         updated_at=time.time(), **final)
+    
+    threading.Thread(target=run, daemon=True, name=f'backup-{kind}-{job_id[:8]}').start()
+    return job_id
 
-        # Create metadata
-        metadata = {
-            'backup_name': backup_name,
-            'timestamp': datetime.now().isoformat(),
-            'database': parsed.path.lstrip('/'),
-            'tables': len(tables),
-            'size_mb': sizes['database_mb'],
-            'components': components,
-            'sizes': sizes
-        }
-        
-        metadata_file = backup_dir / f'{backup_name}.json'
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
 
-        return jsonify({
-            'success': True,
-            'message': 'Backup created successfully',
-            'backup': metadata
-        })
+@admin_bp.route('/backups/api/jobs/<job_id>')
+@login_required
+@admin_required
+def backup_job_status(job_id):
+    """Poll a background backup or restore job"""
+    job = cache_service.get_backup_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Unknown job'}), 404
+    if job.get('state') == 'running' and time.time() - job.get('updated_at', 0) > BACKUP_JOB_STALE_SECONDS:
+        # The worker running it went away (recycled or crashed) without recording an outcome
+        job.update(state='failed', error='Backup job stopped responding (the worker running it was restarted)')
+        cache_service.set_backup_job(job_id, state=job['state'], error=job['error'])
+    return jsonify({'success': True, 'job_id': job_id, **job})
+
+
+@admin_bp.route('/backups/api/create', methods=['POST'])
+@login_required
+@admin_required
+def create_backup():
+    """Start a manual database backup in the background"""
+    
+    # Generate backup name
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    backup_name = f'backup_{timestamp}'
+    
+    # Determine optional components requested (JSON body or form)
+    include_uploads = False
+    include_redis = False
+    try:
+        data = request.get_json(silent=True) or {}
+        include_uploads = bool(data.get('include_uploads'))
+        include_redis = bool(data.get('include_redis'))
+    except Exception:
+        include_uploads = request.form.get('include_uploads') == 'on'
+        include_redis = request.form.get('include_redis') == 'on'
+    
+    job_id = _start_backup_job('backup', _create_backup_job, backup_name, include_uploads, include_redis)
+    return jsonify({
+        'success': True,
+        'message': 'Backup started',
+        'job_id': job_id,
+        'backup_name': backup_name
+    })
+
+
+def _create_backup_job(job_id, backup_name, include_uploads, include_redis):
+    """Dump the database (plus optional uploads/Redis) and write the backup metadata"""
+    # Get database connection info
+    db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI')
+    
+    # Create backup directory
+    backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    backup_file = backup_dir / f'{backup_name}{BACKUP_EXTENSION}'
+    
+    # Native threads: tar/gzip and the Redis copy run alongside the dump instead of after it
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+    from urllib.parse import urlparse
+    
+    parsed = urlparse(db_uri)
+    uploads_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads'))
+    uploads_archive = backup_dir / f"{backup_name}_uploads.tar.gz"
+    redis_url = current_app.config.get('REDIS_URL')
+    redis_target = backup_dir / f"{backup_name}_redis.rdb"
+    
+    components = {'database': True, 'uploads': False, 'redis': False}
+    sizes = {'database_mb': 0, 'uploads_mb': 0, 'redis_mb': 0}
+    
+    # Everything is written under a .partial_ name and moved into place only once complete,
+    # so a job killed halfway never leaves a truncated backup that can be listed or restored
+    partials = [partial_path(path) for path in (backup_file, uploads_archive, redis_target)]
+    partial_backup, partial_uploads, partial_redis = partials
+    try:
+        with NativeThreadPoolExecutor(max_workers=2) as executor:
+            uploads_future = executor.submit(archive_uploads, uploads_dir, partial_uploads) if include_uploads else None
+            redis_future = executor.submit(snapshot_redis, redis_url, partial_redis) if include_redis and redis_url else None
             
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+            # Export database to SQL dump
+            cache_service.set_backup_job(job_id, progress='Dumping database')
+            table_count = dump_database(db_uri, partial_backup, f"Database backup: {backup_name}")
+            
+            # Include uploads if requested
+            if uploads_future:
+                cache_service.set_backup_job(job_id, progress='Archiving uploads')
+                try:
+                    if uploads_future.result():
+                        os.replace(partial_uploads, uploads_archive)
+                        components['uploads'] = True
+                        sizes['uploads_mb'] = round(uploads_archive.stat().st_size / (1024 * 1024), 2)
+                except Exception as e:
+                    current_app.logger.warning(f"Failed to include uploads in manual backup: {e}")
+            
+            # Include redis snapshot if requested (best-effort)
+            if redis_future:
+                cache_service.set_backup_job(job_id, progress='Copying Redis snapshot')
+                try:
+                    if redis_future.result():
+                        os.replace(partial_redis, redis_target)
+                        components['redis'] = True
+                        sizes['redis_mb'] = round(redis_target.stat().st_size / (1024 * 1024), 2)
+                    else:
+                        current_app.logger.debug('Could not copy redis dump file; skipping')
+                except Exception as e:
+                    current_app.logger.warning(f"Failed to include redis in manual backup: {e}")
+        
+        # The dump goes into place last: its appearance is what makes the backup visible
+        os.replace(partial_backup, backup_file)
+        sizes['database_mb'] = round(backup_file.stat().st_size / (1024 * 1024), 2)
+    finally:
+        for path in partials:
+            path.unlink(missing_ok=True)
+
+    # Create metadata
+    metadata = {
+        'backup_name': backup_name,
+        'timestamp': datetime.now().isoformat(),
+        'database': parsed.path.lstrip('/'),
+        'tables': table_count,
+        'size_mb': sizes['database_mb'],
+        'components': components,
+        'sizes': sizes
+    }
+    
+    metadata_file = backup_dir / f'{backup_name}.json'
+    with open(metadata_file, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    cache_service.invalidate_backups_list()
+    
+    return {'message': 'Backup created successfully', 'backup': metadata}
+
+
+# Statements executed per transaction when restoring a backup
+RESTORE_COMMIT_EVERY = 1000
 
 
 @admin_bp.route('/backups/api/restore', methods=['POST'])
 @login_required
 @admin_required
 def restore_backup():
-    """Restore from a backup"""
-    import gzip
-    from pathlib import Path
+    """Start restoring a backup in the background"""
     
     data = request.get_json()
     backup_name = data.get('backup_name')
@@ -2119,136 +2222,111 @@ def restore_backup():
     if not backup_name or not backup_name.startswith('backup_'):
         return jsonify({'success': False, 'error': 'Invalid backup name'})
     
+    backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
+    backup_file = find_backup_file(backup_dir, backup_name)
+    
+    if backup_file is None:
+        return jsonify({'success': False, 'error': 'Backup file not found'})
+    
+    job_id = _start_backup_job('restore', _restore_backup_job, backup_file)
+    return jsonify({'success': True, 'message': 'Restore started', 'job_id': job_id})
+
+
+def _restore_backup_job(job_id, backup_file):
+    """Replace all table data with the rows in backup_file"""
+    # Read and execute SQL dump
+    import pymysql
+    from urllib.parse import urlparse
+    
+    db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI')
+    parsed = urlparse(db_uri)
+    
+    conn = pymysql.connect(
+        host=parsed.hostname,
+        port=parsed.port or 3306,
+        user=parsed.username,
+        password=parsed.password,
+        database=parsed.path.lstrip('/'),
+        charset='utf8mb4'
+    )
+    
+    cursor = conn.cursor()
+    
+    # Load with autocommit and key checks off; the data is committed in batches below
+    conn.autocommit(False)
+    cursor.execute('SET unique_checks=0')
+    cursor.execute('SET FOREIGN_KEY_CHECKS=0')
     try:
-        backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
-        backup_file = backup_dir / f'{backup_name}.sql.gz'
-        
-        if not backup_file.exists():
-            return jsonify({'success': False, 'error': 'Backup file not found'})
-        
-        # Read and execute SQL dump
-        import pymysql
-        from urllib.parse import urlparse
-        
-        db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI')
-        parsed = urlparse(db_uri)
-        
-        conn = pymysql.connect(
-            host=parsed.hostname,
-            port=parsed.port or 3306,
-            user=parsed.username,
-            password=parsed.password,
-            database=parsed.path.lstrip('/'),
-            charset='utf8mb4'
-        )
-        
-        cursor = conn.cursor()
-        
-        # Disable foreign key checks for restore
-        cursor.execute('SET FOREIGN_KEY_CHECKS=0')
-        
-        # Read backup file
-        with gzip.open(backup_file, 'rt', encoding='utf-8') as f:
-            sql_content = f.read()
-        
-        # Parse SQL to extract only INSERT statements (skip DROP/CREATE)
-        # We only want to restore DATA, not recreate table structures
-        statements = []
-        current_statement = []
-        
-        for line in sql_content.split('\n'):
-            line = line.strip()
-            
-            # Skip comments and empty lines
-            if line.startswith('--') or not line:
+        # Keep a restore out of the binlog; needs SUPER / BINLOG ADMIN, so best-effort
+        cursor.execute('SET SESSION sql_log_bin=0')
+    except pymysql.err.Error:
+        pass
+    
+    # Get list of tables to clear
+    cursor.execute("SHOW TABLES")
+    tables = [table[0] for table in cursor.fetchall()]
+    
+    # Clear all existing data from tables (TRUNCATE, not DROP). TRUNCATE skips the
+    # per-row undo log but commits implicitly, so only the INSERTs below share a transaction
+    tables_cleared = 0
+    for table in tables:
+        try:
+            # Skip system/migration tables if any
+            if table in ['alembic_version', 'migrations']:
                 continue
-            
-            # Skip DROP TABLE and CREATE TABLE statements
-            # We only want INSERT statements (data restoration)
-            if line.upper().startswith('DROP TABLE') or line.upper().startswith('CREATE TABLE'):
+            cursor.execute(f"TRUNCATE TABLE `{table}`")
+            tables_cleared += 1
+        except pymysql.err.Error:
+            # Some tables might fail, continue with others
+            pass
+    
+    # Stream statements out of the dump and execute them as they are parsed.
+    # We only want to restore DATA, not recreate table structures, so only
+    # SET and INSERT statements run (DROP/CREATE TABLE are skipped)
+    errors = []
+    success_count = 0
+    
+    with open_backup(backup_file, 'rt') as f:
+        for i, statement in enumerate(iter_sql_statements(f)):
+            keyword = statement[:7].upper()
+            if not (keyword.startswith('SET ') or keyword.startswith('INSERT ')):
                 continue
-            
-            current_statement.append(line)
-            
-            # Check if statement is complete (ends with semicolon)
-            if line.endswith(';'):
-                full_statement = ' '.join(current_statement).strip()
-                if full_statement:
-                    statements.append(full_statement)
-                current_statement = []
-        
-        # Add any remaining statement
-        if current_statement:
-            full_statement = ' '.join(current_statement).strip()
-            if full_statement and full_statement.endswith(';'):
-                statements.append(full_statement)
-        
-        # Get list of tables to clear
-        cursor.execute("SHOW TABLES")
-        tables = [table[0] for table in cursor.fetchall()]
-        
-        # Clear all existing data from tables (DELETE, not DROP)
-        tables_cleared = 0
-        for table in tables:
             try:
-                # Skip system/migration tables if any
-                if table in ['alembic_version', 'migrations']:
-                    continue
-                cursor.execute(f"DELETE FROM `{table}`")
-                tables_cleared += 1
-            except pymysql.err.Error as e:
-                # Some tables might fail, continue with others
-                pass
-        
-        # Execute INSERT statements with proper error handling
-        errors = []
-        success_count = 0
-        
-        for i, statement in enumerate(statements):
-            try:
-                # Only process SET and INSERT statements
-                if statement.upper().startswith('SET '):
-                    cursor.execute(statement)
-                    success_count += 1
-                elif statement.upper().startswith('INSERT '):
-                    cursor.execute(statement)
-                    success_count += 1
-                    
+                cursor.execute(statement)
+                success_count += 1
             except pymysql.err.Error as e:
                 error_msg = f"Statement {i+1}: {str(e)[:100]}"
                 errors.append(error_msg)
                 # Continue with other statements instead of failing completely
                 continue
-        
-        # Re-enable foreign key checks
-        cursor.execute('SET FOREIGN_KEY_CHECKS=1')
-        
-        conn.commit()
-        conn.close()
-        
-        # Clear all caches
-        from services.cache import cache_service
-        cache_service.clear_all()
-        
-        if errors and success_count == 0:
-            return jsonify({
-                'success': False,
-                'error': f'Restore failed. No data could be restored. Errors: {"; ".join(errors[:3])}'
-            })
-        elif errors:
-            return jsonify({
-                'success': True,
-                'message': f'Backup restored! Cleared {tables_cleared} tables and inserted {success_count} records. Some minor errors occurred but restore succeeded. All caches cleared.',
-                'warnings': errors[:5]  # Show first 5 errors
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'message': f'Backup restored successfully! Cleared {tables_cleared} tables and inserted {success_count} records. All caches cleared.'
-            })
             
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+            # Commit in batches so one fsync covers many statements without
+            # growing a single multi-GB transaction
+            if success_count % RESTORE_COMMIT_EVERY == 0:
+                conn.commit()
+                cache_service.set_backup_job(job_id, progress=f'{success_count} statements restored')
+    
+    # Re-enable key checks
+    cursor.execute('SET FOREIGN_KEY_CHECKS=1')
+    cursor.execute('SET unique_checks=1')
+    
+    conn.commit()
+    conn.close()
+    
+    # Clear all caches (this also drops the job record; _start_backup_job rewrites it)
+    cache_service.clear_all()
+    
+    if errors and success_count == 0:
+        raise RuntimeError(f'Restore failed. No data could be restored. Errors: {"; ".join(errors[:3])}')
+    elif errors:
+        return {
+            'message': f'Backup restored! Cleared {tables_cleared} tables and inserted {success_count} records. Some minor errors occurred but restore succeeded. All caches cleared.',
+            'warnings': errors[:5]  # Show first 5 errors
+        }
+    else:
+        return {
+            'message': f'Backup restored successfully! Cleared {tables_cleared} tables and inserted {success_count} records. All caches cleared.'
+        }
 
 
 @admin_bp.route('/backups/api/delete', methods=['POST'])
@@ -2256,7 +2334,6 @@ def restore_backup():
 @admin_required
 def delete_backup():
     """Delete a backup"""
-    from pathlib import Path
     
     data = request.get_json()
     backup_name = data.get('backup_name')
@@ -2266,14 +2343,15 @@ def delete_backup():
     
     try:
         backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
-        backup_file = backup_dir / f'{backup_name}.sql.gz'
+        backup_file = find_backup_file(backup_dir, backup_name)
         metadata_file = backup_dir / f'{backup_name}.json'
         
         # Delete files
-        if backup_file.exists():
+        if backup_file is not None:
             backup_file.unlink()
         if metadata_file.exists():
             metadata_file.unlink()
+        cache_service.invalidate_backups_list()
         
         return jsonify({'success': True, 'message': 'Backup deleted successfully'})
             
@@ -2287,7 +2365,6 @@ def delete_backup():
 def download_backup(backup_name):
     """Download a backup file"""
     from flask import send_file
-    from pathlib import Path
     
     if not backup_name.startswith('backup_'):
         flash('Invalid backup name', 'error')
@@ -2295,17 +2372,31 @@ def download_backup(backup_name):
     
     try:
         backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
-        backup_file = backup_dir / f'{backup_name}.sql.gz'
+        backup_file = find_backup_file(backup_dir, backup_name)
         
-        if not backup_file.exists():
+        if backup_file is None:
             flash('Backup file not found', 'error')
             return redirect(url_for('admin.backups'))
         
+        mimetype = 'application/zstd' if backup_file.name.endswith('.zst') else 'application/gzip'
+        
+        # Behind Nginx, hand the transfer to its internal location so the file goes out via sendfile(2)
+        accel_prefix = current_app.config.get('BACKUP_ACCEL_REDIRECT_PREFIX')
+        if accel_prefix:
+            response = current_app.response_class(mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{backup_file.name}"
+            response.headers['Content-Disposition'] = f'attachment; filename="{backup_file.name}"'
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        
         return send_file(
             backup_file,
             as_attachment=True,
-            download_name=f'{backup_name}.sql.gz',
-            mimetype='application/gzip'
+            download_name=backup_file.name,
+            mimetype=mimetype,
+            conditional=True,
+            etag=True,
+            max_age=0
         )
         
     except Exception as e:
@@ -2318,9 +2409,6 @@ def download_backup(backup_name):
 @admin_required
 def upload_backup():
     """Upload a backup file for restoration"""
-    from pathlib import Path
-    from datetime import datetime
-    import json
     
     try:
         if 'backup_file' not in request.files:
@@ -2331,8 +2419,9 @@ def upload_backup():
         if file.filename == '':
             return jsonify({'success': False, 'error': 'No file selected'})
         
-        if not file.filename.endswith('.sql.gz'):
-            return jsonify({'success': False, 'error': 'Invalid file type. Must be .sql.gz'})
+        extension = next((ext for ext in BACKUP_EXTENSIONS if file.filename.endswith(ext)), None)
+        if extension is None:
+            return jsonify({'success': False, 'error': 'Invalid file type. Must be .sql.zst or .sql.gz'})
         
         # Save to backups directory
         backup_dir = Path(current_app.config.get('UPLOAD_FOLDER', 'static/uploads')) / 'backups'
@@ -2340,13 +2429,34 @@ def upload_backup():
         
         # Generate name if not already in backup format
         if file.filename.startswith('backup_'):
-            backup_name = file.filename.replace('.sql.gz', '')
+            backup_name = backup_name_of(file.filename)
         else:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_name = f'backup_uploaded_{timestamp}'
         
-        backup_file = backup_dir / f'{backup_name}.sql.gz'
-        file.save(backup_file)
+        backup_file = backup_dir / f'{backup_name}{extension}'
+        # Keeps the extension (open_backup picks the codec from it) but not the backup_ prefix
+        # the listing globs for
+        part_file = backup_dir / f'.upload_{backup_name}{extension}'
+        
+        # Copy in chunks to a temporary file, hashing as we go
+        hasher = hashlib.sha256()
+        size = 0
+        with open(part_file, 'wb') as out:
+            while chunk := file.stream.read(COPY_CHUNK_SIZE):
+                out.write(chunk)
+                hasher.update(chunk)
+                size += len(chunk)
+        
+        # Reject anything that is not a readable compressed stream before it can be restored
+        try:
+            with open_backup(part_file, 'rb') as f:
+                f.read(64)
+        except Exception:
+            part_file.unlink(missing_ok=True)
+            return jsonify({'success': False, 'error': f'Uploaded file is not a valid {extension} archive'})
+        
+        os.replace(part_file, backup_file)
         
         # Create metadata
         metadata = {
@@ -2354,12 +2464,14 @@ def upload_backup():
             'timestamp': datetime.now().isoformat(),
             'uploaded': True,
             'original_filename': file.filename,
-            'size_mb': backup_file.stat().st_size / (1024 * 1024)
+            'size_mb': size / (1024 * 1024),
+            'sha256': hasher.hexdigest()
         }
         
         metadata_file = backup_dir / f'{backup_name}.json'
         with open(metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
+        cache_service.invalidate_backups_list()
         
         return jsonify({
             'success': True,
@@ -2378,7 +2490,6 @@ def upload_backup():
 @admin_required
 def docker_settings():
     """Configure Docker connection and settings"""
-    from models.settings import DockerSettings
     
     settings = DockerSettings.get_config()
     
@@ -2435,7 +2546,6 @@ def docker_settings():
 @admin_required
 def docker_status():
     """View all active containers"""
-    from models.container import ContainerInstance
     
     # Get all containers
     containers = ContainerInstance.query.filter(
@@ -2466,15 +2576,15 @@ def docker_status():
 @admin_required
 def delete_container(container_id):
     """Admin force-delete a container"""
-    from models.container import ContainerInstance
     from services.container_manager import container_orchestrator
     import docker
     
     try:
-        container = ContainerInstance.query.get_or_404(container_id)
+        container = db.get_or_404(ContainerInstance, container_id)
         
         # Stop Docker container
         try:
+            container_orchestrator._ensure_docker_client()
             if container_orchestrator.docker_client:
                 docker_container = container_orchestrator.docker_client.containers.get(container.container_id)
                 docker_container.stop(timeout=10)
@@ -2506,30 +2616,43 @@ def delete_container(container_id):
 @admin_required
 def delete_all_containers():
     """Delete all running containers"""
-    from models.container import ContainerInstance
     from services.container_manager import container_orchestrator
     import docker
     
     try:
-        containers = ContainerInstance.query.filter(
-            ContainerInstance.status.in_(['starting', 'running'])
+        # Only the ids are needed; the rows themselves are updated in bulk below
+        containers = db.session.execute(
+            db.select(ContainerInstance.id, ContainerInstance.container_id)
+            .where(ContainerInstance.status.in_(['starting', 'running']))
         ).all()
         
-        deleted_count = 0
-        for container in containers:
-            try:
-                if container_orchestrator.docker_client:
-                    docker_container = container_orchestrator.docker_client.containers.get(container.container_id)
+        # Stop/remove in parallel; each stop can block up to its 10s timeout
+        container_orchestrator._ensure_docker_client()
+        docker_client = container_orchestrator.docker_client
+        if docker_client and containers:
+            logger = current_app.logger
+
+            def _stop_remove(container):
+                instance_id, container_id = container
+                try:
+                    docker_container = docker_client.containers.get(container_id)
                     docker_container.stop(timeout=10)
                     docker_container.remove()
-            except docker.errors.NotFound:
-                pass
-            except Exception as e:
-                current_app.logger.error(f"Failed to stop container {container.id}: {e}")
-            
-            container.status = 'stopped'
-            container.stopped_at = datetime.utcnow()
-            deleted_count += 1
+                except docker.errors.NotFound:
+                    pass
+                except Exception as e:
+                    logger.error(f"Failed to stop container {instance_id}: {e}")
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                list(executor.map(_stop_remove, containers))
+        
+        # Mark every instance stopped in one UPDATE
+        container_ids = [c.id for c in containers]
+        if container_ids:
+            ContainerInstance.query.filter(
+                ContainerInstance.id.in_(container_ids)
+            ).update({'status': 'stopped'}, synchronize_session=False)
+        deleted_count = len(container_ids)
         
         db.session.commit()
         
@@ -2561,8 +2684,6 @@ def list_docker_images():
 @admin_required
 def dynamic_flags_monitor():
     """Admin interface to monitor and verify dynamic flags for all active containers"""
-    from models.container import ContainerInstance
-    from services.cache import cache_service
     
     # Get all active containers (running or starting)
     active_containers = ContainerInstance.query.filter(
@@ -2642,7 +2763,6 @@ def dynamic_flags_monitor():
 @admin_required
 def verify_dynamic_flag():
     """API endpoint to verify a submitted flag against a specific container"""
-    from models.container import ContainerInstance
     
     data = request.get_json()
     container_id = data.get('container_id')
@@ -2683,7 +2803,6 @@ def verify_dynamic_flag():
 @admin_required
 def check_flag_uniqueness():
     """Check if dynamic flags are unique across teams and detect any collisions"""
-    from models.container import ContainerInstance
     from collections import defaultdict
     
     # Get all active containers with dynamic flags
@@ -2756,9 +2875,7 @@ def analyze_cheating():
     Optional query parameter:
       ?hours=N  — limit analysis to the last N hours (default: all-time)
     """
-    from models.audit_log import AuditLog
     from sqlalchemy import func
-    from datetime import datetime, timedelta
 
     hours = request.args.get('hours', type=int, default=None)
 
@@ -2823,9 +2940,6 @@ def analyze_cheating():
 @login_required
 @admin_required
 def submissions():
-    from models.submission import Submission
-    from models.user import User
-    from models.challenge import Challenge
 
     page = request.args.get('page', 1, type=int)
     challenge_id = request.args.get('challenge_id', None, type=int)
@@ -2856,19 +2970,33 @@ def submissions():
                            users=users)
 
 
+# Rows fetched per round-trip (and flushed to the client per chunk) by the CSV export
+EXPORT_BATCH_SIZE = 500
+
 @admin_bp.route('/submissions/export')
 @login_required
 @admin_required
 def export_submissions():
     import csv
     import io
-    from models.submission import Submission
-    from flask import Response
+    from flask import Response, stream_with_context
 
     challenge_id = request.args.get('challenge_id', None, type=int)
     correct_only = request.args.get('correct_only', None)
 
-    query = Submission.query
+    # Project only the exported columns; user/team/challenge names come from outer joins
+    # instead of three lazy loads per row
+    query = db.session.query(
+        Submission.id, Submission.submitted_at, Submission.user_id, User.username,
+        Team.name.label('team_name'), Submission.challenge_id, Challenge.name.label('challenge_name'),
+        Submission.submitted_flag, Submission.is_correct, Submission.ip_address
+    ).outerjoin(
+        User, Submission.user_id == User.id
+    ).outerjoin(
+        Team, Submission.team_id == Team.id
+    ).outerjoin(
+        Challenge, Submission.challenge_id == Challenge.id
+    )
     if challenge_id:
         query = query.filter(Submission.challenge_id == challenge_id)
     if correct_only == '1':
@@ -2876,27 +3004,35 @@ def export_submissions():
     elif correct_only == '0':
         query = query.filter(Submission.is_correct == False)
 
-    subs = query.order_by(Submission.submitted_at.desc()).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['ID', 'Time', 'Username', 'Team', 'Challenge', 'Flag Submitted', 'Correct', 'IP Address'])
-
-    for s in subs:
-        writer.writerow([
-            s.id,
-            s.submitted_at.strftime('%Y-%m-%d %H:%M:%S') if s.submitted_at else '',
-            s.user.username if s.user else s.user_id,
-            s.team.name if s.team else '',
-            s.challenge.name if s.challenge else s.challenge_id,
-            s.submitted_flag,
-            'Yes' if s.is_correct else 'No',
-            s.ip_address or ''
-        ])
-
-    output.seek(0)
+    rows = query.order_by(Submission.submitted_at.desc()).yield_per(EXPORT_BATCH_SIZE)
+
+    def generate():
+        # Rows are fetched and written out in batches, so memory stays flat however
+        # many submissions there are
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['ID', 'Time', 'Username', 'Team', 'Challenge', 'Flag Submitted', 'Correct', 'IP Address'])
+
+        for i, s in enumerate(rows, 1):
+            writer.writerow([
+                s.id,
+                s.submitted_at.strftime('%Y-%m-%d %H:%M:%S') if s.submitted_at else '',
+                s.username if s.username is not None else s.user_id,
+                s.team_name or '',
+                s.challenge_name if s.challenge_name is not None else s.challenge_id,
+                s.submitted_flag,
+                'Yes' if s.is_correct else 'No',
+                s.ip_address or ''
+            ])
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+
+        yield output.getvalue()
+
     return Response(
-        output.getvalue(),
+        stream_with_context(generate()),
         mimetype='text/csv',
         headers={'Content-Disposition': 'attachment; filename=submissions.csv'}
-    )
\ No newline at end of file
+    )
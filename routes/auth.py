@@ -4,6 +4,7 @@ from models import db
 from models.user import User
 from datetime import datetime
 from utils.audit import log_audit_event
+from services.cache import cache_service
 import re
 from utils.email import send_email, generate_confirmation_token, verify_token
 from flask import current_app
@@ -25,9 +26,22 @@ def login():
             flash('Please fill in all fields', 'error')
             return render_template('login.html')
         
+        # Refuse before hashing once an IP has piled up failed logins; only failures
+        # count, so many players behind one venue NAT can still sign in
+        rate_limit_key = f'login_failures:{request.remote_addr}'
+        failure_limit = current_app.config['LOGIN_FAILURE_LIMIT']
+        if cache_service.is_rate_limited(rate_limit_key, failure_limit):
+            flash('Too many failed login attempts. Please wait a minute and try again.', 'error')
+            return render_template('login.html'), 429
+        
         user = User.query.filter_by(username=username).first()
         
-        if user and user.check_password(password):
+        if user is None:
+            password_ok = User.check_password_for_missing_user(password)
+        else:
+            password_ok = user.check_password(password)
+        
+        if password_ok:
             if not user.is_active:
                 flash('Your account has been deactivated', 'error')
                 return render_template('login.html')
@@ -56,6 +70,8 @@ def login():
             else:
                 return redirect(url_for('challenges.list_challenges'))
         else:
+            cache_service.check_rate_limit(rate_limit_key, limit=failure_limit,
+                                           window=current_app.config['LOGIN_FAILURE_WINDOW'])
             log_audit_event(action='LOGIN_FAILED', details={'username': username})
             flash('Invalid username or password', 'error')
     
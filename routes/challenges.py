@@ -10,6 +10,9 @@ from services.cache import cache_service
 from services.websocket import WebSocketService
 from utils.audit import log_audit_event
 from datetime import datetime
+from sqlalchemy.orm import defer, selectinload
+from functools import lru_cache
+import json
 import re
 
 challenges_bp = Blueprint('challenges', __name__, url_prefix='/challenges')
@@ -70,6 +73,8 @@ def list_challenges():
                     Challenge.is_visible == True,
                     Challenge.is_hidden == True  # Include hidden challenges (prerequisites, flag unlocks)
                 )
+            ).options(
+                selectinload(Challenge.challenge_files)
             ).order_by(Challenge.act, Challenge.category, Challenge.name).all()
         else:
             # ACT system disabled - order by category, name only
@@ -78,6 +83,8 @@ def list_challenges():
                     Challenge.is_visible == True,
                     Challenge.is_hidden == True
                 )
+            ).options(
+                selectinload(Challenge.challenge_files)
             ).order_by(Challenge.category, Challenge.name).all()
     except Exception as e:
         # Fallback if ACT column doesn't exist or other error
@@ -88,6 +95,8 @@ def list_challenges():
                 Challenge.is_visible == True,
                 Challenge.is_hidden == True
             )
+        ).options(
+            selectinload(Challenge.challenge_files)
         ).order_by(Challenge.category, Challenge.name).all()
     
     # Get unlocked ACTs for user/team (only if ACT system is enabled)
@@ -108,17 +117,61 @@ def list_challenges():
     # Batch check which challenges are solved (single query instead of N queries)
     # This is the key optimization - replaces N individual queries with 1 batch query
     challenge_ids = [c.id for c in challenges]
+    
+    # Prerequisites of every listed challenge, so unlock checks don't query per challenge
+    from models.branching import ChallengePrerequisite, ChallengeUnlock
+    prerequisite_ids = {}
+    for challenge_id, prerequisite_id in db.session.execute(
+        db.select(ChallengePrerequisite.challenge_id, ChallengePrerequisite.prerequisite_challenge_id)
+        .where(ChallengePrerequisite.challenge_id.in_(challenge_ids))
+        .order_by(ChallengePrerequisite.id)
+    ):
+        prerequisite_ids.setdefault(challenge_id, []).append(prerequisite_id)
+    related_ids = set(challenge_ids).union(*prerequisite_ids.values())
+    
+    solved_query = db.select(Solve.challenge_id).where(Solve.challenge_id.in_(related_ids))
     if team:
-        solved_ids = set(solve.challenge_id for solve in Solve.query.filter(
-            Solve.team_id == team.id,
-            Solve.challenge_id.in_(challenge_ids)
-        ).all())
+        solved_query = solved_query.where(Solve.team_id == team.id)
+    else:
+        solved_query = solved_query.where(Solve.user_id == current_user.id)
+    solved_ids = set(db.session.scalars(solved_query))
+    
+    # Flag unlocks: by user OR team when in a team, only by the user when solo
+    unlock_query = db.select(ChallengeUnlock.challenge_id).where(ChallengeUnlock.challenge_id.in_(challenge_ids))
+    if team:
+        unlock_query = unlock_query.where(db.or_(
+            ChallengeUnlock.user_id == current_user.id,
+            ChallengeUnlock.team_id == team.id
+        ))
     else:
-        solved_ids = set(solve.challenge_id for solve in Solve.query.filter(
-            Solve.user_id == current_user.id,
-            Solve.challenge_id.in_(challenge_ids)
+        unlock_query = unlock_query.where(ChallengeUnlock.user_id == current_user.id)
+    unlocked_ids = set(db.session.scalars(unlock_query))
+    
+    # Solve counts for points/solves display (one GROUP BY instead of COUNTs per challenge)
+    solve_counts = dict(db.session.execute(
+        db.select(Solve.challenge_id, db.func.count(Solve.id))
+        .where(Solve.challenge_id.in_(challenge_ids))
+        .group_by(Solve.challenge_id)
+    ).all())
+    
+    # Names of prerequisites that aren't in the listed set (e.g. not visible)
+    challenge_names = {c.id: c.name for c in challenges}
+    other_ids = related_ids - challenge_names.keys()
+    if other_ids:
+        challenge_names.update(db.session.execute(
+            db.select(Challenge.id, Challenge.name).where(Challenge.id.in_(other_ids))
         ).all())
     
+    def is_unlocked(challenge):
+        """Same rules as Challenge.is_unlocked_for_user, using the pre-loaded data"""
+        if not challenge.is_hidden:
+            return True
+        if challenge.unlock_mode == 'prerequisite':
+            return all(pid in solved_ids for pid in prerequisite_ids.get(challenge.id, []))
+        if challenge.unlock_mode == 'flag_unlock':
+            return challenge.id in unlocked_ids
+        return False
+    
     # Organize challenges by ACT, then by category within each ACT (or just by category if ACT system disabled)
     acts = {}
     for challenge in challenges:
@@ -143,7 +196,7 @@ def list_challenges():
         
         # Check if challenge is unlocked for user
         if not current_user.is_admin:
-            if not challenge.is_unlocked_for_user(current_user.id, team.id if team else None):
+            if not is_unlocked(challenge):
                 continue  # Skip hidden/locked challenges
         
         # Initialize ACT dict if needed
@@ -157,16 +210,18 @@ def list_challenges():
         # Check if solved (using pre-loaded data)
         solved = challenge.id in solved_ids
         
-        challenge_data = challenge.to_dict(include_flag=False)
+        solve_count = solve_counts.get(challenge.id, 0)
+        challenge_data = challenge.to_dict(include_flag=False, include_solves=False, solve_count=solve_count)
+        challenge_data['solves'] = solve_count
         challenge_data['solved'] = solved
         challenge_data['requires_team'] = challenge.requires_team
         
         # Add prerequisite info if locked
         if challenge.unlock_mode == 'prerequisite':
-            missing = challenge.get_missing_prerequisites(current_user.id, team.id if team else None)
+            missing = [pid for pid in prerequisite_ids.get(challenge.id, []) if pid not in solved_ids]
             if missing:
                 challenge_data['locked'] = True
-                challenge_data['missing_prerequisites'] = [c.name for c in missing]
+                challenge_data['missing_prerequisites'] = [challenge_names[pid] for pid in missing]
         
         acts[act_name][challenge.category].append(challenge_data)
     
@@ -252,8 +307,8 @@ def view_challenge(challenge_id):
         hints_data.append(hint_info)
     
     # Check if challenge has branching (multiple paths)
-    from models.branching import ChallengeFlag, ChallengeUnlock
-    challenge_flags = ChallengeFlag.query.filter_by(challenge_id=challenge_id).all()
+    from models.branching import ChallengeUnlock
+    challenge_flags = challenge.get_flags()
     has_branching = len(challenge_flags) > 1
     challenge_data['has_branching'] = has_branching
     
@@ -263,32 +318,33 @@ def view_challenge(challenge_id):
         user_id = current_user.id
         team_id = team.id if team else None
         
-        # Find all flags from THIS challenge that unlock other challenges
-        unlocking_flags = ChallengeFlag.query.filter(
-            ChallengeFlag.challenge_id == challenge_id,
-            ChallengeFlag.unlocks_challenge_id.isnot(None)
-        ).all()
+        # Flags from THIS challenge that unlock other challenges (already loaded above)
+        unlocking_flags = [flag for flag in challenge_flags if flag.unlocks_challenge_id is not None]
         
-        # For each unlocking flag, check if user has unlocked it
-        for flag in unlocking_flags:
-            unlock_query = ChallengeUnlock.query.filter(
-                ChallengeUnlock.unlocked_by_flag_id == flag.id
+        if unlocking_flags:
+            # Which of those flags this user/team has used, in one query
+            unlock_query = db.select(ChallengeUnlock.unlocked_by_flag_id).where(
+                ChallengeUnlock.unlocked_by_flag_id.in_([flag.id for flag in unlocking_flags])
             )
-            
             if team_id:
-                unlock_query = unlock_query.filter(
+                unlock_query = unlock_query.where(
                     db.or_(
                         ChallengeUnlock.user_id == user_id,
                         ChallengeUnlock.team_id == team_id
                     )
                 )
             else:
-                unlock_query = unlock_query.filter(ChallengeUnlock.user_id == user_id)
-                
-            unlock = unlock_query.first()
+                unlock_query = unlock_query.where(ChallengeUnlock.user_id == user_id)
+            unlocked_flag_ids = set(db.session.scalars(unlock_query))
             
-            if unlock:
-                unlocked_challenge = Challenge.query.get(flag.unlocks_challenge_id)
+            # Challenges those flags unlocked, in one query
+            target_ids = {flag.unlocks_challenge_id for flag in unlocking_flags if flag.id in unlocked_flag_ids}
+            targets = {
+                c.id: c for c in Challenge.query.filter(Challenge.id.in_(target_ids)).all()
+            } if target_ids else {}
+            
+            for flag in unlocking_flags:
+                unlocked_challenge = targets.get(flag.unlocks_challenge_id) if flag.id in unlocked_flag_ids else None
                 if unlocked_challenge:
                     unlocked_paths.append({
                         'challenge_name': unlocked_challenge.name,
@@ -353,6 +409,105 @@ def view_challenge(challenge_id):
                           team=team)
 
 
+SCOREBOARD_BROADCAST_LIMIT = 50
+
+
+def _outside_top_scoreboard(scoreboard, team_based, team_id, user_id):
+    """True if the solver can't appear in the cached top SCOREBOARD_BROADCAST_LIMIT
+    
+    Only meaningful when the solved challenge kept its value; otherwise every other
+    solver's score moved too and the board has to be rebuilt.
+    """
+    if not scoreboard or len(scoreboard) < SCOREBOARD_BROADCAST_LIMIT:
+        return False
+    top = scoreboard[:SCOREBOARD_BROADCAST_LIMIT]
+    solver_id = team_id if team_based else user_id
+    if solver_id is None:
+        # Teamless player on a team scoreboard
+        return True
+    if any(entry['id'] == solver_id for entry in top):
+        return False
+    
+    if team_based:
+        from models.team import Team
+        solver = db.session.get(Team, solver_id)
+    else:
+        solver = db.session.get(User, solver_id)
+    return solver is not None and solver.get_score() < top[-1]['score']
+
+
+def _broadcast_solve(app, challenge_id, points, solve_data, team_id=None, user_id=None):
+    """Push a new solve, the challenge's new value and the refreshed scoreboard to live clients"""
+    from models.settings import Settings
+    
+    with app.app_context():
+        try:
+            WebSocketService.emit_new_solve(solve_data)
+            
+            # Update challenge points (may have changed)
+            challenge = db.session.get(Challenge, challenge_id,
+                                       options=[defer(Challenge.description), defer(Challenge.hints)])
+            new_points = challenge.get_current_points() if challenge else points
+            if new_points != points:
+                WebSocketService.emit_challenge_update({
+                    'id': challenge.id,
+                    'name': challenge.name,
+                    'points': new_points
+                })
+            
+            # Send updated scoreboard (check if teams are enabled)
+            teams_enabled = Settings.get('teams_enabled', default=True, type='bool')
+            cache_key = 'scoreboard_team' if teams_enabled else 'scoreboard_individual'
+            
+            # A long-tail solve on a challenge whose value didn't change leaves the top of
+            # the board as it is; skip the full rebuild and keep the cached copy
+            if new_points == points and _outside_top_scoreboard(
+                    cache_service.get(cache_key), teams_enabled, team_id, user_id):
+                return
+            
+            scoreboard = ScoringService.get_scoreboard(team_based=teams_enabled, limit=SCOREBOARD_BROADCAST_LIMIT)
+            cache_service.set(cache_key, scoreboard, ttl=60)
+            WebSocketService.emit_scoreboard_update(scoreboard)
+        except Exception as e:
+            app.logger.error(f"Failed to broadcast solve of challenge {challenge_id}: {e}")
+        finally:
+            db.session.remove()
+
+
+@lru_cache(maxsize=16)
+def _ctf_closed_body(ctf_status, when):
+    """Serialized JSON error for a closed CTF; keyed on the start/end time, so a settings
+    change simply produces a new entry"""
+    if ctf_status == 'not_started':
+        message = f'CTF has not started yet. Starts at: {when.strftime("%Y-%m-%d %H:%M UTC") if when else "TBD"}'
+    elif ctf_status == 'ended':
+        message = f'CTF has ended. Ended at: {when.strftime("%Y-%m-%d %H:%M UTC") if when else "Unknown"}'
+    else:
+        message = 'CTF is currently paused by administrators. Please wait for it to resume.'
+    return json.dumps({'success': False, 'message': message})
+
+
+def _ctf_closed_response():
+    """JSON error for flag submissions while the CTF is not running, else None
+    
+    Reads start/end/paused from one cached get_ctf_status_settings() batch instead of
+    separate Settings lookups for the status and the times shown in the message.
+    """
+    from models.settings import Settings
+    
+    values = Settings.get_ctf_status_settings()
+    start_time = values['ctf_start_time']
+    end_time = values['ctf_end_time']
+    ctf_status = Settings.compute_ctf_status(start_time, end_time, values['ctf_paused'])
+    
+    if ctf_status == 'running':
+        return None
+    
+    when = start_time if ctf_status == 'not_started' else end_time if ctf_status == 'ended' else None
+    return current_app.response_class(_ctf_closed_body(ctf_status, when), status=403,
+                                      mimetype='application/json')
+
+
 @challenges_bp.route('/<int:challenge_id>/submit', methods=['POST'])
 @login_required
 def submit_flag(challenge_id):
@@ -360,29 +515,14 @@ def submit_flag(challenge_id):
     from models.settings import Settings
     
     # Check CTF status
-    ctf_status = Settings.get_ctf_status()
+    closed_response = _ctf_closed_response()
+    if closed_response:
+        return closed_response
     
-    if ctf_status == 'not_started':
-        start_time = Settings.get('ctf_start_time')
-        return jsonify({
-            'success': False, 
-            'message': f'CTF has not started yet. Starts at: {start_time.strftime("%Y-%m-%d %H:%M UTC") if start_time else "TBD"}'
-        }), 403
-    
-    if ctf_status == 'ended':
-        end_time = Settings.get('ctf_end_time')
-        return jsonify({
-            'success': False, 
-            'message': f'CTF has ended. Ended at: {end_time.strftime("%Y-%m-%d %H:%M UTC") if end_time else "Unknown"}'
-        }), 403
-    
-    if ctf_status == 'paused':
-        return jsonify({
-            'success': False, 
-            'message': 'CTF is currently paused by administrators. Please wait for it to resume.'
-        }), 403
-    
-    challenge = Challenge.query.get_or_404(challenge_id)
+    # Flag checks never read the long text columns; skip them
+    challenge = Challenge.query.options(
+        defer(Challenge.description), defer(Challenge.hints)
+    ).get_or_404(challenge_id)
     
     # Get user's team first (needed for unlock checks)
     team = current_user.get_team()
@@ -400,8 +540,13 @@ def submit_flag(challenge_id):
             'message': 'This challenge is temporarily disabled. Please try again later.'
         }), 403
     
-    # Check if teams are enabled
-    teams_enabled = Settings.get('teams_enabled', default=True, type='bool')
+    # Check if teams are enabled and whether a team is required globally (one batch lookup)
+    team_settings = Settings.get_many(
+        ['teams_enabled', 'require_team_for_challenges'],
+        defaults={'teams_enabled': True, 'require_team_for_challenges': False},
+        types={'teams_enabled': 'bool', 'require_team_for_challenges': 'bool'}
+    )
+    teams_enabled = team_settings['teams_enabled']
     
     # Check if team is required for this challenge (only if teams are enabled)
     if teams_enabled and challenge.requires_team and not team_id and not current_user.is_admin:
@@ -411,7 +556,7 @@ def submit_flag(challenge_id):
         }), 403
     
     # Check global team requirement setting (only if teams are enabled)
-    if teams_enabled and Settings.get('require_team_for_challenges', default=False, type='bool') and not team_id and not current_user.is_admin:
+    if teams_enabled and team_settings['require_team_for_challenges'] and not team_id and not current_user.is_admin:
         return jsonify({
             'success': False, 
             'message': 'You must be in a team to solve challenges. Please join or create a team first.'
@@ -426,7 +571,7 @@ def submit_flag(challenge_id):
     # already_solved. This serializes concurrent flag submissions for the same
     # challenge, preventing double-solve and double first-blood race conditions.
     # The lock is held until the transaction commits or rolls back.
-    Challenge.query.with_for_update().get(challenge_id)
+    db.session.execute(db.select(Challenge.id).where(Challenge.id == challenge_id).with_for_update())
     
     # Check if already solved (by user or team) — now protected by the lock above
     if team:
@@ -435,8 +580,7 @@ def submit_flag(challenge_id):
         already_solved = challenge.is_solved_by_user(current_user.id)
     
     # Check if this challenge has branching flags (allows re-submission for different paths)
-    from models.branching import ChallengeFlag
-    challenge_flags = ChallengeFlag.query.filter_by(challenge_id=challenge_id).all()
+    challenge_flags = challenge.get_flags()
     has_branching = len(challenge_flags) > 1
     
     # If already solved and challenge has no branching, reject submission
@@ -444,31 +588,28 @@ def submit_flag(challenge_id):
         return jsonify({'success': False, 'message': 'This challenge has already been solved'}), 400
     
     # Check max attempts limit (0 means unlimited)
+    # attempts_used is reused for attempts_remaining after a wrong flag. The count is
+    # capped at max_attempts (LIMIT), which is all the check and that math need
+    attempts_used = None
     if challenge.max_attempts and challenge.max_attempts > 0:
         if team_id:
             # Count team's attempts for this challenge
-            team_attempts = Submission.query.filter_by(
+            attempts_used = Submission.query.filter_by(
                 challenge_id=challenge_id,
                 team_id=team_id
-            ).count()
-            
-            if team_attempts >= challenge.max_attempts:
-                return jsonify({
-                    'success': False,
-                    'message': f'Maximum attempts ({challenge.max_attempts}) reached for this challenge'
-                }), 400
+            ).limit(challenge.max_attempts).count()
         else:
             # Count user's attempts
-            user_attempts = Submission.query.filter_by(
+            attempts_used = Submission.query.filter_by(
                 challenge_id=challenge_id,
                 user_id=current_user.id
-            ).count()
-            
-            if user_attempts >= challenge.max_attempts:
-                return jsonify({
-                    'success': False,
-                    'message': f'Maximum attempts ({challenge.max_attempts}) reached for this challenge'
-                }), 400
+            ).limit(challenge.max_attempts).count()
+        
+        if attempts_used >= challenge.max_attempts:
+            return jsonify({
+                'success': False,
+                'message': f'Maximum attempts ({challenge.max_attempts}) reached for this challenge'
+            }), 400
     
     # Rate limiting check (prevent brute force)
     rate_limit_key = f'submissions:{current_user.id}:{challenge_id}'
@@ -481,7 +622,8 @@ def submit_flag(challenge_id):
         }), 429
     
     # Check the flag
-    matched_flag = challenge.check_flag(submitted_flag, team_id=team_id, user_id=current_user.id)
+    matched_flag = challenge.check_flag(submitted_flag, team_id=team_id, user_id=current_user.id,
+                                        flags=challenge_flags)
     is_correct = matched_flag is not None
     
     # ANTI-FLAG-SHARING: Check if submitted flag is a dynamic flag from another team
@@ -663,6 +805,7 @@ def submit_flag(challenge_id):
         # DETECT exact regex-based flag sharing (admin-controlled per-challenge)
         try:
             from models.flag_abuse import FlagAbuseAttempt
+            from models.branching import compile_flag_pattern
             from datetime import timedelta, datetime
 
             # Only consider when this flag was matched via a regex flag and the challenge has monitoring enabled
@@ -739,11 +882,7 @@ def submit_flag(challenge_id):
                     # If no exact-match prior submission was found, also check for prior
                     # submissions that match the same regex pattern (different concrete strings).
                     try:
-                        flags_pattern = None
-                        if matched_flag.is_case_sensitive:
-                            flags_pattern = re.compile(matched_flag.flag_value)
-                        else:
-                            flags_pattern = re.compile(matched_flag.flag_value, re.IGNORECASE)
+                        flags_pattern = compile_flag_pattern(matched_flag.flag_value, bool(matched_flag.is_case_sensitive))
 
                         broader_query = Submission.query.filter(
                             Submission.challenge_id == challenge_id,
@@ -984,12 +1123,12 @@ def submit_flag(challenge_id):
             raise
         
         # Invalidate caches
-        cache_service.invalidate_scoreboard()
-        cache_service.invalidate_challenge(challenge_id)
-        if team_id:
-            cache_service.invalidate_team(team_id)
-        else:
-            cache_service.invalidate_user(current_user.id)
+        cache_service.invalidate_many(
+            challenge_ids=[challenge_id],
+            team_ids=[team_id] if team_id else (),
+            user_ids=() if team_id else [current_user.id],
+            scoreboard=True
+        )
         
         # Emit WebSocket events for live updates
         solve_data = {
@@ -1000,23 +1139,11 @@ def submit_flag(challenge_id):
             'points': points,
             'timestamp': datetime.utcnow().isoformat()
         }
-        WebSocketService.emit_new_solve(solve_data)
-        
-        # Update challenge points (may have changed)
-        new_points = challenge.get_current_points()
-        if new_points != points:
-            WebSocketService.emit_challenge_update({
-                'id': challenge.id,
-                'name': challenge.name,
-                'points': new_points
-            })
-        
-        # Send updated scoreboard (check if teams are enabled)
-        teams_enabled = Settings.get('teams_enabled', default=True, type='bool')
-        cache_key = 'scoreboard_team' if teams_enabled else 'scoreboard_individual'
-        scoreboard = ScoringService.get_scoreboard(team_based=teams_enabled, limit=50)
-        cache_service.set(cache_key, scoreboard, ttl=60)
-        WebSocketService.emit_scoreboard_update(scoreboard)
+        # Rebuilding the scoreboard is the heaviest part of a solve; do it (and the
+        # broadcasts) on a greenlet so the response goes out right after the commit
+        import gevent
+        gevent.spawn(_broadcast_solve, current_app._get_current_object(), challenge_id, points, solve_data,
+                     team_id=team_id, user_id=current_user.id)
         
         message = 'Correct flag! Challenge solved!'
         if team:
@@ -1043,20 +1170,10 @@ def submit_flag(challenge_id):
     else:
         db.session.commit()
         
-        # Calculate remaining attempts if limited
+        # Calculate remaining attempts if limited (the count above plus this submission)
         attempts_remaining = None
-        if challenge.max_attempts and challenge.max_attempts > 0:
-            if team_id:
-                attempts_used = Submission.query.filter_by(
-                    challenge_id=challenge_id,
-                    team_id=team_id
-                ).count()
-            else:
-                attempts_used = Submission.query.filter_by(
-                    challenge_id=challenge_id,
-                    user_id=current_user.id
-                ).count()
-            attempts_remaining = challenge.max_attempts - attempts_used
+        if attempts_used is not None:
+            attempts_remaining = challenge.max_attempts - (attempts_used + 1)
         
         response = {
             'success': False,
@@ -1075,33 +1192,17 @@ def submit_flag(challenge_id):
 @login_required
 def explore_flag(challenge_id):
     """Submit an additional flag for an already-solved challenge to unlock more paths (no points awarded)"""
-    from models.settings import Settings
-    from models.branching import ChallengeFlag, ChallengeUnlock
+    from models.branching import ChallengeUnlock
     
     # Check CTF status
-    ctf_status = Settings.get_ctf_status()
-    
-    if ctf_status == 'not_started':
-        start_time = Settings.get('ctf_start_time')
-        return jsonify({
-            'success': False, 
-            'message': f'CTF has not started yet. Starts at: {start_time.strftime("%Y-%m-%d %H:%M UTC") if start_time else "TBD"}'
-        }), 403
-    
-    if ctf_status == 'ended':
-        end_time = Settings.get('ctf_end_time')
-        return jsonify({
-            'success': False, 
-            'message': f'CTF has ended. Ended at: {end_time.strftime("%Y-%m-%d %H:%M UTC") if end_time else "Unknown"}'
-        }), 403
-    
-    if ctf_status == 'paused':
-        return jsonify({
-            'success': False, 
-            'message': 'CTF is currently paused by administrators. Please wait for it to resume.'
-        }), 403
-    
-    challenge = Challenge.query.get_or_404(challenge_id)
+    closed_response = _ctf_closed_response()
+    if closed_response:
+        return closed_response
+    
+    # Flag checks never read the long text columns; skip them
+    challenge = Challenge.query.options(
+        defer(Challenge.description), defer(Challenge.hints)
+    ).get_or_404(challenge_id)
     # Get user's team (needed for unlock checks)
     team = current_user.get_team()
     team_id = team.id if team else None
@@ -1124,7 +1225,7 @@ def explore_flag(challenge_id):
         }), 403
     
     # Check if this challenge has branching flags
-    challenge_flags = ChallengeFlag.query.filter_by(challenge_id=challenge_id).all()
+    challenge_flags = challenge.get_flags()
     has_branching = len(challenge_flags) > 1
     
     if not has_branching:
@@ -1149,7 +1250,8 @@ def explore_flag(challenge_id):
         }), 429
     
     # Check the flag
-    matched_flag = challenge.check_flag(submitted_flag, team_id=team_id, user_id=current_user.id)
+    matched_flag = challenge.check_flag(submitted_flag, team_id=team_id, user_id=current_user.id,
+                                        flags=challenge_flags)
     
     if not matched_flag:
         return jsonify({'success': False, 'message': 'Incorrect flag'}), 400
@@ -1204,8 +1306,7 @@ def explore_flag(challenge_id):
     db.session.commit()
     
     # Invalidate caches
-    cache_service.invalidate_challenge(challenge_id)
-    cache_service.invalidate_challenge(matched_flag.unlocks_challenge_id)
+    cache_service.invalidate_many(challenge_ids=[challenge_id, matched_flag.unlocks_challenge_id])
     
     response_data = {
         'success': True,
@@ -1233,7 +1334,9 @@ def challenge_solves(challenge_id):
     
     challenge = Challenge.query.get_or_404(challenge_id)
     
+    # Load the solving teams/users in two IN queries rather than one lazy load per solve
     solves = Solve.query.filter_by(challenge_id=challenge_id)\
+        .options(selectinload(Solve.team), selectinload(Solve.user))\
         .order_by(Solve.solved_at.asc()).all()
     
     solve_list = []
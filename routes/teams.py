@@ -3,6 +3,7 @@ from flask_login import login_required, current_user
 from models import db
 from models.team import Team
 from models.user import User
+from services.cache import cache_service
 from services.scoring import ScoringService
 from utils.audit import log_audit_event
 
@@ -76,6 +77,7 @@ def create_team():
                 return render_template('create_team.html')
             raise
         
+        cache_service.invalidate_filter_options('teams')
         log_audit_event(user_id=current_user.id, team_id=team.id, action='CREATE_TEAM')
         
         flash(f'Team "{team_name}" created successfully! Share your invite code: {invite_code}', 'success')
@@ -31,6 +31,14 @@ def ensure_docker_schema():
         "ALTER TABLE challenges ADD COLUMN IF NOT EXISTS docker_flag_path VARCHAR(256) DEFAULT NULL;",
         # users table: add last_ip_address tracking
         "ALTER TABLE users ADD COLUMN IF NOT EXISTS last_ip_address VARCHAR(45) DEFAULT NULL;",
+        # flag_abuse_attempts: per-severity dashboard counts and filtered admin lists, newest first
+        "CREATE INDEX IF NOT EXISTS idx_flag_abuse_severity_ts ON flag_abuse_attempts(severity, timestamp);",
+        "DROP INDEX IF EXISTS idx_flag_abuse_severity ON flag_abuse_attempts;",
+        "CREATE INDEX IF NOT EXISTS idx_flag_abuse_team_ts ON flag_abuse_attempts(team_id, timestamp);",
+        "CREATE INDEX IF NOT EXISTS idx_flag_abuse_user_ts ON flag_abuse_attempts(user_id, timestamp);",
+        "CREATE INDEX IF NOT EXISTS idx_flag_abuse_challenge_ts ON flag_abuse_attempts(challenge_id, timestamp);",
+        # hint_unlocks: hint logs ordered by unlocked_at DESC
+        "CREATE INDEX IF NOT EXISTS idx_hint_unlocks_unlocked_at ON hint_unlocks(unlocked_at);",
     ]
     
     # Create flag_abuse_attempts table if not exists
@@ -4,19 +4,390 @@ Handles scheduled database backups based on configured frequency.
 """
 
 import gzip
+import io
 import json
 import logging
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse
 
 import pymysql
+from pymysql.constants import FIELD_TYPE
+from pymysql.converters import escape_float
+import redis as redislib
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from models.settings import Settings
+from services.cache import cache_service
+from services.file_storage import COPY_CHUNK_SIZE
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
 
 logger = logging.getLogger(__name__)
 
+# New dumps use zstd when it is installed; .sql.gz backups stay readable either way
+BACKUP_EXTENSIONS = ('.sql.zst', '.sql.gz')
+BACKUP_EXTENSION = '.sql.zst' if zstd else '.sql.gz'
+
+# Rows fetched per round trip when falling back to the Python dump
+DUMP_BATCH_SIZE = 500
+# Flush a multi-row INSERT once its VALUES list reaches this size, well under
+# MariaDB's default 16MB max_allowed_packet (mysqldump uses a 1MB net buffer)
+DUMP_STATEMENT_BYTES = 1024 * 1024
+
+
+def open_backup(path, mode='rb'):
+    """Open a .sql.zst or .sql.gz backup for reading or writing ('rb', 'rt', 'wb' or 'wt')"""
+    path = Path(path)
+    if not path.name.endswith('.zst'):
+        kwargs = {'encoding': 'utf-8'} if 't' in mode else {}
+        if 'w' in mode:
+            kwargs['compresslevel'] = 1
+        return gzip.open(path, mode, **kwargs)
+    
+    if zstd is None:
+        raise RuntimeError('Reading or writing .zst backups requires the zstandard package')
+    raw = open(path, mode.replace('t', 'b'))
+    if 'w' in mode:
+        # threads=-1 compresses on every core
+        stream = zstd.ZstdCompressor(level=3, threads=-1).stream_writer(raw)
+    else:
+        stream = zstd.ZstdDecompressor().stream_reader(raw)
+    return io.TextIOWrapper(stream, encoding='utf-8') if 't' in mode else stream
+
+
+def partial_path(path):
+    """Temporary name to write a backup artifact under until it is complete
+    
+    The leading '.partial_' keeps it out of the backup_* listing and lookups, and the
+    original suffix is kept so open_backup still picks the right compression.
+    """
+    path = Path(path)
+    return path.with_name(f'.partial_{path.name}')
+
+
+def find_backup_file(backup_dir, backup_name):
+    """Path of the dump for backup_name in any supported format, or None"""
+    for extension in BACKUP_EXTENSIONS:
+        backup_file = Path(backup_dir) / f'{backup_name}{extension}'
+        if backup_file.exists():
+            return backup_file
+    return None
+
+
+def backup_name_of(backup_file):
+    """Backup name for a dump file, without its .sql.* extension"""
+    name = Path(backup_file).name
+    for extension in BACKUP_EXTENSIONS:
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return name
+
+
+# Characters that can start a quoted string, a comment or end a statement
+_SQL_SPECIAL_RE = re.compile(r"['\"`;#]|--|/\*")
+# What ends (or escapes inside) each kind of quoted string
+_SQL_QUOTE_END_RE = {
+    "'": re.compile(r"['\\]"),
+    '"': re.compile(r'["\\]'),
+    '`': re.compile(r'`'),
+}
+
+
+def iter_sql_statements(lines):
+    """Yield complete statements from an iterable of SQL dump lines.
+    
+    Quote-aware, so semicolons, newlines and comment markers inside string
+    literals do not split a statement. Comments are dropped, including
+    mysqldump's /*!...*/ version comments.
+    """
+    parts = []
+    quote = None
+    in_comment = False
+    
+    for line in lines:
+        pos = start = 0
+        end = len(line)
+        while pos < end:
+            if in_comment:
+                close = line.find('*/', pos)
+                if close == -1:
+                    pos = start = end
+                    break
+                in_comment = False
+                pos = start = close + 2
+                continue
+            
+            if quote:
+                m = _SQL_QUOTE_END_RE[quote].search(line, pos)
+                if not m:
+                    break
+                if m.group() == '\\':
+                    pos = m.end() + 1
+                elif line.startswith(quote, m.end()):
+                    # Doubled quote is an escaped quote
+                    pos = m.end() + 1
+                else:
+                    quote = None
+                    pos = m.end()
+                continue
+            
+            m = _SQL_SPECIAL_RE.search(line, pos)
+            if not m:
+                break
+            token = m.group()
+            if token in ("'", '"', '`'):
+                quote = token
+                pos = m.end()
+            elif token == ';':
+                parts.append(line[start:m.start()])
+                statement = ''.join(parts).strip()
+                parts = []
+                if statement:
+                    yield statement
+                pos = start = m.end()
+            elif token == '/*':
+                parts.append(line[start:m.start()])
+                in_comment = True
+                pos = m.end()
+            elif token == '--' and line[m.end():m.end() + 1] not in ('', ' ', '\t', '\r', '\n'):
+                # "--" only starts a comment when followed by whitespace
+                pos = m.end()
+            else:
+                parts.append(line[start:m.start()] + '\n')
+                pos = start = end
+        
+        if not in_comment:
+            parts.append(line[start:])
+    # Anything left without a terminating ';' is an incomplete statement and is dropped
+
+
+def _connect(parsed):
+    return pymysql.connect(
+        host=parsed.hostname,
+        port=parsed.port or 3306,
+        user=parsed.username,
+        password=parsed.password,
+        database=parsed.path.lstrip('/'),
+        charset='utf8mb4'
+    )
+
+
+def _escape(conn, value):
+    """SQL literal for a dumped value; binary columns are hex-encoded like mysqldump --hex-blob"""
+    if isinstance(value, (bytes, bytearray)):
+        return f"X'{value.hex()}'"
+    # pymysql's escaper handles NULL, numbers, datetimes and quoting for the connection charset
+    return conn.escape(value)
+
+
+_INTEGER_TYPES = {
+    FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG,
+    FIELD_TYPE.INT24, FIELD_TYPE.YEAR, FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL,
+}
+_FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE}
+_STRING_TYPES = {
+    FIELD_TYPE.VARCHAR, FIELD_TYPE.VAR_STRING, FIELD_TYPE.STRING, FIELD_TYPE.JSON,
+    FIELD_TYPE.ENUM, FIELD_TYPE.SET, FIELD_TYPE.TINY_BLOB, FIELD_TYPE.MEDIUM_BLOB,
+    FIELD_TYPE.LONG_BLOB, FIELD_TYPE.BLOB,
+}
+
+
+def _column_encoders(conn, description):
+    """Pick one SQL literal encoder per column from the result set's type codes.
+    
+    Choosing the encoder once per table keeps the per-value type dispatch of
+    _escape out of the row loop; temporal and unusual types still go through it.
+    """
+    def enc_number(value):
+        return 'NULL' if value is None else str(value)
+    
+    def enc_float(value):
+        return 'NULL' if value is None else escape_float(value)
+    
+    def enc_string(value):
+        if value is None:
+            return 'NULL'
+        if isinstance(value, (bytes, bytearray)):
+            return f"X'{value.hex()}'"
+        return f"'{conn.escape_string(value)}'"
+    
+    def enc_other(value):
+        return _escape(conn, value)
+    
+    encoders = []
+    for column in description:
+        type_code = column[1]
+        if type_code in _INTEGER_TYPES:
+            encoders.append(enc_number)
+        elif type_code in _FLOAT_TYPES:
+            encoders.append(enc_float)
+        elif type_code in _STRING_TYPES:
+            encoders.append(enc_string)
+        else:
+            encoders.append(enc_other)
+    return encoders
+
+
+def _run_mysqldump(parsed, backup_file, title):
+    """Pipe the native mysqldump client straight into the compressed backup file"""
+    cmd = [
+        'mysqldump', '--single-transaction', '--quick', '--extended-insert',
+        '--default-character-set=utf8mb4', '--hex-blob',
+        '-h', parsed.hostname or 'localhost',
+        '-P', str(parsed.port or 3306),
+        '-u', parsed.username,
+        parsed.path.lstrip('/')
+    ]
+    # Pass the password through the environment so it does not show up in the process list
+    env = dict(os.environ, MYSQL_PWD=parsed.password or '')
+    
+    # stderr goes to a temp file: a PIPE read only after stdout's EOF would deadlock once
+    # mysqldump's warnings fill the pipe buffer
+    with open_backup(backup_file, 'wb') as f, tempfile.TemporaryFile() as err:
+        f.write(f"-- {title}\n-- Timestamp: {datetime.now().isoformat()}\n".encode('utf-8'))
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, env=env)
+        shutil.copyfileobj(proc.stdout, f, COPY_CHUNK_SIZE)
+        if proc.wait() != 0:
+            err.seek(0)
+            raise RuntimeError(err.read().decode('utf-8', errors='replace').strip() or 'mysqldump failed')
+
+
+def _write_python_dump(conn, tables, backup_file, title):
+    """Dump every table with batched multi-row INSERTs when mysqldump is unavailable"""
+    cursor = conn.cursor()
+    # Unbuffered cursor so table data streams from the server instead of being fetched at once
+    data_cursor = conn.cursor(pymysql.cursors.SSCursor)
+    
+    with open_backup(backup_file, 'wt') as f:
+        f.write(f"-- {title}\n")
+        f.write(f"-- Timestamp: {datetime.now().isoformat()}\n")
+        f.write("SET FOREIGN_KEY_CHECKS=0;\n")
+        
+        for table in tables:
+            # Get CREATE TABLE statement
+            cursor.execute(f"SHOW CREATE TABLE `{table}`")
+            create_table = cursor.fetchone()[1]
+            f.write(f"\n-- Table: {table}\n")
+            f.write(f"DROP TABLE IF EXISTS `{table}`;\n")
+            f.write(create_table + ";\n")
+            
+            # Get table data
+            data_cursor.execute(f"SELECT * FROM `{table}`")
+            column_list = ', '.join([f'`{col[0]}`' for col in data_cursor.description])
+            encoders = _column_encoders(conn, data_cursor.description)
+            
+            pending = []
+            pending_size = 0
+            while True:
+                rows = data_cursor.fetchmany(DUMP_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    row_sql = '(' + ','.join([encode(value) for encode, value in zip(encoders, row)]) + ')'
+                    pending.append(row_sql)
+                    pending_size += len(row_sql) + 1
+                    if pending_size >= DUMP_STATEMENT_BYTES:
+                        f.write(f"INSERT INTO `{table}` ({column_list}) VALUES {','.join(pending)};\n")
+                        pending = []
+                        pending_size = 0
+            
+            if pending:
+                f.write(f"INSERT INTO `{table}` ({column_list}) VALUES {','.join(pending)};\n")
+        
+        f.write("\nSET FOREIGN_KEY_CHECKS=1;")
+    
+    data_cursor.close()
+    cursor.close()
+
+
+def dump_database(db_uri, backup_file, title):
+    """Write a compressed SQL dump of the database to backup_file, returning the table count"""
+    parsed = urlparse(db_uri)
+    conn = _connect(parsed)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SHOW TABLES")
+        tables = [table[0] for table in cursor.fetchall()]
+        cursor.close()
+        
+        if shutil.which('mysqldump'):
+            try:
+                _run_mysqldump(parsed, backup_file, title)
+                return len(tables)
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"mysqldump failed, falling back to Python dump: {e}")
+        
+        _write_python_dump(conn, tables, backup_file, title)
+        return len(tables)
+    finally:
+        conn.close()
+
+
+def archive_uploads(uploads_dir, archive_path):
+    """Tar+gzip the uploads folder, leaving out the backups stored inside it.
+    
+    Returns False when there is no uploads folder to archive.
+    """
+    uploads_dir = Path(uploads_dir)
+    if not uploads_dir.exists():
+        return False
+    
+    def _skip_backups(info):
+        if info.name == 'uploads/backups' or info.name.startswith('uploads/backups/'):
+            return None
+        return info
+    
+    # Stream mode writes through without seeking back, keeping memory flat
+    with tarfile.open(archive_path, 'w|gz') as tar:
+        tar.add(uploads_dir, arcname='uploads', filter=_skip_backups)
+    return True
+
+
+def snapshot_redis(redis_url, target, timeout=30):
+    """Have Redis write a fresh RDB snapshot and copy it to target.
+    
+    Returns False when the dump file is not reachable from this host.
+    """
+    r = redislib.from_url(redis_url)
+    last_save = r.lastsave()
+    try:
+        # BGSAVE returns straight away; wait for LASTSAVE to move so the copied file is fresh
+        r.bgsave()
+        deadline = time.monotonic() + timeout
+        while r.lastsave() == last_save and time.monotonic() < deadline:
+            time.sleep(0.5)
+    except Exception:
+        # Some managed Redis may not permit bgsave; try SAVE
+        try:
+            r.save()
+        except Exception:
+            pass
+    
+    # Locate the Redis dump path via CONFIG
+    cfg = r.config_get('dir')
+    dirpath = cfg.get('dir') if isinstance(cfg, dict) else None
+    dbfile = r.config_get('dbfilename')
+    filename = dbfile.get('dbfilename') if isinstance(dbfile, dict) else None
+    if not (dirpath and filename):
+        return False
+    
+    dump_path = Path(dirpath) / filename
+    if not dump_path.exists():
+        return False
+    shutil.copy2(dump_path, target)
+    return True
+
 
 class BackupScheduler:
     """Manages automatic database backups"""
@@ -122,78 +493,11 @@ class BackupScheduler:
                 # Generate backup name
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 backup_name = f'backup_auto_{timestamp}'
-                backup_file = backup_dir / f'{backup_name}.sql.gz'
+                backup_file = backup_dir / f'{backup_name}{BACKUP_EXTENSION}'
                 
                 # Export database to SQL dump
-                parsed = urlparse(db_uri)
-                conn = pymysql.connect(
-                    host=parsed.hostname,
-                    port=parsed.port or 3306,
-                    user=parsed.username,
-                    password=parsed.password,
-                    database=parsed.path.lstrip('/')
-                )
-                
-                cursor = conn.cursor()
-                
-                # Get all tables
-                cursor.execute("SHOW TABLES")
-                tables = [table[0] for table in cursor.fetchall()]
-                
-                # Create SQL dump
-                sql_dump = []
-                sql_dump.append(f"-- Automatic database backup: {backup_name}")
-                sql_dump.append(f"-- Timestamp: {datetime.now().isoformat()}")
-                sql_dump.append("SET FOREIGN_KEY_CHECKS=0;")
-                
-                for table in tables:
-                    # Get CREATE TABLE statement
-                    cursor.execute(f"SHOW CREATE TABLE `{table}`")
-                    create_table = cursor.fetchone()[1]
-                    sql_dump.append(f"\n-- Table: {table}")
-                    sql_dump.append(f"DROP TABLE IF EXISTS `{table}`;")
-                    sql_dump.append(create_table + ";")
-                    
-                    # Get table data
-                    cursor.execute(f"SELECT * FROM `{table}`")
-                    rows = cursor.fetchall()
-                    
-                    if rows:
-                        cursor.execute(f"DESCRIBE `{table}`")
-                        columns = [col[0] for col in cursor.fetchall()]
-                        column_list = ', '.join([f'`{col}`' for col in columns])
-                        
-                        sql_dump.append(f"INSERT INTO `{table}` ({column_list}) VALUES")
-                        
-                        for i, row in enumerate(rows):
-                            values = []
-                            for value in row:
-                                if value is None:
-                                    values.append('NULL')
-                                elif isinstance(value, (int, float)):
-                                    values.append(str(value))
-                                elif isinstance(value, bytes):
-                                    values.append(f"'{value.decode('utf-8', errors='replace')}'")
-                                else:
-                                    # Escape single quotes
-                                    escaped = str(value).replace("'", "''")
-                                    values.append(f"'{escaped}'")
-                            
-                            row_sql = f"({', '.join(values)})"
-                            if i < len(rows) - 1:
-                                row_sql += ","
-                            else:
-                                row_sql += ";"
-                            sql_dump.append(row_sql)
-                
-                sql_dump.append("\nSET FOREIGN_KEY_CHECKS=1;")
-                
-                cursor.close()
-                conn.close()
+                table_count = dump_database(db_uri, backup_file, f"Automatic database backup: {backup_name}")
                 
-                # Write compressed backup
-                with gzip.open(backup_file, 'wt', encoding='utf-8') as f:
-                    f.write('\n'.join(sql_dump))
                 # Optional: include uploads and redis snapshot (best-effort)
                 components = {
                     'database': True,
@@ -217,11 +521,7 @@ class BackupScheduler:
                     try:
                         uploads_dir = Path(self.app.config.get('UPLOAD_FOLDER', 'static/uploads'))
                         uploads_archive = backup_dir / f"{backup_name}_uploads.tar.gz"
-                        # Create tarball of uploads (skip if missing)
-                        if uploads_dir.exists():
-                            import tarfile
-                            with tarfile.open(uploads_archive, 'w:gz') as tar:
-                                tar.add(uploads_dir, arcname='uploads')
+                        if archive_uploads(uploads_dir, uploads_archive):
                             components['uploads'] = True
                             sizes['uploads_mb'] = round(uploads_archive.stat().st_size / (1024 * 1024), 2)
                     except Exception as e:
@@ -233,40 +533,15 @@ class BackupScheduler:
                 except Exception:
                     include_redis = False
 
-                if include_redis:
+                redis_url = self.app.config.get('REDIS_URL')
+                if include_redis and redis_url:
                     try:
-                        # Best-effort: ask Redis to save and then copy the dump if accessible
-                        import redis as redislib
-                        redis_url = self.app.config.get('REDIS_URL')
-                        if redis_url:
-                            r = redislib.from_url(redis_url)
-                            # Use BGSAVE to avoid blocking
-                            try:
-                                r.bgsave()
-                            except Exception:
-                                # Some managed Redis may not permit bgsave; try SAVE
-                                try:
-                                    r.save()
-                                except Exception:
-                                    pass
-
-                            # Try to locate Redis dump path via CONFIG
-                            try:
-                                cfg = r.config_get('dir')
-                                dirpath = cfg.get('dir') if isinstance(cfg, dict) else None
-                                dbfile = r.config_get('dbfilename')
-                                filename = dbfile.get('dbfilename') if isinstance(dbfile, dict) else None
-                                if dirpath and filename:
-                                    dump_path = Path(dirpath) / filename
-                                    if dump_path.exists():
-                                        target = backup_dir / f"{backup_name}_redis.rdb"
-                                        import shutil
-                                        shutil.copy2(dump_path, target)
-                                        components['redis'] = True
-                                        sizes['redis_mb'] = round(target.stat().st_size / (1024 * 1024), 2)
-                            except Exception:
-                                # If config_get or file access fails, skip redis
-                                logger.debug('Could not copy redis dump file; skipping')
+                        target = backup_dir / f"{backup_name}_redis.rdb"
+                        if snapshot_redis(redis_url, target):
+                            components['redis'] = True
+                            sizes['redis_mb'] = round(target.stat().st_size / (1024 * 1024), 2)
+                        else:
+                            logger.debug('Could not copy redis dump file; skipping')
                     except Exception as e:
                         logger.warning(f"Failed to include redis in backup: {e}")
 
@@ -276,7 +551,7 @@ class BackupScheduler:
                     'timestamp': datetime.now().isoformat(),
                     'size_mb': sizes['database_mb'],
                     'auto_backup': True,
-                    'tables': len(tables),
+                    'tables': table_count,
                     'components': components,
                     'sizes': sizes
                 }
@@ -293,6 +568,7 @@ class BackupScheduler:
                 
                 # Keep only last 10 automatic backups
                 self._cleanup_old_backups(backup_dir)
+                cache_service.invalidate_backups_list()
         
         except Exception as e:
             logger.error(f"Automatic backup failed: {str(e)}", exc_info=True)
@@ -303,13 +579,13 @@ class BackupScheduler:
             max_backups = 10  
             
             auto_backups = sorted(
-                backup_dir.glob('backup_auto_*.sql.gz'),
+                (f for extension in BACKUP_EXTENSIONS for f in backup_dir.glob(f'backup_auto_*{extension}')),
                 key=lambda f: f.stat().st_mtime,
                 reverse=True
             )
             
             for backup_file in auto_backups[max_backups:]:
-                metadata_file = backup_file.with_suffix('.json')
+                metadata_file = backup_dir / f'{backup_name_of(backup_file)}.json'
                 
                 backup_file.unlink()
                 if metadata_file.exists():
@@ -5,6 +5,22 @@ from decimal import Decimal
 
 cache = Cache()
 
+# Cached scoreboards (routes/scoreboard.py and the /live socket use the underscore keys)
+SCOREBOARD_KEYS = ('scoreboard_team', 'scoreboard_individual', 'scoreboard:team', 'scoreboard:individual')
+# A scoreboard change makes the cached copy expire within this many seconds rather than
+# immediately, so a burst of solves/adjustments costs at most one rebuild per window
+SCOREBOARD_DEBOUNCE_SECONDS = 5
+
+# Fixed-window rate limit counter: INCR, and start the window's TTL only on the first hit
+# (re-arming EXPIRE on every hit would keep extending the window while attempts continue)
+RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Decimal objects"""
     def default(self, obj):
@@ -17,6 +33,7 @@ class CacheService:
     
     def __init__(self, app=None):
         self.redis_client = None
+        self._rate_limit_script = None
         if app:
             self.init_app(app)
     
@@ -27,6 +44,7 @@ class CacheService:
         # Initialize Redis client
         redis_url = app.config.get('REDIS_URL', 'redis://localhost:6379/0')
         self.redis_client = redis.from_url(redis_url, decode_responses=True)
+        self._rate_limit_script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
     
     # Scoreboard caching
     def get_scoreboard(self):
@@ -43,9 +61,17 @@ class CacheService:
         )
     
     def invalidate_scoreboard(self):
-        """Clear scoreboard cache"""
-        self.redis_client.delete('scoreboard:team')
-        self.redis_client.delete('scoreboard:individual')
+        """Mark scoreboard caches stale (debounced) and clear the admin stats that count solves"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.delete('stats:admin')
+        self._expire_scoreboards(pipe)
+        pipe.execute()
+    
+    @staticmethod
+    def _expire_scoreboards(pipe):
+        """Queue a shortened TTL on every cached scoreboard (LT never extends an earlier deadline)"""
+        for key in SCOREBOARD_KEYS:
+            pipe.expire(key, SCOREBOARD_DEBOUNCE_SECONDS, lt=True)
     
     # Challenge caching
     def get_challenge(self, challenge_id):
@@ -63,13 +89,27 @@ class CacheService:
     
     def invalidate_challenge(self, challenge_id):
         """Clear challenge cache"""
-        self.redis_client.delete(f'challenge:{challenge_id}')
+        self.redis_client.delete(f'challenge:{challenge_id}', f'challenge:{challenge_id}:flags')
+    
+    def get_challenge_flags(self, challenge_id):
+        """Get a challenge's cached flag rows (list of column dicts)"""
+        data = self.redis_client.get(f'challenge:{challenge_id}:flags')
+        return json.loads(data) if data else None
+    
+    def set_challenge_flags(self, challenge_id, flags, ttl=300):
+        """Cache a challenge's flag rows; dropped with the challenge's other cached data"""
+        self.redis_client.setex(f'challenge:{challenge_id}:flags', ttl, json.dumps(flags))
     
     def invalidate_all_challenges(self):
         """Clear all challenge caches"""
         keys = self.redis_client.keys('challenge:*')
-        if keys:
-            self.redis_client.delete(*keys)
+        self.redis_client.delete('stats:admin', 'options:challenges', *keys)
+    
+    def invalidate_challenge_and_all(self, challenge_id):
+        """Clear one challenge's cache together with all challenge caches in a single DEL"""
+        keys = set(self.redis_client.keys('challenge:*'))
+        keys.update((f'challenge:{challenge_id}', f'challenge:{challenge_id}:flags'))
+        self.redis_client.delete('stats:admin', 'options:challenges', *keys)
     
     # User/Team caching
     def get_user_score(self, user_id):
@@ -103,6 +143,39 @@ class CacheService:
         for member in members:
             self.invalidate_user(member.id)
     
+    def invalidate_many(self, challenge_ids=(), user_ids=(), team_ids=(),
+                        all_challenges=False, scoreboard=False):
+        """
+        Clear several caches in one round-trip instead of one DELETE per invalidate_* call
+        
+        Args:
+            challenge_ids: Challenges whose cached data should be dropped
+            user_ids: Users whose cached score should be dropped
+            team_ids: Teams whose cached score (and their members' scores) should be dropped
+            all_challenges: Also drop every challenge:* key and the challenge filter options
+            scoreboard: Also drop the admin stats and mark the scoreboards stale (debounced)
+        """
+        keys = {f'challenge:{cid}' for cid in challenge_ids if cid}
+        keys.update(f'challenge:{cid}:flags' for cid in challenge_ids if cid)
+        keys.update(f'user:{uid}:score' for uid in user_ids if uid)
+        team_ids = [tid for tid in team_ids if tid]
+        if team_ids:
+            from models.user import User
+            keys.update(f'team:{tid}:score' for tid in team_ids)
+            member_ids = User.query.with_entities(User.id).filter(User.team_id.in_(team_ids))
+            keys.update(f'user:{uid}:score' for (uid,) in member_ids)
+        if all_challenges:
+            keys.update(self.redis_client.keys('challenge:*'))
+            keys.update(('stats:admin', 'options:challenges'))
+        if scoreboard:
+            keys.add('stats:admin')
+        pipe = self.redis_client.pipeline(transaction=False)
+        if keys:
+            pipe.delete(*keys)
+        if scoreboard:
+            self._expire_scoreboards(pipe)
+        pipe.execute()
+    
     # Stats caching
     def get_stats(self):
         """Get cached platform statistics"""
@@ -117,6 +190,70 @@ class CacheService:
             json.dumps(stats_data, cls=DecimalEncoder)
         )
     
+    def get_admin_stats(self):
+        """Get cached admin dashboard counts"""
+        data = self.redis_client.get('stats:admin')
+        return json.loads(data) if data else None
+    
+    def set_admin_stats(self, stats_data, ttl=30):
+        """Cache admin dashboard counts"""
+        self.redis_client.setex('stats:admin', ttl, json.dumps(stats_data, cls=DecimalEncoder))
+    
+    def get_flag_abuse_stats(self):
+        """Get cached flag abuse dashboard statistics"""
+        data = self.redis_client.get('stats:flag_abuse')
+        return json.loads(data) if data else None
+    
+    def set_flag_abuse_stats(self, stats_data, ttl=60):
+        """Cache flag abuse dashboard statistics (new attempts show up within ttl)"""
+        self.redis_client.setex('stats:flag_abuse', ttl, json.dumps(stats_data, cls=DecimalEncoder))
+    
+    def invalidate_flag_abuse_stats(self):
+        """Drop cached flag abuse statistics after records are deleted"""
+        self.redis_client.delete('stats:flag_abuse')
+    
+    # Admin filter dropdowns
+    def get_filter_options(self, kind):
+        """Get cached id/name options for an admin filter dropdown ('challenges' or 'teams')"""
+        data = self.redis_client.get(f'options:{kind}')
+        return json.loads(data) if data else None
+    
+    def set_filter_options(self, kind, options, ttl=300):
+        """Cache id/name options for an admin filter dropdown"""
+        self.redis_client.setex(f'options:{kind}', ttl, json.dumps(options, cls=DecimalEncoder))
+    
+    def invalidate_filter_options(self, *kinds):
+        """Drop cached filter options after rows are added, renamed or removed"""
+        self.redis_client.delete(*(f'options:{kind}' for kind in kinds))
+    
+    # Backup listing
+    def get_backups_list(self):
+        """Get the cached backup directory listing"""
+        data = self.redis_client.get('backups_list_v1')
+        return json.loads(data) if data else None
+    
+    def set_backups_list(self, backups, ttl=300):
+        """Cache the backup directory listing (invalidated whenever a backup is added or removed)"""
+        self.redis_client.setex('backups_list_v1', ttl, json.dumps(backups, cls=DecimalEncoder))
+    
+    def invalidate_backups_list(self):
+        """Drop the cached backup listing after a backup is created, uploaded or deleted"""
+        self.redis_client.delete('backups_list_v1')
+    
+    # Background backup/restore jobs
+    def set_backup_job(self, job_id, ttl=86400, **fields):
+        """Record (or update) fields of a background backup job"""
+        key = f'backup_job:{job_id}'
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(key, mapping={name: json.dumps(value, cls=DecimalEncoder) for name, value in fields.items()})
+        pipe.expire(key, ttl)
+        pipe.execute()
+    
+    def get_backup_job(self, job_id):
+        """Get the recorded state of a background backup job"""
+        data = self.redis_client.hgetall(f'backup_job:{job_id}')
+        return {name: json.loads(value) for name, value in data.items()} if data else None
+    
     # Rate limiting
     def check_rate_limit(self, key, limit=5, window=60):
         """
@@ -130,18 +267,19 @@ class CacheService:
         Returns:
             Tuple of (is_allowed, attempts_remaining)
         """
-        pipe = self.redis_client.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, window)
-        result = pipe.execute()
-        
-        current_count = result[0]
+        # One round-trip; the script runs atomically on the server (EVALSHA)
+        current_count = self._rate_limit_script(keys=[key], args=[window])
         
         if current_count > limit:
             return False, 0
         
         return True, limit - current_count
     
+    def is_rate_limited(self, key, limit):
+        """Check whether a rate limit counter already reached limit, without counting an attempt"""
+        count = self.redis_client.get(key)
+        return count is not None and int(count) >= limit
+    
     def reset_rate_limit(self, key):
         """Reset rate limit for a key"""
         self.redis_client.delete(key)
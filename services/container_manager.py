@@ -3,8 +3,11 @@ Docker Container Orchestration Service
 Manages container lifecycle for challenge instances
 """
 
+import atexit
 import docker
 import random
+import threading
+import time
 import hashlib
 import tempfile
 import json
@@ -24,49 +27,79 @@ from utils.flag_hmac import generate_hmac_flag
 class ContainerOrchestrator:
     """Orchestrates Docker containers for CTF challenges"""
     
+    # After a failed connect, wait this long before trying again instead of on every request
+    DOCKER_RETRY_SECONDS = 30
+    
     def __init__(self):
         self.docker_client = None
         self._client_initialized = False
+        self._client_lock = threading.Lock()
+        self._retry_after = 0
+        atexit.register(self._close_docker_client)
     
     def _ensure_docker_client(self):
-        """Ensure Docker client is initialized (lazy initialization)"""
-        if self._client_initialized:
+        """Ensure the shared Docker client is initialized (lazy, built once per process)"""
+        if self._client_initialized or time.monotonic() < self._retry_after:
             return
         
-        try:
-            settings = DockerSettings.get_config()
+        with self._client_lock:
+            # Another greenlet/thread may have connected while we waited for the lock
+            if self._client_initialized:
+                return
             
-            if not settings.hostname:
-                # Use local Docker socket on Linux/macOS, but Docker Desktop on Windows
-                if platform.system().lower() == 'windows':
-                    self.docker_client = docker.DockerClient(base_url='npipe:////./pipe/docker_engine')
+            client = None
+            try:
+                settings = DockerSettings.get_config()
+                
+                if not settings.hostname:
+                    # Use local Docker socket on Linux/macOS, but Docker Desktop on Windows
+                    if platform.system().lower() == 'windows':
+                        client = docker.DockerClient(base_url='npipe:////./pipe/docker_engine')
+                    else:
+                        client = docker.from_env()
+                elif settings.tls_enabled and settings.ca_cert:
+                    # Use TLS connection
+                    tls_config = self._create_tls_config(settings)
+                    client = docker.DockerClient(
+                        base_url=settings.hostname,
+                        tls=tls_config
+                    )
                 else:
-                    self.docker_client = docker.from_env()
-            elif settings.tls_enabled and settings.ca_cert:
-                # Use TLS connection
-                tls_config = self._create_tls_config(settings)
-                self.docker_client = docker.DockerClient(
-                    base_url=settings.hostname,
-                    tls=tls_config
-                )
-            else:
-                # Plain TCP connection
-                self.docker_client = docker.DockerClient(base_url=settings.hostname)
-            
-            # Test connection
-            self.docker_client.ping()
-            if current_app:
-                current_app.logger.info("Docker client initialized successfully")
-            self._client_initialized = True
-            
-        except Exception as e:
-            if current_app:
-                current_app.logger.error(f"Failed to initialize Docker client: {e}")
+                    # Plain TCP connection
+                    client = docker.DockerClient(base_url=settings.hostname)
+                
+                # Test connection
+                client.ping()
+                self.docker_client = client
+                if current_app:
+                    current_app.logger.info("Docker client initialized successfully")
+                self._client_initialized = True
+                
+            except Exception as e:
+                if current_app:
+                    current_app.logger.error(f"Failed to initialize Docker client: {e}")
+                if client is not None:
+                    client.close()
+                self.docker_client = None
+                self._client_initialized = False
+                self._retry_after = time.monotonic() + self.DOCKER_RETRY_SECONDS
+    
+    def _close_docker_client(self):
+        """Close the shared client's connection pool and forget it"""
+        with self._client_lock:
+            client = self.docker_client
             self.docker_client = None
             self._client_initialized = False
+            self._retry_after = 0
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
     
     def _init_docker_client(self):
-        """Initialize Docker client with settings (deprecated, use _ensure_docker_client)"""
+        """Reconnect with the current Docker settings, replacing any existing client"""
+        self._close_docker_client()
         self._ensure_docker_client()
     
     def _create_tls_config(self, settings):
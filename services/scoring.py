@@ -1,4 +1,5 @@
 import math
+from models import db
 from models.challenge import Challenge
 from models.submission import Solve
 from models.team import Team
@@ -53,6 +54,44 @@ class ScoringService:
         
         return max(points, min_points)
     
+    @staticmethod
+    def total_solve_points(solves):
+        """
+        Sum the current point value of several solves (same rules as Solve.get_current_points)
+        
+        Challenges should already be loaded on the solves; dynamic solve counts come from
+        one grouped query instead of a challenge lookup and COUNT per solve.
+        """
+        dynamic_ids = {
+            solve.challenge_id for solve in solves
+            if solve.challenge_id is not None and solve.challenge is not None and solve.challenge.is_dynamic
+        }
+        solve_counts = {}
+        if dynamic_ids:
+            solve_counts = dict(
+                db.session.query(Solve.challenge_id, db.func.count(Solve.id))
+                .filter(Solve.challenge_id.in_(dynamic_ids))
+                .group_by(Solve.challenge_id)
+                .all()
+            )
+        
+        first_blood_bonus = None
+        total = 0
+        for solve in solves:
+            if solve.challenge_id not in dynamic_ids:
+                # Manual adjustment, deleted or static challenge - use stored value
+                total += solve.points_earned
+                continue
+            
+            points = ScoringService.calculate_dynamic_points(solve.challenge, solve_counts.get(solve.challenge_id, 0))
+            if solve.is_first_blood:
+                if first_blood_bonus is None:
+                    from models.settings import Settings
+                    first_blood_bonus = Settings.get('first_blood_bonus', 0, type='int')
+                points += first_blood_bonus
+            total += points
+        return total
+    
     @staticmethod
     def get_scoreboard(team_based=True, limit=None):
         """
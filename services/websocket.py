@@ -1,3 +1,4 @@
+import gevent
 from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
 from flask import request
 from flask_login import current_user
@@ -31,15 +32,21 @@ class WebSocketService:
         """Emit challenge update (points change)"""
         socketio.emit('challenge_update', challenge_data, namespace='/live')
 
+    @staticmethod
+    def emit_in_background(event, data):
+        """Fan an event out to all clients on a separate greenlet so the HTTP response isn't held up"""
+        # Workers run under gevent; socketio.start_background_task would spawn on eventlet here
+        gevent.spawn(socketio.emit, event, data, namespace='/live')
+
     @staticmethod
     def emit_notification(notification_data):
         """Emit a generic notification to all connected clients"""
-        socketio.emit('notification', notification_data, namespace='/live')
+        WebSocketService.emit_in_background('notification', notification_data)
 
     @staticmethod
     def emit_notification_deleted(notification_id):
         """Notify clients that a notification was deleted"""
-        socketio.emit('notification_deleted', {'id': notification_id}, namespace='/live')
+        WebSocketService.emit_in_background('notification_deleted', {'id': notification_id})
 
 
 # WebSocket event handlers
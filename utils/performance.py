@@ -110,7 +110,7 @@ def batch_load_challenges(challenge_ids):
     challenges = Challenge.query.filter(
         Challenge.id.in_(challenge_ids)
     ).options(
-        joinedload(Challenge.files),
+        joinedload(Challenge.challenge_files),
         joinedload(Challenge.hints)
     ).all()
     